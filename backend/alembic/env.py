@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import Base
-from app.models import Job, Candidate, Skill
+from app.models import Job, Candidate, Skill, ImportedFile, ImportedRow
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,33 @@
+"""keyset pagination indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables are created by Base.metadata.create_all, which also creates these
+    # indexes on fresh databases, hence if_not_exists.
+    op.create_index("ix_candidates_overall_score_id", "candidates", ["overall_score", "id"], if_not_exists=True)
+    op.create_index("ix_candidates_years_experience_id", "candidates", ["years_experience", "id"], if_not_exists=True)
+    op.create_index("ix_candidates_created_at_id", "candidates", ["created_at", "id"], if_not_exists=True)
+    op.create_index("ix_jobs_created_at_id", "jobs", ["created_at", "id"], if_not_exists=True)
+    op.create_index("ix_jobs_max_salary_id", "jobs", ["max_salary", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_max_salary_id", table_name="jobs")
+    op.drop_index("ix_jobs_created_at_id", table_name="jobs")
+    op.drop_index("ix_candidates_created_at_id", table_name="candidates")
+    op.drop_index("ix_candidates_years_experience_id", table_name="candidates")
+    op.drop_index("ix_candidates_overall_score_id", table_name="candidates")
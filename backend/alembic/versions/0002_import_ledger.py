@@ -0,0 +1,55 @@
+"""import ledger
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Base.metadata.create_all creates these tables on fresh databases
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("imported_files"):
+        op.create_table(
+            "imported_files",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sha256", sa.String(length=64), nullable=False),
+            sa.Column("file_name", sa.String(length=255), nullable=True),
+            sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+            sa.Column("status", sa.String(length=50), nullable=True),
+            sa.Column("rows_read", sa.Integer(), nullable=True),
+            sa.Column("rows_unchanged", sa.Integer(), nullable=True),
+            sa.Column("candidates_created", sa.Integer(), nullable=True),
+            sa.Column("candidates_updated", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_imported_files_id", "imported_files", ["id"])
+        op.create_index("ix_imported_files_sha256", "imported_files", ["sha256"])
+
+    if not inspector.has_table("imported_rows"):
+        op.create_table(
+            "imported_rows",
+            sa.Column("employee_number", sa.Integer(), primary_key=True),
+            sa.Column("row_hash", sa.BigInteger(), nullable=False),
+            sa.Column("file_id", sa.Integer(), sa.ForeignKey("imported_files.id"), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("imported_rows")
+    op.drop_index("ix_imported_files_sha256", table_name="imported_files")
+    op.drop_index("ix_imported_files_id", table_name="imported_files")
+    op.drop_table("imported_files")
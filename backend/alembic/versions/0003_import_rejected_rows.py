@@ -0,0 +1,32 @@
+"""import rejected rows
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Base.metadata.create_all already creates these columns on fresh databases
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("imported_files")}
+
+    if "rows_rejected" not in columns:
+        op.add_column("imported_files", sa.Column("rows_rejected", sa.Integer(), nullable=True))
+    if "error_file" not in columns:
+        op.add_column("imported_files", sa.Column("error_file", sa.String(length=1024), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("imported_files") as batch_op:
+        batch_op.drop_column("error_file")
+        batch_op.drop_column("rows_rejected")
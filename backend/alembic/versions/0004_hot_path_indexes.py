@@ -0,0 +1,46 @@
+"""hot path indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Base.metadata.create_all also creates these indexes on fresh databases,
+    # hence if_not_exists.
+    op.create_index("ix_candidates_status_id", "candidates", ["status", "id"], if_not_exists=True)
+    op.create_index("ix_candidates_education_level_id", "candidates", ["education_level", "id"], if_not_exists=True)
+    op.create_index(
+        "ix_candidates_available_overall_score", "candidates", ["overall_score", "id", "is_available"],
+        sqlite_where=sa.text("is_available = 1"),
+        postgresql_where=sa.text("is_available"),
+        if_not_exists=True
+    )
+    op.create_index("ix_jobs_department_id", "jobs", ["department", "id"], if_not_exists=True)
+    op.create_index("ix_jobs_level_id", "jobs", ["level", "id"], if_not_exists=True)
+    op.create_index(
+        "ix_jobs_active_salary_spread", "jobs", [sa.text("(max_salary - min_salary) DESC"), "is_active"],
+        sqlite_where=sa.text("is_active = 1"),
+        postgresql_where=sa.text("is_active"),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_active_salary_spread", table_name="jobs")
+    op.drop_index("ix_jobs_level_id", table_name="jobs")
+    op.drop_index("ix_jobs_department_id", table_name="jobs")
+    op.drop_index("ix_candidates_available_overall_score", table_name="candidates")
+    op.drop_index("ix_candidates_education_level_id", table_name="candidates")
+    op.drop_index("ix_candidates_status_id", table_name="candidates")
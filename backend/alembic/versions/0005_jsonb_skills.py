@@ -0,0 +1,43 @@
+"""jsonb skills
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# (table, column, GIN index) holding skill documents
+SKILL_COLUMNS = [
+    ("candidates", "skills", "ix_candidates_skills_gin"),
+    ("jobs", "required_skills", "ix_jobs_required_skills_gin")
+]
+
+
+def upgrade() -> None:
+    # Postgres only: JSON columns become JSONB so that GIN indexes can serve
+    # skill containment queries. SQLite keeps its JSON text columns.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column, index in SKILL_COLUMNS:
+        op.alter_column(table, column, type_=JSONB(), postgresql_using=f"{column}::jsonb")
+        op.create_index(index, table, [column], postgresql_using="gin", if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column, index in SKILL_COLUMNS:
+        op.drop_index(index, table_name=table)
+        op.alter_column(table, column, type_=sa.JSON(), postgresql_using=f"{column}::json")
@@ -0,0 +1,32 @@
+"""full text search
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+from app.models.search_index import SEARCH_INDEXES, create_statements, drop_statements, rebuild_statements
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite: FTS5 tables filled from the existing rows, then kept in sync by
+    # triggers. Postgres: generated tsvector columns with GIN indexes.
+    dialect_name = op.get_bind().dialect.name
+    for index in SEARCH_INDEXES:
+        for statement in create_statements(index, dialect_name) + rebuild_statements(index, dialect_name):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    for index in SEARCH_INDEXES:
+        for statement in drop_statements(index, dialect_name):
+            op.execute(statement)
@@ -0,0 +1,29 @@
+"""candidate changed_at index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Base.metadata.create_all also creates this index on fresh databases,
+    # hence if_not_exists.
+    op.create_index(
+        "ix_candidates_changed_at", "candidates", [sa.text("coalesce(updated_at, created_at)")],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_candidates_changed_at", table_name="candidates")
@@ -0,0 +1,29 @@
+"""candidate skills junction table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+from app.models.skill_index import create_statements, drop_statements, rebuild_statements
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite: candidate_skills filled from the existing rows, then kept in
+    # sync by triggers. Postgres keeps using the GIN index on skills.
+    dialect_name = op.get_bind().dialect.name
+    for statement in create_statements(dialect_name) + rebuild_statements(dialect_name):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in drop_statements(op.get_bind().dialect.name):
+        op.execute(statement)
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...core.database import get_db
+from ...core.database import get_read_db
 from ...schemas.analysis import (
     WorkforceDistributionRequest, WorkforceDistributionResponse,
     SalaryBenchmarkRequest, SalaryBenchmarkResponse,
     SkillsAnalysisRequest, SkillsAnalysisResponse
 )
+from ...services.bitmap_index import InvalidPredicateError
+from ...services.candidate_snapshot import candidate_snapshot
 from ...services.workforce_analysis import WorkforceAnalysisService
 
 router = APIRouter()
@@ -15,7 +17,7 @@ analysis_service = WorkforceAnalysisService()
 @router.post("/distribute", response_model=WorkforceDistributionResponse)
 def analyze_workforce_distribution(
     request: WorkforceDistributionRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Analyze workforce distribution and find optimal candidate matches
@@ -23,6 +25,8 @@ def analyze_workforce_distribution(
     try:
         result = analysis_service.analyze_workforce_distribution(db, request)
         return WorkforceDistributionResponse(**result)
+    except InvalidPredicateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -31,7 +35,7 @@ def get_salary_benchmark(
     job_title: str = Query(..., description="Job title to benchmark"),
     location: str = Query("US", description="Location for salary data"),
     experience_level: str = Query("Mid", description="Experience level"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get salary benchmark for a specific job title and experience level
@@ -45,7 +49,7 @@ def get_salary_benchmark(
 @router.post("/skills-gaps", response_model=SkillsAnalysisResponse)
 def analyze_skills_gaps(
     request: SkillsAnalysisRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Analyze skills gaps across multiple candidates
@@ -61,7 +65,7 @@ def analyze_skills_gaps(
         raise HTTPException(status_code=500, detail=f"Skills analysis failed: {str(e)}")
 
 @router.get("/dashboard/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+def get_dashboard_stats(db: Session = Depends(get_read_db)):
     """
     Get dashboard statistics for overview
     """
@@ -107,22 +111,27 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Dashboard stats failed: {str(e)}")
 
+@router.get("/candidate-snapshot")
+def get_candidate_snapshot_stats(db: Session = Depends(get_read_db)):
+    """
+    Size of the in-memory candidate snapshot the analysis services read
+    """
+    try:
+        return candidate_snapshot.stats(db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Candidate snapshot stats failed: {str(e)}")
+
 @router.get("/candidates/top-skilled")
 def get_top_skilled_candidates(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get top candidates by overall skill score
     """
     try:
-        from ...models.candidate import Candidate
-        
-        candidates = db.query(Candidate)\
-            .filter(Candidate.overall_score.isnot(None))\
-            .order_by(Candidate.overall_score.desc())\
-            .limit(limit)\
-            .all()
+        # From the candidate snapshot, without loading Candidate objects
+        candidates = candidate_snapshot.current(db).top_scored(limit)
         
         return [
             {
@@ -141,7 +150,7 @@ def get_top_skilled_candidates(
 @router.get("/jobs/high-demand")
 def get_high_demand_jobs(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get jobs with highest salary ranges (indicating high demand)
@@ -171,7 +180,7 @@ def get_high_demand_jobs(
         raise HTTPException(status_code=500, detail=f"High demand jobs query failed: {str(e)}")
 
 @router.get("/skills/market-demand")
-def get_skills_market_demand(db: Session = Depends(get_db)):
+def get_skills_market_demand(db: Session = Depends(get_read_db)):
     """
     Analyze skills market demand based on job requirements
     """
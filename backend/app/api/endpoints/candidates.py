@@ -1,22 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import get_async_db, get_async_read_db, get_db, get_read_db, read_your_writes
+from ...core.pagination import paginate_keyset_async, cached_count_async, invalidate_count_cache, InvalidCursorError
+from ...core.projection import parse_fields, apply_projection, project_rows, InvalidFieldsError
 from ...models.candidate import Candidate
 from ...models.job import Job
-from ...schemas.candidate import CandidateCreate, CandidateUpdate, CandidateResponse, CandidateListResponse, CandidateSkillAssessment
+from ...schemas.candidate import (
+    CandidateCreate, CandidateUpdate, CandidateResponse, CandidateListResponse, CandidateSkillAssessment,
+    CandidateSearchHit, CandidateSearchResponse, CandidateFacetResponse
+)
+from ...schemas.bulk import BulkOperationResponse, BulkReassessmentResponse
 from ...services.skills_assessment import SkillsAssessmentService
+from ...services.bulk_operations import BulkOperationsService, BulkPayloadError
+from ...services.reassessment_jobs import ReassessmentJobManager
+from ...services.bitmap_index import candidate_bitmaps, parse_predicate, EXPERIENCE_BUCKETS, InvalidPredicateError
+from ...services.candidate_snapshot import candidate_snapshot
+from ...services.skill_query import SkillQueryBuilder, parse_skill_predicate, InvalidSkillPredicateError
+from ...services.search import SearchQueryBuilder, InvalidSearchQueryError
 
 router = APIRouter()
 skills_service = SkillsAssessmentService()
+bulk_service = BulkOperationsService()
+reassessment_job_manager = ReassessmentJobManager(bulk_service)
 
-@router.post("/", response_model=CandidateResponse)
-def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
+# Sort keys accepted by the list endpoint; each is backed by a (column, id) index
+CANDIDATE_SORT_COLUMNS = {
+    "id": Candidate.id,
+    "overall_score": Candidate.overall_score,
+    "years_experience": Candidate.years_experience,
+    "created_at": Candidate.created_at
+}
+
+@router.post("/", response_model=CandidateResponse, dependencies=[Depends(read_your_writes)])
+async def create_candidate(candidate: CandidateCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new candidate with skills assessment
     """
     # Check if email already exists
-    existing_candidate = db.query(Candidate).filter(Candidate.email == candidate.email).first()
+    existing_candidate = await db.scalar(select(Candidate.id).where(Candidate.email == candidate.email))
     if existing_candidate:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -32,69 +59,271 @@ def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
     db_candidate.overall_score = overall_score
     
     db.add(db_candidate)
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    await db.refresh(db_candidate)
+    invalidate_count_cache(Candidate.__tablename__)
+    candidate_bitmaps.update(db_candidate)
+    await run_in_threadpool(candidate_snapshot.update, db_candidate)
     
     return db_candidate
 
+@router.post("/bulk", response_model=BulkOperationResponse, dependencies=[Depends(read_your_writes)])
+async def bulk_upsert_candidates(request: Request, db: Session = Depends(get_db)):
+    """
+    Create or update many candidates at once, keyed on email.
+    
+    Accepts a JSON array or NDJSON (Content-Type: application/x-ndjson) and
+    returns a status per item. Rows are written in chunks, one transaction each.
+    """
+    body = await request.body()
+    try:
+        items = await run_in_threadpool(bulk_service.parse_payload, body, request.headers.get("content-type"))
+    except BulkPayloadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Parsing and writing are blocking; keep them off the event loop
+    return await run_in_threadpool(bulk_service.upsert_candidates, db, items)
+
+@router.post("/bulk/assess", dependencies=[Depends(read_your_writes)])
+def reassess_all_candidates(
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000),
+    background: bool = Query(True, description="Run as a background job and return its id immediately"),
+    db: Session = Depends(get_db)
+):
+    """
+    Reassess skills and overall scores for every candidate in chunks.
+    
+    By default this runs as a background job; follow its status_url for
+    progress, throughput and ETA. Only one reassessment runs at a time, so
+    a request made while one is running returns that job.
+    """
+    if not background:
+        return BulkReassessmentResponse(**bulk_service.reassess_candidates(db, chunk_size=chunk_size))
+    
+    job, started = reassessment_job_manager.submit(chunk_size=chunk_size)
+    return {
+        "message": "Reassessment started" if started else "Reassessment already running",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{settings.api_v1_prefix}/candidates/bulk/assess/{job.id}"
+    }
+
+@router.get("/bulk/assess")
+def list_reassessments():
+    """
+    List background reassessments, newest first
+    """
+    return [job.to_dict() for job in reassessment_job_manager.list_jobs()]
+
+@router.get("/bulk/assess/{job_id}")
+def get_reassessment_status(job_id: str):
+    """
+    Get progress of a background reassessment: candidates processed, throughput and ETA
+    """
+    return _get_reassessment_job(job_id).to_dict()
+
+@router.post("/bulk/assess/{job_id}/cancel")
+def cancel_reassessment(job_id: str):
+    """
+    Cancel a background reassessment. Chunks already committed are kept.
+    """
+    _get_reassessment_job(job_id)
+    return reassessment_job_manager.cancel(job_id).to_dict()
+
 @router.get("/", response_model=CandidateListResponse)
-def get_candidates(
+async def get_candidates(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    sort_by: str = Query("id", pattern="^(id|overall_score|years_experience|created_at)$"),
+    descending: bool = False,
+    include_total: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return, e.g. id,first_name,overall_score"),
     status: Optional[str] = None,
     is_available: Optional[bool] = None,
     min_experience: Optional[float] = None,
     max_experience: Optional[float] = None,
     education_level: Optional[str] = None,
-    db: Session = Depends(get_db)
+    skill: Optional[List[str]] = Query(None, description="Skill predicate, repeatable: Python, Python:>=7, SQL:<5"),
+    skill_match: str = Query("all", pattern="^(all|any)$", description="Match all or any of the skill predicates"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Get list of candidates with optional filtering
+    Get list of candidates with optional filtering and keyset pagination
     """
-    query = db.query(Candidate)
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either cursor or skip, not both")
+    
+    try:
+        selected_fields = parse_fields(fields, Candidate.__table__.columns.keys())
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        skill_predicates = [parse_skill_predicate(text) for text in skill or []]
+    except InvalidSkillPredicateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    query = select(Candidate)
     
     # Apply filters
     if status:
-        query = query.filter(Candidate.status == status)
+        query = query.where(Candidate.status == status)
     if is_available is not None:
-        query = query.filter(Candidate.is_available == is_available)
+        query = query.where(Candidate.is_available == is_available)
     if min_experience is not None:
-        query = query.filter(Candidate.years_experience >= min_experience)
+        query = query.where(Candidate.years_experience >= min_experience)
     if max_experience is not None:
-        query = query.filter(Candidate.years_experience <= max_experience)
+        query = query.where(Candidate.years_experience <= max_experience)
     if education_level:
-        query = query.filter(Candidate.education_level == education_level)
+        query = query.where(Candidate.education_level == education_level)
+    if skill_predicates:
+        skill_filter = SkillQueryBuilder.for_session(db).candidate_skills(skill_predicates, match_all=skill_match == "all")
+        query = query.where(skill_filter)
+    
+    # Get total count (cached per filter combination)
+    total = None
+    if include_total:
+        cache_key = (
+            Candidate.__tablename__, status, is_available, min_experience, max_experience, education_level,
+            tuple(sorted(set(skill_predicates), key=str)), skill_match if skill_predicates else None
+        )
+        total = await cached_count_async(db, query, cache_key)
+    
+    # Load only the requested columns; the sort key is needed for the cursor
+    if selected_fields:
+        query = apply_projection(query, Candidate, selected_fields, extra=[sort_by])
     
-    # Get total count
-    total = query.count()
+    # Apply keyset pagination
+    try:
+        candidates, next_cursor = await paginate_keyset_async(
+            db, query, CANDIDATE_SORT_COLUMNS[sort_by], Candidate.id,
+            sort_by, descending, limit, cursor=cursor, offset=skip
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Apply pagination
-    candidates = query.offset(skip).limit(limit).all()
+    # A cursor page has no page number; skip/limit pages keep theirs
+    page = None if cursor else skip // limit + 1
+    
+    if selected_fields:
+        # Sparse response: skip the full response model and serialize only these fields
+        return JSONResponse(content={
+            "candidates": project_rows(candidates, selected_fields),
+            "total": total,
+            "page": page,
+            "size": limit,
+            "next_cursor": next_cursor
+        })
     
     return CandidateListResponse(
         candidates=candidates,
         total=total,
+        page=page,
+        size=limit,
+        next_cursor=next_cursor
+    )
+
+@router.get("/facets", response_model=CandidateFacetResponse)
+def get_candidate_facets(
+    status: Optional[List[str]] = Query(None),
+    education_level: Optional[List[str]] = Query(None),
+    department: Optional[List[str]] = Query(None, description="Preferred department"),
+    experience: Optional[List[str]] = Query(None, description=f"Years of experience: {', '.join(label for label, _, _ in EXPERIENCE_BUCKETS)}"),
+    skill: Optional[List[str]] = Query(None, description="Skill the candidate has, at any level"),
+    is_available: Optional[bool] = None,
+    where: Optional[str] = Query(
+        None, max_length=2000,
+        description='Further AND/OR/NOT condition, e.g. skills:Python AND NOT preferred_work_type:Contract'
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=0, le=1000, description="0 returns the facet counts only"),
+    facet_size: int = Query(10, ge=1, le=100, description="Values listed per facet, most frequent first"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Candidates matching the selected facet values, with the count of every
+    facet value for the current selection.
+    
+    Values of one facet are ORed and facets ANDed. Each facet is counted
+    without its own selection, so the alternatives stay visible.
+    """
+    filters = {
+        "status": status or [],
+        "education_level": education_level or [],
+        "preferred_departments": department or [],
+        "experience": experience or [],
+        "skills": skill or [],
+        "is_available": [is_available] if is_available is not None else []
+    }
+    try:
+        condition = parse_predicate(where) if where else None
+        matches, facets = candidate_bitmaps.facets(db, filters, where=condition, facet_size=facet_size)
+    except InvalidPredicateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    page_ids = matches.page(skip, limit).tolist()
+    candidates = db.query(Candidate).filter(Candidate.id.in_(page_ids)).order_by(Candidate.id).all() if page_ids else []
+    
+    return CandidateFacetResponse(
+        candidates=candidates,
+        total=len(matches),
+        page=skip // limit + 1 if limit else 1,
+        size=limit,
+        facets=facets
+    )
+
+@router.get("/search", response_model=CandidateSearchResponse)
+async def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in name, position, company and skills"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Full-text search over candidates, best matches first, with highlighted snippets
+    """
+    search = SearchQueryBuilder.for_session(db)
+    try:
+        hits = (await db.execute(search.candidate_hits(q).offset(skip).limit(limit))).all()
+        cache_key = (Candidate.__tablename__, "search", q)
+        total = await cached_count_async(db, search.candidate_matches(q), cache_key) if include_total else None
+    except InvalidSearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    candidates = {
+        candidate.id: candidate
+        for candidate in await db.scalars(select(Candidate).where(Candidate.id.in_([hit.id for hit in hits])))
+    }
+    
+    return CandidateSearchResponse(
+        results=[
+            CandidateSearchHit(candidate=candidates[hit.id], score=hit.score, snippet=hit.snippet)
+            for hit in hits if hit.id in candidates
+        ],
+        total=total,
         page=skip // limit + 1,
         size=limit
     )
 
 @router.get("/{candidate_id}", response_model=CandidateResponse)
-def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
+async def get_candidate(candidate_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """
     Get a specific candidate by ID
     """
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = await db.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     return candidate
 
-@router.put("/{candidate_id}", response_model=CandidateResponse)
-def update_candidate(candidate_id: int, candidate_update: CandidateUpdate, db: Session = Depends(get_db)):
+@router.put("/{candidate_id}", response_model=CandidateResponse, dependencies=[Depends(read_your_writes)])
+async def update_candidate(candidate_id: int, candidate_update: CandidateUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update a candidate
     """
-    db_candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    db_candidate = await db.get(Candidate, candidate_id)
     if not db_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -103,7 +332,7 @@ def update_candidate(candidate_id: int, candidate_update: CandidateUpdate, db: S
     
     # Check email uniqueness if email is being updated
     if 'email' in update_data and update_data['email'] != db_candidate.email:
-        existing_candidate = db.query(Candidate).filter(Candidate.email == update_data['email']).first()
+        existing_candidate = await db.scalar(select(Candidate.id).where(Candidate.email == update_data['email']))
         if existing_candidate:
             raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -117,27 +346,33 @@ def update_candidate(candidate_id: int, candidate_update: CandidateUpdate, db: S
         db_candidate.skill_scores = skill_scores
         db_candidate.overall_score = overall_score
     
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    await db.refresh(db_candidate)
+    invalidate_count_cache(Candidate.__tablename__)
+    candidate_bitmaps.update(db_candidate)
+    await run_in_threadpool(candidate_snapshot.update, db_candidate)
     
     return db_candidate
 
-@router.delete("/{candidate_id}")
-def delete_candidate(candidate_id: int, db: Session = Depends(get_db)):
+@router.delete("/{candidate_id}", dependencies=[Depends(read_your_writes)])
+async def delete_candidate(candidate_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a candidate (soft delete by setting status to 'Deleted')
     """
-    db_candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    db_candidate = await db.get(Candidate, candidate_id)
     if not db_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     db_candidate.status = "Deleted"
     db_candidate.is_available = False
-    db.commit()
+    await db.commit()
+    invalidate_count_cache(Candidate.__tablename__)
+    candidate_bitmaps.update(db_candidate)
+    await run_in_threadpool(candidate_snapshot.update, db_candidate)
     
     return {"message": "Candidate deleted successfully"}
 
-@router.post("/{candidate_id}/assess", response_model=CandidateSkillAssessment)
+@router.post("/{candidate_id}/assess", response_model=CandidateSkillAssessment, dependencies=[Depends(read_your_writes)])
 def assess_candidate_skills(candidate_id: int, db: Session = Depends(get_db)):
     """
     Reassess candidate skills and update scores
@@ -154,6 +389,7 @@ def assess_candidate_skills(candidate_id: int, db: Session = Depends(get_db)):
     db_candidate.skill_scores = skill_scores
     db_candidate.overall_score = overall_score
     db.commit()
+    candidate_snapshot.update(db_candidate)
     
     return CandidateSkillAssessment(
         candidate_id=candidate_id,
@@ -162,7 +398,7 @@ def assess_candidate_skills(candidate_id: int, db: Session = Depends(get_db)):
     )
 
 @router.get("/{candidate_id}/match/{job_id}")
-def match_candidate_to_job(candidate_id: int, job_id: int, db: Session = Depends(get_db)):
+def match_candidate_to_job(candidate_id: int, job_id: int, db: Session = Depends(get_read_db)):
     """
     Match a candidate to a specific job
     """
@@ -191,17 +427,23 @@ def match_candidate_to_job(candidate_id: int, job_id: int, db: Session = Depends
     }
 
 @router.get("/status/list")
-def get_candidate_statuses(db: Session = Depends(get_db)):
+async def get_candidate_statuses(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get list of all candidate statuses
     """
-    statuses = db.query(Candidate.status).distinct().all()
-    return [status[0] for status in statuses]
+    statuses = await db.scalars(select(Candidate.status).distinct())
+    return list(statuses)
 
 @router.get("/education/list")
-def get_education_levels(db: Session = Depends(get_db)):
+async def get_education_levels(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get list of all education levels
     """
-    education_levels = db.query(Candidate.education_level).distinct().all()
-    return [level[0] for level in education_levels] 
\ No newline at end of file
+    education_levels = await db.scalars(select(Candidate.education_level).distinct())
+    return list(education_levels) 
+
+def _get_reassessment_job(job_id: str):
+    job = reassessment_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reassessment not found")
+    return job
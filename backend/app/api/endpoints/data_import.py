@@ -1,94 +1,374 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import Dict
+from starlette.background import BackgroundTask
+from typing import Dict, Optional
 import os
 import tempfile
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import get_db, get_read_db, read_your_writes
+from ...core.projection import InvalidFieldsError, parse_fields
+from ...models.candidate import Candidate
+from ...models.import_record import ImportedFile
+from ...models.job import Job
+from ...models.skill import Skill
+from ...services.data_export import DataExportService
 from ...services.data_import import DataImportService
+from ...services.file_formats import FORMAT_EXTENSIONS, UnsupportedFormatError, is_supported
+from ...services.import_jobs import ImportJobManager
+from ...services.uploads import UnsupportedUploadError, UploadFormError, UploadOffsetError, UploadService
 
 router = APIRouter()
 data_import_service = DataImportService()
+data_export_service = DataExportService()
+import_job_manager = ImportJobManager(data_import_service)
+upload_service = UploadService()
 
-@router.post("/csv/upload")
+SUPPORTED_FILES_DETAIL = "Only CSV, Parquet and Arrow IPC files are supported"
+
+EXPORT_TABLES = {"candidates": Candidate, "jobs": Job, "skills": Skill}
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file"
+}
+
+# The upload route reads its multipart body itself; this documents it
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
+
+@router.post("/csv/upload", dependencies=[Depends(read_your_writes)], openapi_extra=UPLOAD_REQUEST_BODY)
 async def upload_csv_data(
-    file: UploadFile = File(...),
+    request: Request,
+    chunk_size: Optional[int] = Query(None, ge=1, description="Rows read and committed per chunk"),
+    background: bool = Query(True, description="Run as a background import and return its id immediately"),
+    active_only: bool = Query(False, description="Skip employees who have left while reading (pushed down for Parquet/Arrow)"),
     db: Session = Depends(get_db)
 ):
     """
-    Upload and import CSV data into the system
+    Upload and import CSV, Parquet or Arrow IPC data into the system
+    """
+    try:
+        # Parse the body as it arrives and write the file field straight to
+        # disk, hashing as it goes; the file type is checked from its name first
+        upload = await upload_service.save_upload(
+            request.headers.get("content-type", ""), request.stream(), accept=is_supported
+        )
+        # An import with background=false parses and writes in the request: off the event loop
+        return await run_in_threadpool(_import_spooled_upload, upload, chunk_size, background, active_only, db)
+    
+    except UnsupportedUploadError:
+        raise HTTPException(status_code=400, detail=SUPPORTED_FILES_DETAIL)
+    except UploadFormError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+@router.post("/uploads")
+async def create_upload(
+    filename: str,
+    total_size: Optional[int] = Query(None, ge=0, description="Expected size in bytes, checked on completion")
+):
+    """
+    Start a resumable upload for a large data file. Send its content with
+    PUT /uploads/{upload_id}?offset=N in as many chunks as needed, then
+    POST /uploads/{upload_id}/complete to import it.
     """
-    # Validate file type
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if not is_supported(filename):
+        raise HTTPException(status_code=400, detail=SUPPORTED_FILES_DETAIL)
     
+    return upload_service.create_session(filename, total_size).to_dict()
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    """
+    Get a resumable upload's current offset, i.e. where the next chunk must start
+    """
+    return _get_upload_session(upload_id).to_dict()
+
+@router.put("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset this chunk starts at")
+):
+    """
+    Append the raw request body to a resumable upload. The body is streamed
+    to disk as it arrives. A chunk that does not start at the current offset
+    is rejected with 409 and the offset to resume from.
+    """
+    session = _get_upload_session(upload_id)
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        # Import data
-        result = data_import_service.import_csv_data(temp_file_path, db)
-        
-        # Clean up temporary file
-        os.unlink(temp_file_path)
-        
-        if result["success"]:
-            return {
-                "message": "Data imported successfully",
-                "jobs_created": result["jobs_created"],
-                "candidates_created": result["candidates_created"],
-                "skills_created": result["skills_created"],
-                "total_records": result["total_records"]
-            }
-        else:
-            raise HTTPException(status_code=500, detail=f"Import failed: {result['error']}")
+        await upload_service.append_chunk(session, offset, request.stream())
+    except UploadOffsetError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "offset": e.expected_offset})
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
+    return session.to_dict()
+
+@router.post("/uploads/{upload_id}/complete", dependencies=[Depends(read_your_writes)])
+async def complete_upload(
+    upload_id: str,
+    chunk_size: Optional[int] = Query(None, ge=1, description="Rows read and committed per chunk"),
+    background: bool = Query(True, description="Run as a background import and return its id immediately"),
+    active_only: bool = Query(False, description="Skip employees who have left while reading (pushed down for Parquet/Arrow)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Finish a resumable upload and import the spooled file
+    """
+    session = _get_upload_session(upload_id)
+    try:
+        upload = upload_service.complete_session(session)
+    except UploadOffsetError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": f"Upload incomplete: {session.offset} of {session.total_size} bytes received", "offset": e.expected_offset}
+        )
+    
+    try:
+        return await run_in_threadpool(_import_spooled_upload, upload, chunk_size, background, active_only, db)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-@router.post("/csv/import-from-path")
-async def import_csv_from_path(
+@router.delete("/uploads/{upload_id}")
+async def discard_upload(upload_id: str):
+    """
+    Abandon a resumable upload and delete what was received so far
+    """
+    upload_service.discard_session(_get_upload_session(upload_id))
+    return {"message": "Upload discarded"}
+
+def _get_upload_session(upload_id: str):
+    session = upload_service.get_session(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return session
+
+def _import_spooled_upload(
+    upload: Dict,
+    chunk_size: Optional[int],
+    background: bool,
+    active_only: bool,
+    db: Session
+) -> Dict:
+    """
+    Import an upload straight from its spooled file, which is deleted afterwards
+    """
+    upload_info = {"sha256": upload["sha256"], "size_bytes": upload["size"]}
+    
+    if background:
+        # The import job releases the spooled file when it finishes
+        job = import_job_manager.submit(
+            upload["path"], chunk_size=chunk_size, cleanup=upload_service.release,
+            content_hash=upload["sha256"], file_name=upload["file_name"], active_only=active_only
+        )
+        return {**_import_started_response(job), **upload_info}
+    
+    try:
+        result = data_import_service.import_csv_data(
+            upload["path"], db, chunk_size=chunk_size,
+            content_hash=upload["sha256"], file_name=upload["file_name"], active_only=active_only
+        )
+    finally:
+        upload_service.release(upload["path"])
+    
+    return {**_import_result_response(result), **upload_info}
+
+@router.post("/csv/import-from-path", dependencies=[Depends(read_your_writes)])
+def import_csv_from_path(
     file_path: str,
+    chunk_size: Optional[int] = Query(None, ge=1, description="Rows read and committed per chunk"),
+    background: bool = Query(True, description="Run as a background import and return its id immediately"),
+    active_only: bool = Query(False, description="Skip employees who have left while reading (pushed down for Parquet/Arrow)"),
     db: Session = Depends(get_db)
 ):
     """
-    Import CSV data from a specific file path
+    Import CSV, Parquet or Arrow IPC data from a specific file path
     """
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
-    if not file_path.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if not is_supported(file_path):
+        raise HTTPException(status_code=400, detail=SUPPORTED_FILES_DETAIL)
+    
+    if background:
+        job = import_job_manager.submit(file_path, chunk_size=chunk_size, active_only=active_only)
+        return _import_started_response(job)
     
     try:
-        result = data_import_service.import_csv_data(file_path, db)
-        
-        if result["success"]:
-            return {
-                "message": "Data imported successfully",
-                "jobs_created": result["jobs_created"],
-                "candidates_created": result["candidates_created"],
-                "skills_created": result["skills_created"],
-                "total_records": result["total_records"]
-            }
-        else:
-            raise HTTPException(status_code=500, detail=f"Import failed: {result['error']}")
+        result = data_import_service.import_csv_data(
+            file_path, db, chunk_size=chunk_size, active_only=active_only
+        )
+        return _import_result_response(result)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@router.get("/imports")
+async def list_imports():
+    """
+    List background imports, newest first
+    """
+    return [_import_status_response(job) for job in import_job_manager.list_jobs()]
+
+@router.get("/imports/{import_id}")
+async def get_import_status(import_id: str):
+    """
+    Get progress of a background import: rows read, inserted and skipped, throughput and ETA
+    """
+    job = import_job_manager.get(import_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    return _import_status_response(job)
+
+@router.post("/imports/{import_id}/cancel")
+async def cancel_import(import_id: str):
+    """
+    Cancel a background import. Chunks already committed are kept; the
+    chunk in flight is rolled back.
+    """
+    job = import_job_manager.cancel(import_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    return _import_status_response(job)
+
+@router.get("/files/{file_id}/errors")
+def download_import_errors(file_id: int, db: Session = Depends(get_db)):
+    """
+    Download the CSV report of rows an import rejected, with each row's
+    position in the file and what was wrong with it
+    """
+    imported_file = db.get(ImportedFile, file_id)
+    if imported_file is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if not imported_file.error_file or not os.path.exists(imported_file.error_file):
+        raise HTTPException(status_code=404, detail="No rejected rows for this import")
+    
+    return FileResponse(
+        imported_file.error_file,
+        media_type="text/csv",
+        filename=f"import_{file_id}_errors.csv"
+    )
+
+def _import_started_response(job) -> Dict:
+    return {
+        "message": "Import started",
+        "import_id": job.id,
+        "status": job.status,
+        "status_url": f"{settings.api_v1_prefix}/data-import/imports/{job.id}"
+    }
+
+def _errors_url(result: Optional[Dict]) -> Dict:
+    """
+    Link to the rejected-rows report, for results that have one
+    """
+    if not result or not result.get("rows_rejected"):
+        return {}
+    return {"errors_url": f"{settings.api_v1_prefix}/data-import/files/{result['file_id']}/errors"}
+
+def _import_status_response(job) -> Dict:
+    status = job.to_dict()
+    if status["result"]:
+        status["result"] = {**status["result"], **_errors_url(status["result"])}
+    return status
+
+def _import_result_response(result: Dict) -> Dict:
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=f"Import failed: {result['error']}")
+    
+    if result.get("skipped"):
+        return {
+            "message": "File already imported; nothing to do",
+            "skipped": True,
+            "duplicate_of": result["duplicate_of"]
+        }
+    
+    return {
+        "message": "Data imported successfully",
+        "file_id": result["file_id"],
+        "jobs_created": result["jobs_created"],
+        "candidates_created": result["candidates_created"],
+        "candidates_updated": result["candidates_updated"],
+        "rows_unchanged": result["rows_unchanged"],
+        "rows_rejected": result["rows_rejected"],
+        "skills_created": result["skills_created"],
+        "total_records": result["total_records"],
+        **_errors_url(result)
+    }
+
+@router.get("/export/{table}")
+def export_table(
+    table: str,
+    format: str = Query("parquet", pattern="^(csv|parquet|arrow)$", description="csv, parquet or arrow (IPC file)"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export (default: all)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Export a whole table (candidates, jobs or skills) as a file. Rows are
+    streamed from the database in chunks; JSON columns are exported as JSON text.
+    """
+    model = EXPORT_TABLES.get(table)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+    
+    try:
+        selected = parse_fields(columns, model.__table__.c.keys())
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    extension = FORMAT_EXTENSIONS[format][0]
+    fd, path = tempfile.mkstemp(suffix=extension)
+    os.close(fd)
+    try:
+        data_export_service.export_table(db, model, format, path, columns=selected)
+    except UnsupportedFormatError as e:
+        os.unlink(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        os.unlink(path)
+        raise HTTPException(status_code=500, detail=f"Error exporting data: {str(e)}")
+    
+    return FileResponse(
+        path,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        filename=f"{table}{extension}",
+        background=BackgroundTask(os.unlink, path)
+    )
+
 @router.get("/csv/summary")
-async def get_csv_summary(file_path: str):
+def get_csv_summary(file_path: str):
     """
-    Get summary of CSV data without importing
+    Get summary of CSV, Parquet or Arrow data without importing. Cached
+    until the file changes.
     """
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
-    if not file_path.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if not is_supported(file_path):
+        raise HTTPException(status_code=400, detail=SUPPORTED_FILES_DETAIL)
     
     try:
         summary = data_import_service.get_import_summary(file_path)
@@ -98,43 +378,24 @@ async def get_csv_summary(file_path: str):
         
         return summary
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing file: {str(e)}")
 
 @router.get("/csv/preview")
-async def preview_csv_data(file_path: str, rows: int = 10):
+def preview_csv_data(file_path: str, rows: int = Query(10, ge=1, le=1000)):
     """
-    Preview CSV data (first N rows)
+    Preview data (first N rows); only those rows are read
     """
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
-    if not file_path.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if not is_supported(file_path):
+        raise HTTPException(status_code=400, detail=SUPPORTED_FILES_DETAIL)
     
     try:
-        import pandas as pd
-        df = pd.read_csv(file_path)
-        
-        # Get column information
-        columns_info = []
-        for col in df.columns:
-            columns_info.append({
-                "name": col,
-                "type": str(df[col].dtype),
-                "unique_values": df[col].nunique(),
-                "null_count": df[col].isnull().sum()
-            })
-        
-        # Get preview data
-        preview_data = df.head(rows).to_dict('records')
-        
-        return {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "columns_info": columns_info,
-            "preview_data": preview_data
-        }
+        return data_import_service.get_preview(file_path, rows)
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
@@ -1,16 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...core.database import get_db
+from ...core.database import get_async_db, get_async_read_db, get_db, read_your_writes
+from ...core.pagination import paginate_keyset_async, cached_count_async, invalidate_count_cache, InvalidCursorError
+from ...core.projection import parse_fields, apply_projection, project_rows, InvalidFieldsError
 from ...models.job import Job
-from ...schemas.job import JobCreate, JobUpdate, JobResponse, JobListResponse
+from ...schemas.job import JobCreate, JobUpdate, JobResponse, JobListResponse, JobSearchHit, JobSearchResponse
+from ...schemas.bulk import BulkOperationResponse
 from ...services.skills_assessment import SkillsAssessmentService
+from ...services.bulk_operations import BulkOperationsService, BulkPayloadError
+from ...services.search import SearchQueryBuilder, InvalidSearchQueryError
 
 router = APIRouter()
 skills_service = SkillsAssessmentService()
+bulk_service = BulkOperationsService()
 
-@router.post("/", response_model=JobResponse)
-def create_job(job: JobCreate, db: Session = Depends(get_db)):
+# Sort keys accepted by the list endpoint; each is backed by a (column, id) index
+JOB_SORT_COLUMNS = {
+    "id": Job.id,
+    "created_at": Job.created_at,
+    "max_salary": Job.max_salary
+}
+
+@router.post("/", response_model=JobResponse, dependencies=[Depends(read_your_writes)])
+async def create_job(job: JobCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new job role
     """
@@ -21,63 +38,148 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
     # Create job object
     db_job = Job(**job.dict())
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    invalidate_count_cache(Job.__tablename__)
     
     return db_job
 
+@router.post("/bulk", response_model=BulkOperationResponse, dependencies=[Depends(read_your_writes)])
+async def bulk_create_jobs(request: Request, db: Session = Depends(get_db)):
+    """
+    Create many job roles at once.
+    
+    Accepts a JSON array or NDJSON (Content-Type: application/x-ndjson) and
+    returns a status per item. Rows are written in chunks, one transaction each.
+    """
+    body = await request.body()
+    try:
+        items = await run_in_threadpool(bulk_service.parse_payload, body, request.headers.get("content-type"))
+    except BulkPayloadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Parsing and writing are blocking; keep them off the event loop
+    return await run_in_threadpool(bulk_service.insert_jobs, db, items)
+
 @router.get("/", response_model=JobListResponse)
-def get_jobs(
+async def get_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    sort_by: str = Query("id", pattern="^(id|created_at|max_salary)$"),
+    descending: bool = False,
+    include_total: bool = True,
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return, e.g. id,title,department"),
     department: Optional[str] = None,
     level: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Get list of jobs with optional filtering
+    Get list of jobs with optional filtering and keyset pagination
     """
-    query = db.query(Job)
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either cursor or skip, not both")
+    
+    try:
+        selected_fields = parse_fields(fields, Job.__table__.columns.keys())
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    query = select(Job)
     
     # Apply filters
     if department:
-        query = query.filter(Job.department == department)
+        query = query.where(Job.department == department)
     if level:
-        query = query.filter(Job.level == level)
+        query = query.where(Job.level == level)
     if is_active is not None:
-        query = query.filter(Job.is_active == is_active)
+        query = query.where(Job.is_active == is_active)
+    
+    # Get total count (cached per filter combination)
+    total = None
+    if include_total:
+        total = await cached_count_async(db, query, (Job.__tablename__, department, level, is_active))
+    
+    # Load only the requested columns; the sort key is needed for the cursor
+    if selected_fields:
+        query = apply_projection(query, Job, selected_fields, extra=[sort_by])
     
-    # Get total count
-    total = query.count()
+    # Apply keyset pagination
+    try:
+        jobs, next_cursor = await paginate_keyset_async(
+            db, query, JOB_SORT_COLUMNS[sort_by], Job.id,
+            sort_by, descending, limit, cursor=cursor, offset=skip
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Apply pagination
-    jobs = query.offset(skip).limit(limit).all()
+    # A cursor page has no page number; skip/limit pages keep theirs
+    page = None if cursor else skip // limit + 1
+    
+    if selected_fields:
+        # Sparse response: skip the full response model and serialize only these fields
+        return JSONResponse(content={
+            "jobs": project_rows(jobs, selected_fields),
+            "total": total,
+            "page": page,
+            "size": limit,
+            "next_cursor": next_cursor
+        })
     
     return JobListResponse(
         jobs=jobs,
         total=total,
+        page=page,
+        size=limit,
+        next_cursor=next_cursor
+    )
+
+@router.get("/search", response_model=JobSearchResponse)
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in title, required skills, description and responsibilities"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Full-text search over jobs, best matches first, with highlighted snippets
+    """
+    search = SearchQueryBuilder.for_session(db)
+    try:
+        hits = (await db.execute(search.job_hits(q).offset(skip).limit(limit))).all()
+        cache_key = (Job.__tablename__, "search", q)
+        total = await cached_count_async(db, search.job_matches(q), cache_key) if include_total else None
+    except InvalidSearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    jobs = {job.id: job for job in await db.scalars(select(Job).where(Job.id.in_([hit.id for hit in hits])))}
+    
+    return JobSearchResponse(
+        results=[JobSearchHit(job=jobs[hit.id], score=hit.score, snippet=hit.snippet) for hit in hits if hit.id in jobs],
+        total=total,
         page=skip // limit + 1,
         size=limit
     )
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """
     Get a specific job by ID
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     return job
 
-@router.put("/{job_id}", response_model=JobResponse)
-def update_job(job_id: int, job_update: JobUpdate, db: Session = Depends(get_db)):
+@router.put("/{job_id}", response_model=JobResponse, dependencies=[Depends(read_your_writes)])
+async def update_job(job_id: int, job_update: JobUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update a job role
     """
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -98,37 +200,39 @@ def update_job(job_id: int, job_update: JobUpdate, db: Session = Depends(get_db)
     for field, value in update_data.items():
         setattr(db_job, field, value)
     
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    invalidate_count_cache(Job.__tablename__)
     
     return db_job
 
-@router.delete("/{job_id}")
-def delete_job(job_id: int, db: Session = Depends(get_db)):
+@router.delete("/{job_id}", dependencies=[Depends(read_your_writes)])
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a job role (soft delete by setting is_active to False)
     """
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     db_job.is_active = False
-    db.commit()
+    await db.commit()
+    invalidate_count_cache(Job.__tablename__)
     
     return {"message": "Job deleted successfully"}
 
 @router.get("/departments/list")
-def get_departments(db: Session = Depends(get_db)):
+async def get_departments(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get list of all departments
     """
-    departments = db.query(Job.department).distinct().all()
-    return [dept[0] for dept in departments]
+    departments = await db.scalars(select(Job.department).distinct())
+    return list(departments)
 
 @router.get("/levels/list")
-def get_levels(db: Session = Depends(get_db)):
+async def get_levels(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get list of all job levels
     """
-    levels = db.query(Job.level).distinct().all()
-    return [level[0] for level in levels] 
\ No newline at end of file
+    levels = await db.scalars(select(Job.level).distinct())
+    return list(levels) 
\ No newline at end of file
@@ -0,0 +1,204 @@
+from typing import Dict, Iterable, Optional
+import numpy as np
+
+# A container holds the ids sharing their high 16 bits: a sorted uint16 array
+# while it has at most ARRAY_MAX_SIZE ids, else a 2^16-bit bitset (8 KiB)
+ARRAY_MAX_SIZE = 4096
+
+# Set bits per 16-bit value, for NumPy versions without bitwise_count
+_POPCOUNT_16 = None if hasattr(np, "bitwise_count") else np.array(
+    [bin(value).count("1") for value in range(1 << 16)], dtype=np.uint8
+)
+
+def _popcount(bitset: np.ndarray) -> int:
+    if _POPCOUNT_16 is None:
+        return int(np.bitwise_count(bitset.view(np.uint64)).sum())
+    return int(_POPCOUNT_16[bitset.view(np.uint16)].sum(dtype=np.int64))
+
+def _is_bitset(container: np.ndarray) -> bool:
+    return container.dtype == np.uint8
+
+def _cardinality(container: np.ndarray) -> int:
+    return _popcount(container) if _is_bitset(container) else len(container)
+
+def _to_bitset(values: np.ndarray) -> np.ndarray:
+    mask = np.zeros(1 << 16, dtype=bool)
+    mask[values] = True
+    return np.packbits(mask, bitorder="little")
+
+def _to_array(bitset: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.unpackbits(bitset, bitorder="little").view(bool)).astype(np.uint16)
+
+def _contains(bitset: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Mask of the values whose bit is set"""
+    return ((bitset[values >> 3] >> (values & 7).astype(np.uint8)) & 1).astype(bool)
+
+def _normalized(container: np.ndarray) -> Optional[np.ndarray]:
+    """The container in its compact form, or None when empty"""
+    if _is_bitset(container):
+        cardinality = _cardinality(container)
+        if cardinality == 0:
+            return None
+        return _to_array(container) if cardinality <= ARRAY_MAX_SIZE else container
+    if len(container) == 0:
+        return None
+    return _to_bitset(container) if len(container) > ARRAY_MAX_SIZE else container
+
+def _and(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if _is_bitset(a) and _is_bitset(b):
+        return a & b
+    if _is_bitset(a):
+        a, b = b, a
+    if _is_bitset(b):
+        return a[_contains(b, a)]
+    return np.intersect1d(a, b, assume_unique=True)
+
+def _or(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if _is_bitset(a) and _is_bitset(b):
+        return a | b
+    if _is_bitset(a):
+        a, b = b, a
+    if _is_bitset(b):
+        result = b.copy()
+        np.bitwise_or.at(result, a >> 3, (1 << (a & 7)).astype(np.uint8))
+        return result
+    return np.union1d(a, b).astype(np.uint16)
+
+def _and_not(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if _is_bitset(a) and _is_bitset(b):
+        return a & ~b
+    if _is_bitset(b):
+        return a[~_contains(b, a)]
+    if _is_bitset(a):
+        return a & ~_to_bitset(b)
+    return np.setdiff1d(a, b, assume_unique=True).astype(np.uint16)
+
+class Bitmap:
+    """
+    Immutable compressed set of non-negative integer ids, after Roaring
+    bitmaps: ids are split by their high 16 bits into containers that are
+    sorted arrays when sparse and bitsets when dense, so both a rare skill
+    and "is available" stay small and fast to combine.
+
+    &, | and - (and-not) return new bitmaps; with_id/without_id copy only
+    the container they touch, so a bitmap can be shared with readers while
+    writers derive the next version.
+    """
+    __slots__ = ("_containers",)
+
+    def __init__(self, containers: Optional[Dict[int, np.ndarray]] = None):
+        self._containers = containers or {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "Bitmap":
+        ids = np.unique(ids.astype(np.int64) if isinstance(ids, np.ndarray) else np.fromiter(ids, dtype=np.int64))
+        containers = {}
+        if len(ids):
+            highs = ids >> 16
+            starts = np.flatnonzero(np.r_[True, highs[1:] != highs[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], len(ids)]):
+                low = (ids[start:end] & 0xFFFF).astype(np.uint16)
+                containers[int(highs[start])] = _to_bitset(low) if len(low) > ARRAY_MAX_SIZE else low
+        return cls(containers)
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __contains__(self, id_: int) -> bool:
+        container = self._containers.get(id_ >> 16)
+        if container is None:
+            return False
+        low = np.array([id_ & 0xFFFF], dtype=np.uint16)
+        if _is_bitset(container):
+            return bool(_contains(container, low)[0])
+        position = np.searchsorted(container, low[0])
+        return position < len(container) and container[position] == low[0]
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for high in self._containers.keys() & other._containers.keys():
+            container = _normalized(_and(self._containers[high], other._containers[high]))
+            if container is not None:
+                containers[high] = container
+        return Bitmap(containers)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        containers = dict(self._containers)
+        for high, container in other._containers.items():
+            mine = containers.get(high)
+            containers[high] = container if mine is None else _normalized(_or(mine, container))
+        return Bitmap(containers)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        containers = dict(self._containers)
+        for high in self._containers.keys() & other._containers.keys():
+            container = _normalized(_and_not(self._containers[high], other._containers[high]))
+            if container is None:
+                del containers[high]
+            else:
+                containers[high] = container
+        return Bitmap(containers)
+
+    def intersection_len(self, other: "Bitmap") -> int:
+        """len(self & other) without building the intersection"""
+        total = 0
+        for high in self._containers.keys() & other._containers.keys():
+            a, b = self._containers[high], other._containers[high]
+            if _is_bitset(a) and _is_bitset(b):
+                total += _popcount(a & b)
+            else:
+                total += len(_and(a, b))
+        return total
+
+    def with_id(self, id_: int) -> "Bitmap":
+        high, low = id_ >> 16, np.array([id_ & 0xFFFF], dtype=np.uint16)
+        container = self._containers.get(high)
+        containers = dict(self._containers)
+        containers[high] = low if container is None else _normalized(_or(container, low))
+        return Bitmap(containers)
+
+    def without_id(self, id_: int) -> "Bitmap":
+        high = id_ >> 16
+        if high not in self._containers:
+            return self
+        containers = dict(self._containers)
+        container = _normalized(_and_not(containers[high], np.array([id_ & 0xFFFF], dtype=np.uint16)))
+        if container is None:
+            del containers[high]
+        else:
+            containers[high] = container
+        return Bitmap(containers)
+
+    def page(self, offset: int, limit: int) -> np.ndarray:
+        """ids[offset:offset + limit] of to_array(), decoding only the containers needed"""
+        parts = []
+        for high in sorted(self._containers):
+            if limit <= 0:
+                break
+            container = self._containers[high]
+            cardinality = _cardinality(container)
+            if offset >= cardinality:
+                offset -= cardinality
+                continue
+            low = _to_array(container) if _is_bitset(container) else container
+            low = low[offset:offset + limit]
+            parts.append((high << 16) | low.astype(np.int64))
+            limit -= len(low)
+            offset = 0
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def to_array(self) -> np.ndarray:
+        """The ids, ascending"""
+        parts = []
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            low = _to_array(container) if _is_bitset(container) else container
+            parts.append((high << 16) | low.astype(np.int64))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(container.nbytes for container in self._containers.values())
@@ -13,6 +13,31 @@ class Settings(BaseSettings):
     
     # Database settings
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./workforce_ai.db")
+    # Async routes use the same database through aiosqlite/asyncpg unless set
+    async_database_url: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+    
+    # Read engine for analysis and list routes (default: read-only connection
+    # to the SQLite file, or the primary)
+    read_database_url: Optional[str] = os.getenv("READ_DATABASE_URL")
+    async_read_database_url: Optional[str] = os.getenv("ASYNC_READ_DATABASE_URL")
+    # Seconds after a write during which the same client reads from the primary
+    read_your_writes_seconds: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    
+    # SQLite profile: WAL journal and tuned pragmas on every connection, plus
+    # periodic PRAGMA optimize and WAL checkpoints (SQLITE_TUNING=false disables)
+    sqlite_tuning: bool = os.getenv("SQLITE_TUNING", "true").lower() not in ("0", "false", "no")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_mb: int = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+    sqlite_mmap_size_mb: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    sqlite_wal_truncate_mb: int = int(os.getenv("SQLITE_WAL_TRUNCATE_MB", "64"))
+    sqlite_maintenance_interval_seconds: int = int(os.getenv("SQLITE_MAINTENANCE_INTERVAL_SECONDS", "600"))
+    
+    # Connection pool sizes (unset: SQLAlchemy defaults)
+    db_pool_size: Optional[int] = int(os.environ["DB_POOL_SIZE"]) if os.getenv("DB_POOL_SIZE") else None
+    db_max_overflow: Optional[int] = int(os.environ["DB_MAX_OVERFLOW"]) if os.getenv("DB_MAX_OVERFLOW") else None
+    read_db_pool_size: Optional[int] = int(os.environ["READ_DB_POOL_SIZE"]) if os.getenv("READ_DB_POOL_SIZE") else None
+    read_db_max_overflow: Optional[int] = int(os.environ["READ_DB_MAX_OVERFLOW"]) if os.getenv("READ_DB_MAX_OVERFLOW") else None
     
     # Security settings
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -22,6 +47,38 @@ class Settings(BaseSettings):
     # API settings
     api_v1_prefix: str = "/api/v1"
     
+    # Pagination settings
+    count_cache_ttl_seconds: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+    count_cache_max_entries: int = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
+    
+    # The bitmap index and analysis snapshot read changes made elsewhere at most this often
+    candidate_changes_interval_seconds: float = float(os.getenv("CANDIDATE_CHANGES_INTERVAL_SECONDS", "1"))
+    
+    # Candidate bitmap index settings (changes are read on use; rebuilt after this long,
+    # to pick up changes elsewhere the per-use check missed)
+    bitmap_index_ttl_seconds: int = int(os.getenv("BITMAP_INDEX_TTL_SECONDS", "3600"))
+    
+    # Analysis candidate snapshot settings (changes are read on use; reloaded in full
+    # after this long, to pick up changes elsewhere the per-use check missed)
+    candidate_snapshot_ttl_seconds: int = int(os.getenv("CANDIDATE_SNAPSHOT_TTL_SECONDS", "3600"))
+    
+    # Bulk write settings (rows per multi-row statement / transaction)
+    bulk_chunk_size: int = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+    import_chunk_size: int = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+    # Background imports that run at once (IMPORT_MAX_WORKERS is its old name, still read)
+    import_concurrency: int = int(os.getenv("IMPORT_CONCURRENCY", os.getenv("IMPORT_MAX_WORKERS", "1")))
+    # Worker processes converting the chunks of each single import
+    import_workers: int = int(os.getenv("IMPORT_WORKERS", "1"))
+    
+    # Upload settings (uploads are spooled to upload_dir, defaulting to the system temp dir)
+    upload_dir: Optional[str] = os.getenv("UPLOAD_DIR")
+    # Resumable uploads idle this long are discarded along with their files
+    upload_session_ttl_seconds: int = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", "86400"))
+    import_errors_dir: Optional[str] = os.getenv("IMPORT_ERRORS_DIR")  # rejected-row reports
+    
+    # Where summary/preview cache sidecars go (never next to the data files themselves)
+    file_cache_dir: str = os.getenv("FILE_CACHE_DIR", ".file_cache")
+    
     # CORS settings
     allowed_origins: list = ["http://localhost:3000", "http://localhost:8501"]
     
@@ -1,24 +1,226 @@
-from sqlalchemy import create_engine
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import bindparam, create_engine, func, insert, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .sqlite_profile import configure_sqlite_engine
+from .threaded_session import ThreadedSession
 
-# Create database engine
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg"
+}
+
+# Cookie holding the time until which a client's reads go to the primary,
+# and the header a client can send to ask for that on a single request
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+def async_database_url(url: str) -> Optional[str]:
+    """
+    The async counterpart of a database URL: same database, async driver.
+    None for databases without a known async driver.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return None
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def sqlite_read_only_url(url: str) -> Optional[str]:
+    """
+    A read-only URI connection to the same SQLite file, or None for
+    other databases and in-memory SQLite
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.set(
+        database=f"file:{os.path.abspath(parsed.database)}",
+        query={"mode": "ro", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+def _engine_options(url: str, pool_size: Optional[int], max_overflow: Optional[int]) -> Dict:
+    options = {}
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if pool_size is not None:
+        options["pool_size"] = pool_size
+    if max_overflow is not None:
+        options["max_overflow"] = max_overflow
+    return options
+
+# Primary engine: all writes, and reads that must see them
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    **_engine_options(settings.database_url, settings.db_pool_size, settings.db_max_overflow)
 )
 
-# Create session factory
+# Read engine: READ_DATABASE_URL (e.g. a replica), else a read-only
+# connection to the same SQLite file, else the primary itself
+read_database_url = settings.read_database_url or sqlite_read_only_url(settings.database_url)
+if read_database_url:
+    read_engine = create_engine(
+        read_database_url,
+        **_engine_options(read_database_url, settings.read_db_pool_size, settings.read_db_max_overflow)
+    )
+else:
+    read_engine = engine
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+def _async_session_factory(sync_engine, async_url: Optional[str], options: Dict):
+    """
+    An AsyncSession factory on async_url, or, for a database without a known
+    async driver, one of ThreadedSessions over sync_engine. Returns the async
+    engine too (None in the second case).
+    """
+    # Objects stay loaded after commit, since lazy refreshes are not possible
+    # outside the session's event loop
+    if async_url is None:
+        factory = sessionmaker(sync_engine, expire_on_commit=False, autoflush=False)
+        return None, lambda: ThreadedSession(factory())
+    async_engine = create_async_engine(async_url, **options)
+    return async_engine, async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+# Async engines for I/O-bound routes; the sync engines above stay in use for
+# CPU-bound work (analysis, imports, bulk operations)
+async_engine, AsyncSessionLocal = _async_session_factory(
+    engine,
+    settings.async_database_url or async_database_url(settings.database_url),
+    _engine_options(settings.database_url, settings.db_pool_size, settings.db_max_overflow)
+)
+if read_database_url:
+    async_read_engine, AsyncReadSessionLocal = _async_session_factory(
+        read_engine,
+        settings.async_read_database_url or async_database_url(read_database_url),
+        _engine_options(read_database_url, settings.read_db_pool_size, settings.read_db_max_overflow)
+    )
+else:
+    async_read_engine, AsyncReadSessionLocal = async_engine, AsyncSessionLocal
+
+# SQLite: WAL and tuned pragmas on every connection
+configure_sqlite_engine(engine)
+if async_engine is not None:
+    configure_sqlite_engine(async_engine)
+if read_database_url:
+    configure_sqlite_engine(read_engine, read_only=True)
+    if async_read_engine is not None:
+        configure_sqlite_engine(async_read_engine, read_only=True)
 
 # Create base class for models
 Base = declarative_base()
 
+def upsert(
+    session,
+    model,
+    rows: List[Dict],
+    key: str,
+    returning: Iterable = (),
+    update_columns: Optional[Iterable[str]] = None
+) -> List:
+    """
+    Insert rows, updating the other given columns (and updated_at) of rows
+    whose key column already exists. update_columns narrows the columns an
+    existing row takes from its new row; the rest are only written on insert.
+    SQLite and Postgres do this in one INSERT ... ON CONFLICT statement; other
+    databases select the existing keys first, then insert the new rows and
+    update the rest. Returns the returning columns of every row written.
+    """
+    table = model.__table__
+    key_column = table.c[key]
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name != key] if rows else []
+    else:
+        update_columns = [name for name in update_columns if name != key]
+    touch = {"updated_at": func.now()} if "updated_at" in table.c else {}
+    returning = list(returning)
+
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column],
+            set_={**{name: stmt.excluded[name] for name in update_columns}, **touch}
+        )
+        if returning:
+            return session.execute(stmt.values(rows).returning(*returning)).all()
+        session.execute(stmt, rows)
+        return []
+
+    keys = [row[key] for row in rows]
+    existing = set(session.scalars(select(key_column).where(key_column.in_(keys))))
+    new_rows = [row for row in rows if row[key] not in existing]
+    if new_rows:
+        session.execute(insert(table), new_rows)
+    changed_rows = [
+        {f"_{name}": row[name] for name in (key, *update_columns)}
+        for row in rows if row[key] in existing
+    ]
+    if changed_rows:
+        session.execute(
+            update(table).where(key_column == bindparam(f"_{key}")).values(
+                **{name: bindparam(f"_{name}") for name in update_columns}, **touch
+            ),
+            changed_rows
+        )
+    if returning:
+        return session.execute(select(*returning).where(key_column.in_(keys))).all()
+    return []
+
+def read_your_writes(response: Response) -> None:
+    """
+    Dependency for write routes: send this client's reads to the primary for
+    settings.read_your_writes_seconds, so it sees its write even while a
+    replica lags behind
+    """
+    window = settings.read_your_writes_seconds
+    if window > 0:
+        response.set_cookie(READ_PRIMARY_COOKIE, f"{time.time() + window:.3f}", max_age=window, httponly=True)
+
+def _reads_from_primary(request: Request) -> bool:
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true"):
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get a read-only database session (primary after a recent write)
+def get_read_db(request: Request):
+    db = SessionLocal() if _reads_from_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency to get an async read-only database session
+async def get_async_read_db(request: Request):
+    factory = AsyncSessionLocal if _reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
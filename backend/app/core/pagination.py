@@ -0,0 +1,203 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from sqlalchemy import Select, String, and_, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import settings
+
+# In-process cache of list totals: key -> (expires_at, count), least
+# recently used first. Keys hold client-supplied filters, so it is bounded
+# by settings.count_cache_max_entries.
+_count_cache: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, last_id: int) -> str:
+    """
+    Build an opaque cursor token from the last row of a page
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "d": descending, "v": value, "i": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, int]:
+    """
+    Decode a cursor token, checking it was issued for the same sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["v"], int(payload["i"])
+        issued_for = (payload["s"], bool(payload["d"]))
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+
+    if issued_for != (sort_by, descending):
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+
+    return value, last_id
+
+
+def _sort_expression(column, dialect_name: str):
+    """
+    Expression used to order and compare the sort key.
+
+    SQLite stores datetimes as text in whatever format they were written with
+    (CURRENT_TIMESTAMP omits microseconds), so round-tripping them through
+    Python datetimes breaks equality on ties. Compare the stored text instead;
+    type_coerce emits no CAST, so the index is still used.
+    """
+    if dialect_name == "sqlite" and column.type.python_type is datetime:
+        return type_coerce(column, String)
+    return column
+
+
+def _coerce_cursor_value(column, value: Any, dialect_name: str) -> Any:
+    """
+    Convert a JSON cursor value back into something comparable with the column
+    """
+    if value is None or dialect_name == "sqlite":
+        return value
+    if column.type.python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _keyset_page_query(
+    query,
+    dialect_name: str,
+    sort_column,
+    id_column,
+    sort_by: str,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str],
+    offset: int
+):
+    """
+    Apply the cursor filter, ordering and limit to a select().
+    Returns the page query and the expression the sort key is compared as.
+    """
+    key = _sort_expression(sort_column, dialect_name)
+    sort_is_id = sort_column is id_column
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, descending)
+        value = _coerce_cursor_value(sort_column, value, dialect_name)
+        after_id = id_column < last_id if descending else id_column > last_id
+
+        if sort_is_id:
+            query = query.filter(after_id)
+        elif value is None:
+            query = query.filter(and_(key.is_(None), after_id))
+        else:
+            after_value = key < value if descending else key > value
+            query = query.filter(or_(
+                after_value,
+                and_(key == value, after_id),
+                key.is_(None)
+            ))
+
+    if sort_is_id:
+        order_by = [id_column.desc() if descending else id_column.asc()]
+    else:
+        direction = key.desc() if descending else key.asc()
+        order_by = [direction.nulls_last(), id_column.desc() if descending else id_column.asc()]
+
+    # Fetch one extra row to find out whether another page exists
+    return query.order_by(*order_by).offset(offset).limit(limit + 1), key
+
+
+async def paginate_keyset_async(
+    session: AsyncSession,
+    stmt: Select,
+    sort_column,
+    id_column,
+    sort_by: str,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a select() of one entity, ordered by (sort_column, id),
+    and return it with the next cursor.
+
+    Rows with a NULL sort key are placed last in both directions so the
+    ordering is identical on SQLite and Postgres. A plain offset is still
+    honoured for the first request so existing skip/limit callers keep working.
+    """
+    dialect_name = session.get_bind().dialect.name
+    page_stmt, key = _keyset_page_query(
+        stmt, dialect_name, sort_column, id_column, sort_by, descending, limit, cursor, offset
+    )
+    rows = (await session.scalars(page_stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        last_value = getattr(last, sort_column.key)
+        if dialect_name == "sqlite" and isinstance(last_value, datetime):
+            # Re-read the stored text so the cursor matches what is compared
+            last_value = await session.scalar(select(key).where(id_column == last.id))
+        next_cursor = encode_cursor(sort_by, descending, last_value, last.id)
+
+    return rows, next_cursor
+
+
+def _cached_total(cache_key: Hashable) -> Optional[int]:
+    with _count_cache_lock:
+        cached = _count_cache.get(cache_key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _count_cache[cache_key]
+            return None
+        _count_cache.move_to_end(cache_key)
+        return cached[1]
+
+
+def _store_total(cache_key: Hashable, total: int) -> int:
+    now = time.monotonic()
+    with _count_cache_lock:
+        _count_cache[cache_key] = (now + settings.count_cache_ttl_seconds, total)
+        _count_cache.move_to_end(cache_key)
+        # Drop expired totals, then the least recently used ones over the limit
+        for key in [k for k, (expires_at, _) in _count_cache.items() if expires_at <= now]:
+            del _count_cache[key]
+        while len(_count_cache) > max(settings.count_cache_max_entries, 1):
+            _count_cache.popitem(last=False)
+    return total
+
+
+async def cached_count_async(session: AsyncSession, stmt: Select, cache_key: Hashable) -> int:
+    """
+    Return the row count of a select(), reusing a recent result for the same filters
+    """
+    total = _cached_total(cache_key)
+    if total is None:
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        total = _store_total(cache_key, await session.scalar(count_stmt))
+    return total
+
+
+def invalidate_count_cache(table_name: str) -> None:
+    """
+    Drop cached totals for a table after a write
+    """
+    with _count_cache_lock:
+        for key in [k for k in _count_cache if k[0] == table_name]:
+            del _count_cache[key]
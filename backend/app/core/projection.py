@@ -0,0 +1,48 @@
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Query, load_only
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields= parameter names an unknown field"""
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields= parameter, keeping the requested order.
+
+    Returns None when no projection was requested.
+    """
+    if not fields:
+        return None
+
+    requested = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    if not requested:
+        raise InvalidFieldsError("No fields requested")
+
+    return requested
+
+
+def apply_projection(query: Query, model, fields: List[str], extra: Iterable[str] = ()) -> Query:
+    """
+    Load only the requested columns (plus any extra ones the caller needs,
+    such as the sort key); everything else, including the JSON blobs, is deferred.
+    Works on a Query or a select().
+    """
+    columns = [getattr(model, name) for name in dict.fromkeys([*fields, *extra])]
+    return query.options(load_only(*columns))
+
+
+def project_rows(rows: List[Any], fields: List[str]) -> List[Dict[str, Any]]:
+    """
+    Serialize rows to dicts holding only the requested fields
+    """
+    return jsonable_encoder([{name: getattr(row, name) for name in fields} for row in rows])
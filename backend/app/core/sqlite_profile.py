@@ -0,0 +1,107 @@
+import os
+import threading
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from .config import settings
+
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False) -> None:
+    """
+    Apply the SQLite performance profile to a new connection.
+
+    WAL lets readers run alongside a writer; synchronous=NORMAL is durable
+    across application crashes in WAL mode and only risks the last
+    transactions on power loss. Read-only connections cannot change the
+    journal mode and simply follow the file's.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Shrink the WAL back to this size after checkpoints
+            cursor.execute(f"PRAGMA journal_size_limit={settings.sqlite_wal_truncate_mb * 1024 * 1024}")
+        # Wait for locks instead of failing with "database is locked"
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size={-settings.sqlite_cache_size_mb * 1024}")  # negative: KiB
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(engine, read_only: bool = False) -> None:
+    """
+    Apply the profile to every connection a SQLite engine (sync or async)
+    opens. Other databases, and SQLITE_TUNING=false, leave the engine as is.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite" or not settings.sqlite_tuning:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, read_only)
+
+
+class SQLiteMaintenance:
+    """
+    Periodic upkeep for a SQLite database in WAL mode: PRAGMA optimize (which
+    runs ANALYZE on tables whose statistics are stale) and online WAL
+    checkpoints. A passive checkpoint never blocks readers or writers; the
+    WAL is truncated once it has grown past sqlite_wal_truncate_mb.
+    """
+    def __init__(self, engine: Engine, interval_seconds: Optional[int] = None):
+        self.engine = engine
+        self.interval_seconds = settings.sqlite_maintenance_interval_seconds if interval_seconds is None else interval_seconds
+        database = make_url(str(engine.url)).database
+        self.wal_path = f"{database}-wal" if database and database != ":memory:" else None
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine.dialect.name == "sqlite" and settings.sqlite_tuning and self.wal_path is not None
+
+    def wal_size(self) -> int:
+        return os.path.getsize(self.wal_path) if os.path.exists(self.wal_path) else 0
+
+    def run_once(self) -> Dict:
+        """
+        Optimize and checkpoint once. Returns the checkpoint result:
+        whether it was blocked, WAL frames, and frames checkpointed.
+        """
+        mode = "TRUNCATE" if self.wal_size() > settings.sqlite_wal_truncate_mb * 1024 * 1024 else "PASSIVE"
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA optimize")
+            busy, wal_frames, checkpointed = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+            connection.commit()
+        return {"mode": mode, "busy": bool(busy), "wal_frames": wal_frames, "checkpointed": checkpointed}
+
+    def start(self) -> None:
+        if not self.enabled or self.interval_seconds <= 0 or self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and optimize one last time, as SQLite
+        recommends before closing
+        """
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.run_once()
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                # A locked or busy database just waits for the next round
+                pass
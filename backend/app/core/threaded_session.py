@@ -0,0 +1,57 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+class ThreadedSession:
+    """
+    The AsyncSession methods the async routes use, over a synchronous
+    Session whose calls run in the threadpool. Stands in for AsyncSession on
+    databases without a known async driver, so the routes work unchanged.
+
+    Results are buffered in the worker thread, so reading them on the event
+    loop never touches the connection.
+    """
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def __aenter__(self) -> "ThreadedSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def execute(self, statement, *args, **kwargs):
+        frozen = await run_in_threadpool(lambda: self.sync_session.execute(statement, *args, **kwargs).freeze())
+        return frozen()
+
+    async def scalars(self, statement, *args, **kwargs):
+        return (await self.execute(statement, *args, **kwargs)).scalars()
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
@@ -2,8 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from .core.config import settings
-from .core.database import engine, Base
+from .core.database import async_engine, engine, Base, ReadSessionLocal
+from .core.sqlite_profile import SQLiteMaintenance
 from .api.endpoints import jobs, candidates, analysis, data_import
+from .services.bitmap_index import candidate_bitmaps
+from .services.candidate_snapshot import candidate_snapshot
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -73,6 +76,39 @@ async def root():
         "redoc": "/redoc"
     }
 
+# Periodic PRAGMA optimize and WAL checkpoints (SQLite only)
+sqlite_maintenance = SQLiteMaintenance(engine)
+
+@app.on_event("startup")
+def start_sqlite_maintenance():
+    sqlite_maintenance.start()
+
+@app.on_event("startup")
+def warm_candidate_bitmaps():
+    """
+    Build the candidate bitmap index in the background
+    """
+    candidate_bitmaps.warm(ReadSessionLocal)
+
+@app.on_event("startup")
+def warm_candidate_snapshot():
+    """
+    Load the analysis candidate snapshot in the background
+    """
+    candidate_snapshot.warm(ReadSessionLocal)
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """
+    Close pooled async connections on shutdown
+    """
+    if async_engine is not None:
+        await async_engine.dispose()
+
+@app.on_event("shutdown")
+def stop_sqlite_maintenance():
+    sqlite_maintenance.stop()
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """
@@ -1,5 +1,8 @@
 from .job import Job
 from .candidate import Candidate
 from .skill import Skill
+from .import_record import ImportedFile, ImportedRow
+from . import search_index  # full-text index DDL for jobs and candidates
+from . import skill_index  # candidate_skills junction table DDL (SQLite)
 
-__all__ = ["Job", "Candidate", "Skill"] 
\ No newline at end of file
+__all__ = ["Job", "Candidate", "Skill", "ImportedFile", "ImportedRow"] 
\ No newline at end of file
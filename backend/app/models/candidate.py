@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, JSON, Date
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, JSON, Date, Index, text
 from sqlalchemy.sql import func
 from ..core.database import Base
+from .types import JSONDocument
 
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -20,7 +21,7 @@ class Candidate(Base):
     education_level = Column(String(100), nullable=False)
     
     # Skills and assessment
-    skills = Column(JSON, nullable=False)  # Dict with skill names and proficiency levels (1-10)
+    skills = Column(JSONDocument, nullable=False)  # Dict with skill names and proficiency levels (1-10)
     skill_scores = Column(JSON, nullable=True)  # AI-generated skill scores
     overall_score = Column(Float, nullable=True)  # Overall candidate score
     
@@ -42,5 +43,29 @@ class Candidate(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Keyset pagination indexes: one per sort order, id as tiebreaker
+    __table_args__ = (
+        Index("ix_candidates_overall_score_id", "overall_score", "id"),
+        Index("ix_candidates_years_experience_id", "years_experience", "id"),
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+        # Equality filters of the list endpoint, ordered by id within each value
+        Index("ix_candidates_status_id", "status", "id"),
+        Index("ix_candidates_education_level_id", "education_level", "id"),
+        # Available candidates by score: matching, dashboard counts, sorted
+        # lists. SQLite only treats a partial index as covering when it also
+        # holds the filtered column, hence the trailing is_available.
+        Index(
+            "ix_candidates_available_overall_score",
+            "overall_score", "id", "is_available",
+            sqlite_where=text("is_available = 1"),
+            postgresql_where=text("is_available")
+        ),
+        # Rows changed since a point in time; new rows have no updated_at.
+        # See CandidateChangeFeed
+        Index("ix_candidates_changed_at", func.coalesce(updated_at, created_at)),
+        # Skill key lookups (?, ?&, ?|) on Postgres; see SkillQueryBuilder
+        Index("ix_candidates_skills_gin", "skills", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+    
     def __repr__(self):
         return f"<Candidate(id={self.id}, name='{self.first_name} {self.last_name}', email='{self.email}')>" 
\ No newline at end of file
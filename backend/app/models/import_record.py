@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class ImportedFile(Base):
+    __tablename__ = "imported_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)  # Content hash of the whole file
+    file_name = Column(String(255), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    
+    # Outcome
+    status = Column(String(50), default="running")  # running, completed, failed, cancelled
+    rows_read = Column(Integer, default=0)
+    rows_unchanged = Column(Integer, default=0)
+    candidates_created = Column(Integer, default=0)
+    candidates_updated = Column(Integer, default=0)
+    rows_rejected = Column(Integer, default=0)
+    error_file = Column(String(1024), nullable=True)  # CSV report of rejected rows, if any
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<ImportedFile(id={self.id}, sha256='{self.sha256[:12]}', status='{self.status}')>"
+
+class ImportedRow(Base):
+    __tablename__ = "imported_rows"
+    
+    # One entry per employee: the hash of their row as last imported
+    employee_number = Column(Integer, primary_key=True)
+    row_hash = Column(BigInteger, nullable=False)
+    file_id = Column(Integer, ForeignKey("imported_files.id"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ImportedRow(employee_number={self.employee_number}, file_id={self.file_id})>"
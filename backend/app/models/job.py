@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, JSON, Index, text
 from sqlalchemy.sql import func
 from ..core.database import Base
+from .types import JSONDocument
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -16,7 +17,7 @@ class Job(Base):
     currency = Column(String(3), default="USD")
     
     # Job requirements
-    required_skills = Column(JSON, nullable=False)  # List of required skills
+    required_skills = Column(JSONDocument, nullable=False)  # List of required skills
     preferred_skills = Column(JSON, nullable=True)  # List of preferred skills
     experience_years = Column(Integer, nullable=False)
     education_level = Column(String(100), nullable=False)
@@ -35,5 +36,24 @@ class Job(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Keyset pagination indexes: one per sort order, id as tiebreaker
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_max_salary_id", "max_salary", "id"),
+        # Equality filters of the list endpoint, ordered by id within each value
+        Index("ix_jobs_department_id", "department", "id"),
+        Index("ix_jobs_level_id", "level", "id"),
+        # Active jobs by salary spread (/analysis/jobs/high-demand); also
+        # serves other active-only scans and counts
+        Index(
+            "ix_jobs_active_salary_spread",
+            text("(max_salary - min_salary) DESC"), "is_active",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active")
+        ),
+        # Required-skill lookups (?, ?&, ?|) on Postgres
+        Index("ix_jobs_required_skills_gin", "required_skills", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+    
     def __repr__(self):
         return f"<Job(id={self.id}, title='{self.title}', department='{self.department}')>" 
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import List, NamedTuple, Tuple
+from sqlalchemy import DDL, event
+from .candidate import Candidate
+from .job import Job
+
+class SearchIndex(NamedTuple):
+    """
+    Full-text index over a table.
+
+    SQLite: an FTS5 table <table>_fts whose rowid is the row's id, kept in
+    sync by triggers. Postgres: a generated tsvector column search_vector
+    with a GIN index, which the database maintains itself.
+    """
+    table: str
+    # FTS5 columns, the SQL filling each ({row} is the source row) and
+    # their bm25 weights
+    columns: Tuple[str, ...]
+    values: Tuple[str, ...]
+    weights: Tuple[float, ...]
+    # Source columns whose updates refresh the FTS5 row
+    source_columns: Tuple[str, ...]
+    # Postgres: the weighted document, and the text snippets are cut from
+    postgres_vector: str
+    postgres_text: Tuple[str, ...]
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+CANDIDATE_SEARCH = SearchIndex(
+    table="candidates",
+    columns=("name", "current_position", "current_company", "skills"),
+    values=(
+        "{row}.first_name || ' ' || {row}.last_name",
+        "{row}.current_position",
+        "{row}.current_company",
+        "(SELECT group_concat(key, ', ') FROM json_each({row}.skills))"
+    ),
+    weights=(10.0, 5.0, 2.0, 5.0),
+    source_columns=("first_name", "last_name", "current_position", "current_company", "skills"),
+    postgres_vector=(
+        "setweight(to_tsvector('english', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(current_position, '')), 'B') || "
+        "setweight(jsonb_to_tsvector('english', coalesce(skills, '{}'), '[\"key\"]'), 'B') || "
+        "setweight(to_tsvector('english', coalesce(current_company, '')), 'C')"
+    ),
+    postgres_text=("first_name", "last_name", "current_position", "current_company")
+)
+
+JOB_SEARCH = SearchIndex(
+    table="jobs",
+    columns=("title", "required_skills", "description", "responsibilities"),
+    values=(
+        "{row}.title",
+        "(SELECT group_concat(value, ', ') FROM json_each({row}.required_skills))",
+        "{row}.description",
+        "(SELECT group_concat(value, '; ') FROM json_each({row}.responsibilities))"
+    ),
+    weights=(10.0, 5.0, 1.0, 1.0),
+    source_columns=("title", "required_skills", "description", "responsibilities"),
+    postgres_vector=(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(jsonb_to_tsvector('english', coalesce(required_skills, '[]'), '[\"string\"]'), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+        "setweight(to_tsvector('english', coalesce(responsibilities::text, '')), 'D')"
+    ),
+    postgres_text=("title", "description")
+)
+
+SEARCH_INDEXES = [CANDIDATE_SEARCH, JOB_SEARCH]
+
+def _sqlite_insert(index: SearchIndex, row: str) -> str:
+    values = ", ".join(value.format(row=row) for value in index.values)
+    return f"INSERT INTO {index.fts_table}(rowid, {', '.join(index.columns)}) VALUES ({row}.id, {values});"
+
+def create_statements(index: SearchIndex, dialect_name: str) -> List[str]:
+    """DDL creating the index and what keeps it in sync"""
+    if dialect_name == "sqlite":
+        table, fts = index.table, index.fts_table
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{', '.join(index.columns)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+            f"{_sqlite_insert(index, 'new')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {fts} WHERE rowid = old.id; END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {', '.join(index.source_columns)} ON {table} BEGIN "
+            f"DELETE FROM {fts} WHERE rowid = old.id; {_sqlite_insert(index, 'new')} END"
+        ]
+    if dialect_name == "postgresql":
+        return [
+            f"ALTER TABLE {index.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({index.postgres_vector}) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{index.table}_search_vector ON {index.table} USING gin (search_vector)"
+        ]
+    return []
+
+def rebuild_statements(index: SearchIndex, dialect_name: str) -> List[str]:
+    """Refill an SQLite FTS5 table from its source table"""
+    if dialect_name != "sqlite":
+        return []
+    values = ", ".join(value.format(row=index.table) for value in index.values)
+    return [
+        f"DELETE FROM {index.fts_table}",
+        f"INSERT INTO {index.fts_table}(rowid, {', '.join(index.columns)}) SELECT id, {values} FROM {index.table}"
+    ]
+
+def drop_statements(index: SearchIndex, dialect_name: str) -> List[str]:
+    if dialect_name == "sqlite":
+        return [f"DROP TRIGGER IF EXISTS {index.fts_table}_{event}" for event in ("insert", "delete", "update")] + [
+            f"DROP TABLE IF EXISTS {index.fts_table}"
+        ]
+    if dialect_name == "postgresql":
+        return [
+            f"DROP INDEX IF EXISTS ix_{index.table}_search_vector",
+            f"ALTER TABLE {index.table} DROP COLUMN IF EXISTS search_vector"
+        ]
+    return []
+
+# Base.metadata.create_all: build the search index along with a new table
+for model, search_index in ((Candidate, CANDIDATE_SEARCH), (Job, JOB_SEARCH)):
+    for dialect_name in ("sqlite", "postgresql"):
+        for statement in create_statements(search_index, dialect_name):
+            event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect=dialect_name))
@@ -0,0 +1,59 @@
+from typing import List
+from sqlalchemy import DDL, column, event, table
+from .candidate import Candidate
+
+# SQLite: one row per candidate skill, (candidate_id, skill, level), kept in
+# sync with candidates.skills by triggers, so every write path (routes, bulk
+# upserts, imports, raw SQL) maintains it. Skill predicates are answered
+# from the (skill, level, candidate_id) index instead of reading every row's
+# JSON. Postgres uses the GIN index on candidates.skills instead.
+CANDIDATE_SKILLS = table(
+    "candidate_skills",
+    column("candidate_id"),
+    column("skill"),
+    column("level")
+)
+
+def _sqlite_insert(row: str) -> str:
+    return (
+        f"INSERT OR REPLACE INTO candidate_skills (candidate_id, skill, level) "
+        f"SELECT {row}.id, key, value FROM json_each({row}.skills);"
+    )
+
+def create_statements(dialect_name: str) -> List[str]:
+    """DDL creating the table and what keeps it in sync"""
+    if dialect_name != "sqlite":
+        return []
+    return [
+        "CREATE TABLE IF NOT EXISTS candidate_skills ("
+        "candidate_id INTEGER NOT NULL, skill TEXT NOT NULL, level REAL, "
+        "PRIMARY KEY (candidate_id, skill)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS ix_candidate_skills_skill_level ON candidate_skills (skill, level, candidate_id)",
+        f"CREATE TRIGGER IF NOT EXISTS candidate_skills_insert AFTER INSERT ON candidates BEGIN "
+        f"{_sqlite_insert('new')} END",
+        "CREATE TRIGGER IF NOT EXISTS candidate_skills_delete AFTER DELETE ON candidates BEGIN "
+        "DELETE FROM candidate_skills WHERE candidate_id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS candidate_skills_update AFTER UPDATE OF skills ON candidates BEGIN "
+        f"DELETE FROM candidate_skills WHERE candidate_id = old.id; {_sqlite_insert('new')} END"
+    ]
+
+def rebuild_statements(dialect_name: str) -> List[str]:
+    """Refill candidate_skills from candidates.skills"""
+    if dialect_name != "sqlite":
+        return []
+    return [
+        "DELETE FROM candidate_skills",
+        "INSERT OR REPLACE INTO candidate_skills (candidate_id, skill, level) "
+        "SELECT candidates.id, skill.key, skill.value FROM candidates, json_each(candidates.skills) AS skill"
+    ]
+
+def drop_statements(dialect_name: str) -> List[str]:
+    if dialect_name != "sqlite":
+        return []
+    return [f"DROP TRIGGER IF EXISTS candidate_skills_{event}" for event in ("insert", "delete", "update")] + [
+        "DROP TABLE IF EXISTS candidate_skills"
+    ]
+
+# Base.metadata.create_all: build the table along with a new candidates table
+for statement in create_statements("sqlite"):
+    event.listen(Candidate.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,6 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSON on every database, stored as JSONB on Postgres so it can be indexed
+# with GIN and queried with the containment/key-existence operators
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
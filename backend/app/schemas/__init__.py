@@ -5,11 +5,13 @@ from .analysis import (
     SalaryBenchmarkRequest, SalaryBenchmarkResponse,
     SkillsAnalysisRequest, SkillsAnalysisResponse
 )
+from .bulk import BulkItemResult, BulkOperationResponse, BulkReassessmentResponse
 
 __all__ = [
     "JobCreate", "JobUpdate", "JobResponse", "JobListResponse",
     "CandidateCreate", "CandidateUpdate", "CandidateResponse", "CandidateListResponse", "CandidateSkillAssessment",
     "WorkforceDistributionRequest", "WorkforceDistributionResponse", "CandidateMatch",
     "SalaryBenchmarkRequest", "SalaryBenchmarkResponse",
-    "SkillsAnalysisRequest", "SkillsAnalysisResponse"
+    "SkillsAnalysisRequest", "SkillsAnalysisResponse",
+    "BulkItemResult", "BulkOperationResponse", "BulkReassessmentResponse"
 ] 
\ No newline at end of file
@@ -9,6 +9,10 @@ class WorkforceDistributionRequest(BaseModel):
     budget_range: Optional[Dict[str, float]] = Field(None, description="min and max salary")
     location: Optional[str] = None
     work_type: Optional[str] = Field(None, description="Full-time, Part-time, Contract, Remote")
+    candidate_filter: Optional[str] = Field(
+        None, max_length=2000,
+        description='Condition on the candidate pool, e.g. preferred_work_type:Remote AND NOT status:Hired'
+    )
 
 class CandidateMatch(BaseModel):
     candidate_id: int
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: str  # created, updated or error
+    id: Optional[int] = None
+    key: Optional[str] = None  # email for candidates, title for jobs
+    detail: Optional[str] = None
+
+class BulkOperationResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
+
+class BulkReassessmentResponse(BaseModel):
+    cancelled: bool = False
+    candidates_processed: int
+    chunks: int
+    elapsed_seconds: float
+    candidates_per_second: float
@@ -54,10 +54,30 @@ class CandidateResponse(CandidateBase):
         from_attributes = True
 
 class CandidateListResponse(BaseModel):
+    candidates: List[CandidateResponse]
+    total: Optional[int] = None
+    # None for cursor-paginated pages, which have no page number
+    page: Optional[int] = None
+    size: int
+    next_cursor: Optional[str] = None
+
+class CandidateFacetResponse(BaseModel):
     candidates: List[CandidateResponse]
     total: int
     page: int
     size: int
+    facets: Dict[str, Dict[str, int]]
+
+class CandidateSearchHit(BaseModel):
+    candidate: CandidateResponse
+    score: float
+    snippet: Optional[str] = None
+
+class CandidateSearchResponse(BaseModel):
+    results: List[CandidateSearchHit]
+    total: Optional[int] = None
+    page: int
+    size: int
 
 class CandidateSkillAssessment(BaseModel):
     candidate_id: int
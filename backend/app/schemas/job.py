@@ -51,6 +51,19 @@ class JobResponse(JobBase):
 
 class JobListResponse(BaseModel):
     jobs: List[JobResponse]
-    total: int
+    total: Optional[int] = None
+    # None for cursor-paginated pages, which have no page number
+    page: Optional[int] = None
+    size: int
+    next_cursor: Optional[str] = None
+
+class JobSearchHit(BaseModel):
+    job: JobResponse
+    score: float
+    snippet: Optional[str] = None
+
+class JobSearchResponse(BaseModel):
+    results: List[JobSearchHit]
+    total: Optional[int] = None
     page: int
     size: int 
\ No newline at end of file
@@ -0,0 +1,400 @@
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import reduce
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..core.bitmap import Bitmap
+from ..core.config import settings
+from ..models.candidate import Candidate
+from .candidate_changes import CandidateChangeFeed
+
+logger = logging.getLogger(__name__)
+
+# Experience field: (label, from years inclusive, to years exclusive)
+EXPERIENCE_BUCKETS = (
+    ("0-3", 0, 3),
+    ("3-6", 3, 6),
+    ("6-10", 6, 10),
+    ("10-20", 10, 20),
+    ("20+", 20, None)
+)
+
+# Candidate fields with a bitmap per value; preferred_departments and skills
+# (skill presence, at any level) are multi-valued
+INDEXED_FIELDS = (
+    "is_available", "status", "education_level", "preferred_work_type",
+    "preferred_departments", "experience", "skills"
+)
+
+# The candidate columns _field_values reads
+_INDEXED_COLUMNS = (
+    Candidate.id, Candidate.is_available, Candidate.status, Candidate.education_level,
+    Candidate.preferred_work_type, Candidate.preferred_departments, Candidate.years_experience,
+    Candidate.skills
+)
+
+# Facets in response order
+CANDIDATE_FACETS = ("status", "education_level", "preferred_departments", "experience", "skills")
+
+class InvalidPredicateError(ValueError):
+    """Raised for a predicate the bitmap index cannot evaluate"""
+
+class Predicate(NamedTuple):
+    """Candidates whose field has this value, e.g. Predicate("skills", "Python")"""
+    field: str
+    value: Any
+
+class And(NamedTuple):
+    operands: Tuple
+
+class Or(NamedTuple):
+    operands: Tuple
+
+class Not(NamedTuple):
+    operand: Any
+
+def experience_bucket(years: Optional[float]) -> Optional[str]:
+    if years is None:
+        return None
+    for label, low, high in EXPERIENCE_BUCKETS:
+        if years >= low and (high is None or years < high):
+            return label
+    return None
+
+def predicate(field: str, value: Any) -> Predicate:
+    """A validated Predicate; is_available takes true/false"""
+    if field not in INDEXED_FIELDS:
+        raise InvalidPredicateError(f"Unknown field '{field}', use one of: {', '.join(INDEXED_FIELDS)}")
+    if field == "is_available" and not isinstance(value, bool):
+        if str(value).lower() not in ("true", "false"):
+            raise InvalidPredicateError(f"is_available takes true or false, not '{value}'")
+        value = str(value).lower() == "true"
+    if field == "experience" and value not in [label for label, _, _ in EXPERIENCE_BUCKETS]:
+        raise InvalidPredicateError(
+            f"Unknown experience bucket '{value}', use one of: {', '.join(label for label, _, _ in EXPERIENCE_BUCKETS)}"
+        )
+    return Predicate(field, value)
+
+# field:value or field:"quoted value", parentheses, and the AND/OR/NOT keywords
+_TOKEN = re.compile(r'\s*(?:([()])|(\w+):(?:"([^"]*)"|([^\s()"]+))|([^\s()]+))')
+
+def parse_predicate(text: str):
+    """
+    Parse an expression such as
+    skills:Python AND (status:Active OR status:"On Hold") AND NOT preferred_work_type:Contract
+    NOT binds tightest, then AND, then OR.
+    """
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise InvalidPredicateError(f"Cannot parse predicate at '{text[position:]}'")
+        paren, field, quoted, bare, word = match.groups()
+        if paren:
+            tokens.append(paren)
+        elif field:
+            tokens.append(predicate(field, quoted if quoted is not None else bare))
+        elif word.upper() in ("AND", "OR", "NOT"):
+            tokens.append(word.upper())
+        else:
+            raise InvalidPredicateError(f"Expected field:value, AND, OR or NOT, not '{word}'")
+        position = match.end()
+
+    expression, position = _parse_or(tokens, 0)
+    if position < len(tokens):
+        raise InvalidPredicateError(f"Unexpected '{tokens[position]}'")
+    return expression
+
+def _parse_or(tokens: List, position: int):
+    operands = []
+    while True:
+        operand, position = _parse_and(tokens, position)
+        operands.append(operand)
+        if position < len(tokens) and tokens[position] == "OR":
+            position += 1
+        else:
+            return (operands[0] if len(operands) == 1 else Or(tuple(operands))), position
+
+def _parse_and(tokens: List, position: int):
+    operands = []
+    while True:
+        operand, position = _parse_not(tokens, position)
+        operands.append(operand)
+        if position < len(tokens) and tokens[position] == "AND":
+            position += 1
+        else:
+            return (operands[0] if len(operands) == 1 else And(tuple(operands))), position
+
+def _parse_not(tokens: List, position: int):
+    if position >= len(tokens):
+        raise InvalidPredicateError("Predicate ends unexpectedly")
+    token = tokens[position]
+    if token == "NOT":
+        operand, position = _parse_not(tokens, position + 1)
+        return Not(operand), position
+    if token == "(":
+        expression, position = _parse_or(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != ")":
+            raise InvalidPredicateError("Missing ')'")
+        return expression, position + 1
+    if isinstance(token, Predicate):
+        return token, position + 1
+    raise InvalidPredicateError(f"Unexpected '{token}'")
+
+def _field_values(candidate) -> Dict[str, List]:
+    """The values a candidate row or object has for each indexed field"""
+    bucket = experience_bucket(candidate.years_experience)
+    return {
+        "is_available": [bool(candidate.is_available)],
+        "status": [candidate.status] if candidate.status else [],
+        "education_level": [candidate.education_level] if candidate.education_level else [],
+        "preferred_work_type": [candidate.preferred_work_type] if candidate.preferred_work_type else [],
+        "preferred_departments": list(candidate.preferred_departments or []),
+        "experience": [bucket] if bucket else [],
+        "skills": list(candidate.skills or {})
+    }
+
+class _IndexState:
+    def __init__(self, bitmaps: Dict[str, Dict[Any, Bitmap]], everyone: Bitmap, built_at: float):
+        self.bitmaps = bitmaps
+        self.everyone = everyone
+        self.built_at = built_at
+
+    def evaluate(self, expression) -> Bitmap:
+        if isinstance(expression, Predicate):
+            return self.bitmaps[expression.field].get(expression.value, Bitmap())
+        if isinstance(expression, Not):
+            return self.everyone - self.evaluate(expression.operand)
+        if isinstance(expression, Or):
+            return reduce(lambda result, operand: result | self.evaluate(operand), expression.operands, Bitmap())
+        if isinstance(expression, And):
+            # x AND NOT y is x - y, without materializing NOT y
+            included = [operand for operand in expression.operands if not isinstance(operand, Not)]
+            excluded = [operand.operand for operand in expression.operands if isinstance(operand, Not)]
+            result = reduce(lambda result, operand: result & self.evaluate(operand), included[1:],
+                            self.evaluate(included[0]) if included else self.everyone)
+            return reduce(lambda result, operand: result - self.evaluate(operand), excluded, result)
+        raise InvalidPredicateError(f"Not a predicate: {expression!r}")
+
+    def with_candidates(self, values_by_id: Dict[int, Dict[str, List]]) -> "_IndexState":
+        """A new state with these candidates' values replaced; untouched bitmaps are shared"""
+        changed = Bitmap.from_ids(values_by_id)
+        bitmaps = {}
+        for field, field_bitmaps in self.bitmaps.items():
+            ids_by_value = defaultdict(list)
+            for candidate_id, values in values_by_id.items():
+                for value in values[field]:
+                    ids_by_value[value].append(candidate_id)
+
+            field_bitmaps = dict(field_bitmaps)
+            for value, bitmap in list(field_bitmaps.items()):
+                if value not in ids_by_value and bitmap.intersection_len(changed):
+                    field_bitmaps[value] = bitmap - changed
+                    if not field_bitmaps[value]:
+                        del field_bitmaps[value]
+            for value, ids in ids_by_value.items():
+                field_bitmaps[value] = (field_bitmaps.get(value, Bitmap()) - changed) | Bitmap.from_ids(ids)
+            bitmaps[field] = field_bitmaps
+        return _IndexState(bitmaps, self.everyone | changed, self.built_at)
+
+    @property
+    def nbytes(self) -> int:
+        return self.everyone.nbytes + sum(
+            bitmap.nbytes for field_bitmaps in self.bitmaps.values() for bitmap in field_bitmaps.values()
+        )
+
+class CandidateBitmapIndex:
+    """
+    In-process compressed bitmap index over candidate ids for the
+    low-cardinality fields in INDEXED_FIELDS.
+
+    Any AND/OR/NOT combination of field:value predicates is answered with
+    bitmap operations instead of a table scan, both for the facet counts of
+    the candidate list and for narrowing the pool the matching engine
+    scores. The index is built in the background at startup, kept current
+    by the single-candidate write routes, and brought up to date on use,
+    at most once per CANDIDATE_CHANGES_INTERVAL_SECONDS, with the rows other
+    processes changed since. Rebuilt after bulk writes and imports, when the
+    candidate count no longer matches, and once BITMAP_INDEX_TTL_SECONDS
+    old, which picks up changes elsewhere that moved neither the count nor
+    the latest timestamp.
+    """
+    def __init__(self, ttl_seconds: Optional[int] = None, changes_interval_seconds: Optional[float] = None):
+        self.ttl_seconds = settings.bitmap_index_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._state: Optional[_IndexState] = None
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        # Held by whoever reads the change feed: one catch-up at a time, and
+        # none between a build's load and the state it installs
+        self._changes_lock = threading.Lock()
+        # Updates made while a build reads the table, replayed onto its result
+        self._pending: Optional[List[Tuple[int, Dict[str, List]]]] = None
+        self._invalidated_during_build = False
+        self._changes = CandidateChangeFeed(*_INDEXED_COLUMNS, interval_seconds=(
+            settings.candidate_changes_interval_seconds if changes_interval_seconds is None else changes_interval_seconds
+        ))
+
+    def invalidate(self) -> None:
+        """Rebuild on next use"""
+        with self._state_lock:
+            self._state = None
+            if self._pending is not None:
+                self._invalidated_during_build = True
+
+    def warm(self, session_factory) -> None:
+        """Build in a background thread, so the first request does not wait"""
+        def build():
+            db = session_factory()
+            try:
+                self._current(db)
+            except Exception as e:
+                logger.warning("Could not build the candidate bitmap index: %s", e)
+            finally:
+                db.close()
+        threading.Thread(target=build, name="candidate-bitmap-index", daemon=True).start()
+
+    def match(self, db: Session, expression) -> Bitmap:
+        """The candidates satisfying a predicate expression"""
+        return self._current(db).evaluate(expression)
+
+    def everyone(self, db: Session) -> Bitmap:
+        return self._current(db).everyone
+
+    def facets(
+        self,
+        db: Session,
+        filters: Dict[str, Iterable[Any]],
+        where=None,
+        facet_size: int = 10
+    ) -> Tuple[Bitmap, Dict[str, Dict[str, int]]]:
+        """
+        The candidates matching where and the filters, and the counts of each
+        facet's values among them.
+
+        Values of one filtered field are ORed, fields are ANDed. Each facet is
+        counted without its own filter, so its other values stay visible with
+        the number of matches they would give. Facets list at most facet_size
+        values, most frequent first; experience lists every bucket in order.
+        """
+        selections = {
+            field: Or(tuple(predicate(field, value) for value in values))
+            for field, values in filters.items() if values
+        }
+        state = self._current(db)
+
+        base = state.evaluate(where) if where is not None else state.everyone
+        selected = {field: state.evaluate(selection) for field, selection in selections.items()}
+        matches = reduce(lambda result, bitmap: result & bitmap, selected.values(), base)
+
+        counts = {}
+        for facet in CANDIDATE_FACETS:
+            within = base
+            for field, bitmap in selected.items():
+                if field != facet:
+                    within = within & bitmap
+            facet_counts = {value: within.intersection_len(bitmap) for value, bitmap in state.bitmaps[facet].items()}
+            if facet == "experience":
+                counts[facet] = {label: facet_counts.get(label, 0) for label, _, _ in EXPERIENCE_BUCKETS}
+            else:
+                ranked = sorted(((count, value) for value, count in facet_counts.items() if count), key=lambda item: (-item[0], item[1]))
+                counts[facet] = {value: count for count, value in ranked[:facet_size]}
+
+        return matches, counts
+
+    def update(self, candidate: Candidate) -> None:
+        """Re-index one candidate after it was created, updated or deleted"""
+        values = _field_values(candidate)
+        self._changes.wrote()
+        with self._state_lock:
+            if self._pending is not None:
+                self._pending.append((candidate.id, values))
+            if self._state is not None:
+                self._state = self._state.with_candidates({candidate.id: values})
+
+    def _expired(self, state: Optional[_IndexState]) -> bool:
+        return state is None or time.monotonic() - state.built_at > self.ttl_seconds
+
+    def _current(self, db: Session) -> _IndexState:
+        state = self._state
+        if not self._expired(state):
+            if not self._changes.due():
+                return state
+            state = self._catch_up(db)
+            if state is not None:
+                return state
+        with self._build_lock:
+            state = self._state
+            if self._expired(state):
+                state = self._build(db)
+        return state
+
+    def _catch_up(self, db: Session) -> Optional[_IndexState]:
+        """
+        The state with the changes read since applied, or None when it must
+        be rebuilt. Runs outside the build lock; while another thread reads
+        the changes or builds, the state is served as it is.
+        """
+        if not self._changes_lock.acquire(blocking=False):
+            return self._state
+        try:
+            if not self._changes.due():
+                return self._state
+            count, changed = self._changes.read(db)
+            with self._state_lock:
+                if changed and self._state is not None:
+                    self._state = self._state.with_candidates({row.id: _field_values(row) for row in changed})
+                state = self._state
+                # Rows deleted elsewhere, or inserted with an earlier timestamp
+                if state is not None and self._changes.disagrees(count, len(state.everyone)):
+                    state.built_at = float("-inf")
+                    return None
+            return state
+        finally:
+            self._changes_lock.release()
+
+    def _build(self, db: Session) -> _IndexState:
+        with self._state_lock:
+            self._pending = []
+            self._invalidated_during_build = False
+        started = time.monotonic()
+        try:
+            with self._changes_lock:
+                # Only the indexed columns, as plain rows
+                rows = self._changes.load(db)
+
+                ids_by_value = {field: defaultdict(list) for field in INDEXED_FIELDS}
+                for row in rows:
+                    for field, values in _field_values(row).items():
+                        for value in values:
+                            ids_by_value[field][value].append(row.id)
+
+                state = _IndexState(
+                    {field: {value: Bitmap.from_ids(ids) for value, ids in by_value.items()} for field, by_value in ids_by_value.items()},
+                    Bitmap.from_ids(row.id for row in rows),
+                    started
+                )
+                with self._state_lock:
+                    if self._pending:
+                        state = state.with_candidates(dict(self._pending))
+                    # A bulk write during the build may be missing: expire at once
+                    if self._invalidated_during_build:
+                        state.built_at = float("-inf")
+                    self._state = state
+        finally:
+            with self._state_lock:
+                self._pending = None
+
+        logger.info(
+            "Built candidate bitmap index: %d candidates, %.1f KiB (%.1f bytes per candidate) in %.2f s",
+            len(state.everyone), state.nbytes / 1024, state.nbytes / max(len(state.everyone), 1),
+            time.monotonic() - started
+        )
+        return state
+
+# Shared by the candidate routes, bulk operations, imports and analysis
+candidate_bitmaps = CandidateBitmapIndex()
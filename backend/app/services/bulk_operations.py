@@ -0,0 +1,280 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import upsert
+from ..core.pagination import invalidate_count_cache
+from ..models.candidate import Candidate
+from ..models.job import Job
+from ..schemas.candidate import CandidateCreate
+from ..schemas.job import JobCreate
+from ..services.bitmap_index import candidate_bitmaps
+from ..services.candidate_snapshot import candidate_snapshot
+from ..services.skills_assessment import SkillsAssessmentService
+
+logger = logging.getLogger(__name__)
+
+class BulkPayloadError(ValueError):
+    """Raised when a bulk request body is neither a JSON array nor NDJSON"""
+
+class BulkOperationsService:
+    def __init__(self):
+        self.skills_service = SkillsAssessmentService()
+
+    def parse_payload(self, body: bytes, content_type: Optional[str]) -> List[Any]:
+        """
+        Parse a bulk request body. JSON bodies must be an array; NDJSON bodies
+        hold one object per line. A malformed NDJSON line becomes a ValueError
+        entry so it is reported per item instead of failing the whole request.
+        """
+        if content_type and "ndjson" in content_type:
+            items = []
+            for line in body.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError as e:
+                    items.append(ValueError(f"Invalid JSON: {e}"))
+            return items
+
+        try:
+            items = json.loads(body or b"[]")
+        except ValueError as e:
+            raise BulkPayloadError(f"Invalid JSON body: {e}")
+        if not isinstance(items, list):
+            raise BulkPayloadError("Expected a JSON array of items")
+        return items
+
+    def upsert_candidates(self, db: Session, items: List[Any]) -> Dict:
+        """
+        Validate, score and upsert candidates keyed on email, one transaction per chunk.
+
+        An existing candidate only takes the fields its item sets (plus the
+        recomputed scores); defaults and status = 'Active' apply to new
+        candidates alone, so a re-sync neither clears omitted fields nor
+        reactivates a hired or deleted candidate.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        valid = []
+        seen_emails = set()
+
+        for index, item in enumerate(items):
+            candidate = self._validate(item, CandidateCreate, index, results)
+            if candidate is None:
+                continue
+            if candidate.email in seen_emails:
+                results[index] = self._error(index, "Duplicate email in request", candidate.email)
+                continue
+            seen_emails.add(candidate.email)
+            given = tuple(sorted(candidate.model_dump(exclude_unset=True)))
+            valid.append((index, candidate.model_dump(), given))
+
+        # Score every valid candidate in one vectorized pass
+        skill_scores, overall_scores = self.skills_service.assess_candidates_bulk(
+            [data["skills"] for _, data, _ in valid],
+            [data["years_experience"] for _, data, _ in valid],
+            [data["education_level"] for _, data, _ in valid]
+        )
+        for (_, data, _), scores, overall in zip(valid, skill_scores, overall_scores):
+            data["skill_scores"] = scores
+            data["overall_score"] = overall
+
+        for chunk in self._chunks(valid):
+            # One statement per set of given fields, since an upsert updates
+            # the same columns for every row; a row inserted rather than
+            # updated comes back without updated_at
+            by_given: Dict[tuple, List[Dict]] = {}
+            for _, data, given in chunk:
+                by_given.setdefault(given, []).append(dict(data, status="Active"))
+            try:
+                written = {}
+                for given, rows in by_given.items():
+                    returned = upsert(
+                        db, Candidate, rows, "email",
+                        returning=(Candidate.id, Candidate.email, Candidate.updated_at),
+                        update_columns=(*given, "skill_scores", "overall_score")
+                    )
+                    written.update((email, (candidate_id, updated_at)) for candidate_id, email, updated_at in returned)
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                for index, data, _ in chunk:
+                    results[index] = self._error(index, f"Chunk failed: {e.__class__.__name__}", data["email"])
+                continue
+
+            for index, data, _ in chunk:
+                email = data["email"]
+                candidate_id, updated_at = written.get(email, (None, None))
+                results[index] = {
+                    "index": index,
+                    "status": "created" if updated_at is None else "updated",
+                    "id": candidate_id,
+                    "key": email
+                }
+
+        invalidate_count_cache(Candidate.__tablename__)
+        candidate_bitmaps.invalidate()
+        candidate_snapshot.invalidate()
+        return self._summarize(results)
+
+    def insert_jobs(self, db: Session, items: List[Any]) -> Dict:
+        """
+        Validate and insert jobs in multi-row statements, one transaction per chunk.
+
+        Jobs have no natural unique key, so unlike candidates these are plain inserts.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        valid = []
+
+        for index, item in enumerate(items):
+            job = self._validate(item, JobCreate, index, results)
+            if job is None:
+                continue
+            if job.min_salary >= job.max_salary:
+                results[index] = self._error(index, "Minimum salary must be less than maximum salary", job.title)
+                continue
+            valid.append((index, job.model_dump()))
+
+        for chunk in self._chunks(valid):
+            rows = [dict(data, is_active=True) for _, data in chunk]
+            try:
+                ids = db.execute(insert(Job).returning(Job.id, sort_by_parameter_order=True), rows).scalars().all()
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                for index, data in chunk:
+                    results[index] = self._error(index, f"Chunk failed: {e.__class__.__name__}", data["title"])
+                continue
+
+            for (index, data), job_id in zip(chunk, ids):
+                results[index] = {"index": index, "status": "created", "id": job_id, "key": data["title"]}
+
+        invalidate_count_cache(Job.__tablename__)
+        return self._summarize(results)
+
+    def reassess_candidates(
+        self,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict:
+        """
+        Recompute skill_scores and overall_score for every candidate.
+
+        Candidates are streamed in id order with only the columns the scoring
+        needs, scored in one vectorized pass per chunk and written back with a
+        batched UPDATE by primary key, one transaction per chunk. Setting
+        cancel_event stops before the next chunk; committed chunks are kept.
+        """
+        chunk_size = chunk_size or settings.bulk_chunk_size
+        total = db.query(Candidate).count()
+        processed = 0
+        chunks = 0
+        last_id = 0
+        cancelled = False
+        started = time.perf_counter()
+        if progress_callback:
+            progress_callback(self._progress(processed, total, started))
+
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            rows = db.query(
+                Candidate.id, Candidate.skills, Candidate.years_experience, Candidate.education_level
+            ).filter(Candidate.id > last_id).order_by(Candidate.id).limit(chunk_size).all()
+            if not rows:
+                break
+
+            skill_scores, overall_scores = self.skills_service.assess_candidates_bulk(
+                [row.skills or {} for row in rows],
+                [row.years_experience for row in rows],
+                [row.education_level for row in rows]
+            )
+            db.execute(update(Candidate), [
+                {"id": row.id, "skill_scores": scores, "overall_score": overall}
+                for row, scores, overall in zip(rows, skill_scores, overall_scores)
+            ])
+            db.commit()
+            invalidate_count_cache(Candidate.__tablename__)
+            # Scores feed the analysis snapshot and the bitmap index too
+            candidate_snapshot.invalidate()
+            candidate_bitmaps.invalidate()
+
+            last_id = rows[-1].id
+            processed += len(rows)
+            chunks += 1
+            progress = self._progress(processed, total, started)
+            logger.info("Reassessed %(processed)d/%(total)d candidates (%(rate).0f/s)", progress)
+            if progress_callback:
+                progress_callback(progress)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "cancelled": cancelled,
+            "candidates_processed": processed,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "candidates_per_second": round(processed / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+    def _progress(self, processed: int, total: int, started: float) -> Dict:
+        """
+        Progress snapshot for logging and callbacks
+        """
+        elapsed = time.perf_counter() - started
+        return {
+            "processed": processed,
+            "total": total,
+            "percent": round(processed / total * 100, 1) if total else 100.0,
+            "rate": processed / elapsed if elapsed > 0 else 0.0
+        }
+
+    def _validate(self, item: Any, schema, index: int, results: List[Optional[Dict]]):
+        """
+        Validate one raw item against a schema, recording an error result on failure
+        """
+        if isinstance(item, Exception):
+            results[index] = self._error(index, str(item))
+            return None
+        if not isinstance(item, dict):
+            results[index] = self._error(index, "Item must be a JSON object")
+            return None
+        try:
+            return schema(**item)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            results[index] = self._error(index, errors)
+            return None
+
+    def _chunks(self, rows: List[Any]):
+        """
+        Yield successive chunks of at most settings.bulk_chunk_size rows
+        """
+        size = max(settings.bulk_chunk_size, 1)
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    def _error(self, index: int, detail: str, key: Optional[str] = None) -> Dict:
+        return {"index": index, "status": "error", "key": key, "detail": detail}
+
+    def _summarize(self, results: List[Dict]) -> Dict:
+        """
+        Build the bulk response body from per-item results
+        """
+        return {
+            "created": sum(1 for r in results if r["status"] == "created"),
+            "updated": sum(1 for r in results if r["status"] == "updated"),
+            "failed": sum(1 for r in results if r["status"] == "error"),
+            "results": results
+        }
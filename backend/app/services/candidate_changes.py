@@ -0,0 +1,108 @@
+import time
+from datetime import timedelta
+from typing import List, Tuple
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.candidate import Candidate
+
+# When a candidate last changed; new rows have no updated_at yet. Indexed
+# as ix_candidates_changed_at, so reading recent changes is a range scan
+CHANGED_AT = func.coalesce(Candidate.updated_at, Candidate.created_at)
+
+def _changed_at_or_after(mark):
+    # SQLite compares the stored text, and binds the mark with microseconds,
+    # so a plain >= would miss '... 12:00:00' against '... 12:00:00.000000'
+    return CHANGED_AT > mark - timedelta(microseconds=1)
+
+class CandidateChangeFeed:
+    """
+    The candidates changed since the previous read, for the in-process
+    copies of the candidates table that are kept current without reloading.
+
+    Each read is one query for count(*), max(coalesce(updated_at, created_at))
+    and the number of rows stamped at or after the latest timestamp already
+    read; the rows themselves are fetched only when those move. The mark is
+    the latest timestamp read, never the database clock, so a replica lagging
+    behind the primary is read on from where its own data ends.
+
+    SQLite stamps whole seconds, so another process can write in the second
+    already read. The rows read at the mark are remembered, and rows stamped
+    at the mark are read again, less those. A row changed twice within one
+    second is still only seen once. Owners rebuild when the count disagrees
+    with their own, and apply writes made in this process themselves.
+
+    Owners read at most once per interval_seconds (due()), and call wrote()
+    for each write they apply themselves: for READ_YOUR_WRITES_SECONDS after
+    one, a replica may not have it yet, so a count below the owner's own is
+    lag rather than rows deleted elsewhere (disagrees()).
+    """
+    def __init__(self, *columns, interval_seconds: float = 0):
+        # Must include Candidate.id
+        self.columns = columns + (CHANGED_AT.label("changed_at"),)
+        self.interval_seconds = interval_seconds
+        self._high_water = None
+        # Ids of the rows read that are stamped at the mark
+        self._at_high_water = set()
+        self._read_at = float("-inf")
+        self._written_at = float("-inf")
+
+    def due(self) -> bool:
+        """Whether interval_seconds have passed since the previous read or load"""
+        return time.monotonic() - self._read_at >= self.interval_seconds
+
+    def wrote(self) -> None:
+        """Note a write the owner applied itself, which the database read may not show yet"""
+        self._written_at = time.monotonic()
+
+    def disagrees(self, count: int, own: int) -> bool:
+        """Whether a count read means the owner missed rows, rather than the database lagging behind it"""
+        if count < own and time.monotonic() - self._written_at < settings.read_your_writes_seconds:
+            return False
+        return count != own
+
+    def load(self, db: Session) -> List:
+        """Every row, ordered by id; later reads return the changes since"""
+        self._read_at = time.monotonic()
+        rows = db.execute(select(*self.columns).order_by(Candidate.id)).all()
+        self._high_water = None
+        self._at_high_water = set()
+        self._advance(rows)
+        return rows
+
+    def read(self, db: Session) -> Tuple[int, List]:
+        """The number of candidates, and the rows changed since the previous read or load"""
+        self._read_at = time.monotonic()
+        # Separate subqueries, so each is answered from an index
+        at_or_after = (
+            select(func.count()).select_from(Candidate).where(_changed_at_or_after(self._high_water)).scalar_subquery()
+            if self._high_water is not None else literal(0)
+        )
+        count, latest, since = db.execute(select(
+            select(func.count()).select_from(Candidate).scalar_subquery(),
+            select(func.max(CHANGED_AT)).scalar_subquery(),
+            at_or_after
+        )).one()
+        if latest is None:
+            return count, []
+        if self._high_water is not None and latest <= self._high_water and since <= len(self._at_high_water):
+            return count, []
+        query = select(*self.columns)
+        if self._high_water is not None:
+            query = query.where(_changed_at_or_after(self._high_water))
+        rows = [
+            row for row in db.execute(query).all()
+            if not (row.changed_at == self._high_water and row.id in self._at_high_water)
+        ]
+        self._advance(rows)
+        return count, rows
+
+    def _advance(self, rows: List) -> None:
+        """Move the mark to the latest of rows, remembering the rows read at it"""
+        latest = max((row.changed_at for row in rows if row.changed_at is not None), default=None)
+        if latest is None or (self._high_water is not None and latest < self._high_water):
+            return
+        if latest != self._high_water:
+            self._high_water = latest
+            self._at_high_water = set()
+        self._at_high_water.update(row.id for row in rows if row.changed_at == latest)
@@ -0,0 +1,324 @@
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.candidate import Candidate
+from .candidate_changes import CandidateChangeFeed
+
+logger = logging.getLogger(__name__)
+
+# The candidate columns the analysis services read
+SNAPSHOT_COLUMNS = (
+    Candidate.id, Candidate.first_name, Candidate.last_name, Candidate.years_experience,
+    Candidate.education_level, Candidate.expected_salary, Candidate.preferred_locations,
+    Candidate.skills, Candidate.is_available, Candidate.overall_score, Candidate.current_position
+)
+
+class CandidateRecord(NamedTuple):
+    """
+    One candidate as the analysis services read it: the Candidate attributes
+    they use, without the ORM instance behind them
+    """
+    id: int
+    first_name: str
+    last_name: str
+    years_experience: float
+    education_level: str
+    expected_salary: Optional[float]
+    preferred_locations: List[str]
+    skills: Dict[str, float]
+    is_available: bool
+    overall_score: Optional[float]
+    current_position: Optional[str]
+
+class _Vocabulary:
+    """Append-only string table, shared by a snapshot and those merged from it"""
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self._codes) + sum(sys.getsizeof(value) for value in self.values)
+
+class _Lists(NamedTuple):
+    """
+    A list per candidate in CSR form: candidate i owns entries
+    offsets[i]:offsets[i + 1] of every array in values
+    """
+    offsets: np.ndarray
+    values: Tuple[np.ndarray, ...]
+
+    @classmethod
+    def from_lengths(cls, lengths: List[int], values: Tuple[np.ndarray, ...]) -> "_Lists":
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(offsets, values)
+
+    def take(self, rows: np.ndarray) -> "_Lists":
+        lengths = self.offsets[rows + 1] - self.offsets[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        entries = np.repeat(self.offsets[rows] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return _Lists(offsets, tuple(values[entries] for values in self.values))
+
+    def concat(self, other: "_Lists") -> "_Lists":
+        return _Lists(
+            np.concatenate((self.offsets, other.offsets[1:] + self.offsets[-1])),
+            tuple(np.concatenate(pair) for pair in zip(self.values, other.values))
+        )
+
+    def row(self, position: int) -> Tuple[np.ndarray, ...]:
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return tuple(values[start:end] for values in self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + sum(values.nbytes for values in self.values)
+
+class CandidateSnapshot:
+    """
+    Immutable columnar copy of the candidate fields in SNAPSHOT_COLUMNS,
+    one NumPy array per column in id order. Strings are int32 codes into a
+    shared vocabulary; preferred locations and skills (codes plus levels)
+    are CSR lists.
+    """
+    def __init__(self, vocabulary: _Vocabulary, columns: Dict[str, np.ndarray], lists: Dict[str, _Lists]):
+        self.vocabulary = vocabulary
+        self.columns = columns
+        self.lists = lists
+
+    @classmethod
+    def from_rows(cls, rows: List, vocabulary: _Vocabulary) -> "CandidateSnapshot":
+        """Encode rows of SNAPSHOT_COLUMNS, in the order given"""
+        encode = vocabulary.encode
+        ids, first_names, last_names, years, education_levels, salaries, available = [], [], [], [], [], [], []
+        scores, positions = [], []
+        location_lengths, location_codes = [], []
+        skill_lengths, skill_codes, skill_levels = [], [], []
+        for row in rows:
+            ids.append(row.id)
+            first_names.append(encode(row.first_name))
+            last_names.append(encode(row.last_name))
+            years.append(row.years_experience)
+            education_levels.append(encode(row.education_level))
+            salaries.append(row.expected_salary)
+            available.append(bool(row.is_available))
+            scores.append(row.overall_score)
+            positions.append(encode(row.current_position))
+            locations = row.preferred_locations or []
+            location_lengths.append(len(locations))
+            location_codes.extend(map(encode, locations))
+            skills = row.skills or {}
+            skill_lengths.append(len(skills))
+            skill_codes.extend(map(encode, skills))
+            skill_levels.extend(skills.values())
+
+        columns = {
+            "id": np.array(ids, dtype=np.int64),
+            "first_name": np.array(first_names, dtype=np.int32),
+            "last_name": np.array(last_names, dtype=np.int32),
+            "years_experience": np.array(years, dtype=np.float64),
+            "education_level": np.array(education_levels, dtype=np.int32),
+            # None becomes NaN
+            "expected_salary": np.array(salaries, dtype=np.float64),
+            "is_available": np.array(available, dtype=bool),
+            "overall_score": np.array(scores, dtype=np.float64),
+            "current_position": np.array(positions, dtype=np.int32)
+        }
+        lists = {
+            "preferred_locations": _Lists.from_lengths(location_lengths, (np.array(location_codes, dtype=np.int32),)),
+            "skills": _Lists.from_lengths(
+                skill_lengths, (np.array(skill_codes, dtype=np.int32), np.array(skill_levels, dtype=np.float64))
+            )
+        }
+        return cls(vocabulary, columns, lists)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def take(self, rows: np.ndarray) -> "CandidateSnapshot":
+        """The candidates at these positions, in this order"""
+        return CandidateSnapshot(
+            self.vocabulary,
+            {name: values[rows] for name, values in self.columns.items()},
+            {name: lists.take(rows) for name, lists in self.lists.items()}
+        )
+
+    def merged(self, changed: "CandidateSnapshot") -> "CandidateSnapshot":
+        """A new snapshot with changed's candidates added or replacing the old rows"""
+        kept = self.take(np.flatnonzero(~np.isin(self.columns["id"], changed.columns["id"])))
+        combined = CandidateSnapshot(
+            self.vocabulary,
+            {name: np.concatenate((values, changed.columns[name])) for name, values in kept.columns.items()},
+            {name: lists.concat(changed.lists[name]) for name, lists in kept.lists.items()}
+        )
+        return combined.take(np.argsort(combined.columns["id"], kind="stable"))
+
+    def records(self, candidate_ids: Iterable[int]) -> List[CandidateRecord]:
+        """The candidates with these ids, ordered by id; unknown ids are skipped"""
+        ids = self.columns["id"]
+        if not len(ids):
+            return []
+        wanted = np.unique(np.fromiter(candidate_ids, dtype=np.int64))
+        positions = np.minimum(np.searchsorted(ids, wanted), len(ids) - 1)
+        return [self.record(position) for position in positions[ids[positions] == wanted].tolist()]
+
+    def top_scored(self, limit: int) -> List[CandidateRecord]:
+        """The candidates with the highest overall_score, ties in id order; unscored ones are skipped"""
+        scores = self.columns["overall_score"]
+        scored = np.flatnonzero(~np.isnan(scores))
+        ranked = scored[np.argsort(-scores[scored], kind="stable")[:limit]]
+        return [self.record(position) for position in ranked.tolist()]
+
+    def record(self, position: int) -> CandidateRecord:
+        values = self.vocabulary.values
+        columns = self.columns
+        salary = columns["expected_salary"][position]
+        score = columns["overall_score"][position]
+        location_codes, = self.lists["preferred_locations"].row(position)
+        skill_codes, skill_levels = self.lists["skills"].row(position)
+        return CandidateRecord(
+            id=int(columns["id"][position]),
+            first_name=values[columns["first_name"][position]],
+            last_name=values[columns["last_name"][position]],
+            years_experience=float(columns["years_experience"][position]),
+            education_level=values[columns["education_level"][position]],
+            expected_salary=None if np.isnan(salary) else float(salary),
+            preferred_locations=[values[code] for code in location_codes.tolist()],
+            skills=dict(zip([values[code] for code in skill_codes.tolist()], skill_levels.tolist())),
+            is_available=bool(columns["is_available"][position]),
+            overall_score=None if np.isnan(score) else float(score),
+            current_position=values[columns["current_position"][position]]
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            sum(values.nbytes for values in self.columns.values()) +
+            sum(lists.nbytes for lists in self.lists.values()) +
+            self.vocabulary.nbytes
+        )
+
+class CandidateSnapshotStore:
+    """
+    Candidate snapshot shared by the analysis services, so a request reads
+    candidates from compact arrays instead of loading Candidate objects.
+
+    Loaded in full with one column-pruned select, kept current by the
+    single-candidate write routes, and brought up to date on use, at most
+    once per CANDIDATE_CHANGES_INTERVAL_SECONDS, with the rows a
+    CandidateChangeFeed reports other processes changed since. Reloaded in
+    full after bulk writes and imports, when the candidate count no longer
+    matches, and once CANDIDATE_SNAPSHOT_TTL_SECONDS old, which picks up
+    changes elsewhere that moved neither the count nor the latest timestamp.
+    """
+    def __init__(self, ttl_seconds: Optional[int] = None, changes_interval_seconds: Optional[float] = None):
+        self.ttl_seconds = settings.candidate_snapshot_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._snapshot: Optional[CandidateSnapshot] = None
+        self._loaded_at = float("-inf")
+        self._reload = True
+        self._changes = CandidateChangeFeed(*SNAPSHOT_COLUMNS, interval_seconds=(
+            settings.candidate_changes_interval_seconds if changes_interval_seconds is None else changes_interval_seconds
+        ))
+        # Held for the database reads (loads and the change feed); update()
+        # does not wait on it
+        self._lock = threading.Lock()
+        # Held for merging into the snapshot, whose vocabulary is shared
+        self._merge_lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Reload in full on next use"""
+        self._reload = True
+
+    def update(self, candidate: Candidate) -> None:
+        """Apply one candidate after it was created or updated in this process"""
+        self._changes.wrote()
+        self._merge([candidate])
+
+    def warm(self, session_factory) -> None:
+        """Load in a background thread, so the first request does not wait"""
+        def load():
+            db = session_factory()
+            try:
+                self.current(db)
+            except Exception as e:
+                logger.warning("Could not load the candidate snapshot: %s", e)
+            finally:
+                db.close()
+        threading.Thread(target=load, name="candidate-snapshot", daemon=True).start()
+
+    def current(self, db: Session) -> CandidateSnapshot:
+        """The snapshot, with the changes visible to db applied"""
+        if not self._stale():
+            if not self._changes.due():
+                return self._snapshot
+            snapshot = self._catch_up(db)
+            if snapshot is not None:
+                return snapshot
+        with self._lock:
+            if self._stale():
+                self._load(db)
+            return self._snapshot
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        snapshot = self.current(db)
+        return {
+            "candidates": len(snapshot),
+            "bytes": snapshot.nbytes,
+            "bytes_per_candidate": round(snapshot.nbytes / max(len(snapshot), 1), 1),
+            "vocabulary_size": len(snapshot.vocabulary.values),
+            "skill_entries": len(snapshot.lists["skills"].values[0]),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1)
+        }
+
+    def _load(self, db: Session) -> None:
+        started = time.monotonic()
+        # An invalidation from here on must reload again
+        self._reload = False
+        self._snapshot = CandidateSnapshot.from_rows(self._changes.load(db), _Vocabulary())
+        self._loaded_at = started
+
+        snapshot = self._snapshot
+        logger.info(
+            "Loaded candidate snapshot: %d candidates, %.1f KiB (%.1f bytes per candidate) in %.2f s",
+            len(snapshot), snapshot.nbytes / 1024, snapshot.nbytes / max(len(snapshot), 1),
+            time.monotonic() - started
+        )
+
+    def _stale(self) -> bool:
+        return self._snapshot is None or self._reload or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def _catch_up(self, db: Session) -> Optional[CandidateSnapshot]:
+        """The snapshot with the changes read since applied, or None when it must be reloaded"""
+        with self._lock:
+            # Read by another thread meanwhile, or reloaded
+            if not self._changes.due() or self._stale():
+                return None if self._stale() else self._snapshot
+            count, changed = self._changes.read(db)
+            if changed:
+                self._merge(changed)
+            # Rows deleted elsewhere, or inserted with an earlier timestamp
+            if self._changes.disagrees(count, len(self._snapshot)):
+                self._reload = True
+                return None
+            return self._snapshot
+
+    def _merge(self, rows: List) -> None:
+        with self._merge_lock:
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.merged(CandidateSnapshot.from_rows(rows, self._snapshot.vocabulary))
+
+# Shared by the analysis services; reloaded by bulk operations and imports
+candidate_snapshot = CandidateSnapshotStore()
@@ -0,0 +1,102 @@
+import json
+from typing import List, Optional
+import pandas as pd
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, select
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..services.file_formats import UnsupportedFormatError
+
+class DataExportService:
+    """
+    Writes whole tables to CSV, Parquet or Arrow IPC files, streaming rows
+    from the database in chunks so memory does not grow with table size
+    """
+    def export_table(
+        self,
+        db: Session,
+        model,
+        fmt: str,
+        path: str,
+        columns: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Export model's table to path in id order and return the number of rows
+        written. Only the given columns are read; JSON columns are written as
+        JSON text.
+        """
+        chunk_size = chunk_size or settings.import_chunk_size
+        table = model.__table__
+        selected = [table.c[name] for name in (columns or table.c.keys())]
+        json_columns = [column.name for column in selected if isinstance(column.type, JSON)]
+
+        stmt = select(*selected).order_by(table.c.id).execution_options(yield_per=chunk_size)
+        writer = self._writer(fmt, path, selected)
+        rows_written = 0
+        try:
+            for partition in db.execute(stmt).partitions():
+                frame = pd.DataFrame(partition, columns=[column.name for column in selected])
+                for name in json_columns:
+                    frame[name] = [None if value is None else json.dumps(value) for value in frame[name]]
+                writer.write(frame)
+                rows_written += len(frame)
+        finally:
+            writer.close()
+        return rows_written
+
+    def _writer(self, fmt: str, path: str, columns):
+        if fmt == "csv":
+            return _CsvWriter(path, [column.name for column in columns])
+        if fmt in ("parquet", "arrow"):
+            return _ArrowWriter(fmt, path, columns)
+        raise UnsupportedFormatError(f"Unsupported export format '{fmt}'")
+
+class _CsvWriter:
+    def __init__(self, path: str, names: List[str]):
+        self.path = path
+        # Header only, so an empty table still exports a valid file
+        pd.DataFrame(columns=names).to_csv(path, index=False)
+
+    def write(self, frame: pd.DataFrame) -> None:
+        frame.to_csv(self.path, mode="a", header=False, index=False)
+
+    def close(self) -> None:
+        pass
+
+class _ArrowWriter:
+    def __init__(self, fmt: str, path: str, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise UnsupportedFormatError("Parquet and Arrow exports require pyarrow to be installed")
+
+        self.pa = pa
+        # The schema comes from the column types, so every chunk (including
+        # ones where a column is all NULL) is written with the same types
+        self.schema = pa.schema([(column.name, self._arrow_type(pa, column.type)) for column in columns])
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def _arrow_type(self, pa, column_type):
+        if isinstance(column_type, JSON):
+            return pa.string()
+        if isinstance(column_type, Boolean):
+            return pa.bool_()
+        if isinstance(column_type, Integer):
+            return pa.int64()
+        if isinstance(column_type, Float):
+            return pa.float64()
+        if isinstance(column_type, DateTime):
+            return pa.timestamp("us")
+        if isinstance(column_type, Date):
+            return pa.date32()
+        return pa.string()
+
+    def write(self, frame: pd.DataFrame) -> None:
+        self.writer.write_table(self.pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+
+    def close(self) -> None:
+        self.writer.close()
@@ -1,16 +1,38 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from ..core.config import settings
+from ..core.database import upsert
+from ..core.pagination import invalidate_count_cache
 from ..models.job import Job
 from ..models.candidate import Candidate
 from ..models.skill import Skill
+from ..models.import_record import ImportedFile, ImportedRow
+from ..services.bitmap_index import candidate_bitmaps
+from ..services.candidate_snapshot import candidate_snapshot
+from ..services.file_cache import SidecarCache
+from ..services.file_formats import count_rows, read_chunks, read_columns, read_head
+from ..services.hr_schema import hr_categorical_dtypes
+from ..services.import_validation import ImportValidator, RejectedRowsWriter
 from ..services.skills_assessment import SkillsAssessmentService
+import hashlib
+import multiprocessing
 import os
+import queue
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+REPEATED_EMPLOYEE_ERROR = "Duplicate EmployeeNumber (already imported from an earlier row of this file)"
 
 class DataImportService:
     def __init__(self):
         self.skills_service = SkillsAssessmentService()
+        self.file_cache = SidecarCache()
         
         # Mapping of CSV columns to our system fields
         self.job_role_mapping = {
@@ -82,53 +104,456 @@ class DataImportService:
             4: 'Lead',
             5: 'Manager'
         }
+        
+        # The only columns the import reads; row hashes cover these too
+        self.import_columns = [
+            'EmployeeNumber', 'Attrition', 'JobRole', 'Department', 'JobLevel', 'MonthlyIncome',
+            'Education', 'TotalWorkingYears', 'JobSatisfaction', 'PerformanceRating'
+        ]
+        # Categoricals are safe to load directly; integers are read as they
+        # come and cast to their declared types once validated
+        self.import_dtypes = hr_categorical_dtypes(self.import_columns)
+        self.validator = ImportValidator(self.import_columns)
     
-    def import_csv_data(self, csv_file_path: str, db: Session) -> Dict:
+    def import_csv_data(
+        self,
+        csv_file_path: str,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        content_hash: Optional[str] = None,
+        file_name: Optional[str] = None,
+        workers: Optional[int] = None,
+        active_only: bool = False
+    ) -> Dict:
         """
-        Import data from CSV file and convert to our system format
+        Import data from a CSV, Parquet or Arrow IPC file and convert to our
+        system format. Only the columns in self.import_columns are read.
+        
+        The file is streamed in chunks of chunk_size rows (default
+        settings.import_chunk_size); each chunk is converted, inserted and
+        committed as one transaction before the next one is read, so memory use
+        does not grow with file size. Counts reflect committed chunks, including
+        on failure.
+        
+        Each chunk is validated first (see ImportValidator): rows with missing
+        or malformed values, out-of-range values or repeated employee numbers
+        are written to a CSV error report and the rest of the chunk imports.
+        A file missing a required column fails as a whole.
+        
+        Every import is recorded in imported_files with the file's sha256
+        (content_hash, if the caller already computed it), and every employee
+        row's hash is kept in imported_rows. A file identical to the last one
+        imported is skipped without being read; otherwise only rows that are new
+        or whose hash changed are converted, so re-importing an updated export
+        costs work proportional to the changes. Employees missing from a later
+        file are left alone, since an export may be partial.
+        
+        With workers > 1 (default settings.import_workers), chunks are
+        converted and scored in that many worker processes while this thread
+        keeps writing them in file order; see _prepared_chunks.
+        
+        active_only drops employees who have left (attrition = 'Yes') while
+        reading; for Parquet and Arrow files the filter is pushed down to the
+        scan. Those rows then neither create jobs nor mark previously imported
+        candidates inactive.
+        
+        progress_callback, if given, receives the running counts after every
+        committed chunk. Setting cancel_event stops the import: the in-flight
+        chunk is rolled back and earlier chunks stay committed.
         """
+        chunk_size = chunk_size or settings.import_chunk_size
+        workers = workers or settings.import_workers
+        progress = {
+            "rows_read": 0,
+            "rows_inserted": 0,
+            "rows_updated": 0,
+            "rows_unchanged": 0,
+            "rows_rejected": 0,
+            "rows_skipped": 0,
+            "jobs_created": 0
+        }
+        skills_created = 0
+        imported_file = None
+        rejected_writer = None
+        
+        def result(success: bool, **extra) -> Dict:
+            return {
+                "success": success,
+                "jobs_created": progress["jobs_created"],
+                "candidates_created": progress["rows_inserted"],
+                "candidates_updated": progress["rows_updated"],
+                "rows_unchanged": progress["rows_unchanged"],
+                "rows_rejected": progress["rows_rejected"],
+                "skills_created": skills_created,
+                "total_records": progress["rows_read"],
+                "file_id": imported_file.id if imported_file is not None else None,
+                **extra
+            }
+        
+        def finish(status: str) -> None:
+            imported_file.status = status
+            imported_file.rows_read = progress["rows_read"]
+            imported_file.rows_unchanged = progress["rows_unchanged"]
+            imported_file.candidates_created = progress["rows_inserted"]
+            imported_file.candidates_updated = progress["rows_updated"]
+            imported_file.rows_rejected = progress["rows_rejected"]
+            imported_file.error_file = rejected_writer.written_path if rejected_writer else None
+            imported_file.finished_at = func.now()
+            db.commit()
+            invalidate_count_cache(Candidate.__tablename__)
+            invalidate_count_cache(Job.__tablename__)
+            candidate_bitmaps.invalidate()
+            candidate_snapshot.invalidate()
+        
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_file_path)
+            content_hash = content_hash or self._file_sha256(csv_file_path)
+            
+            # Skip a file identical to the last completed import; an older
+            # file re-imported later still goes through the diff, which
+            # restores whatever rows changed since
+            previous = db.query(ImportedFile).filter(
+                ImportedFile.status == "completed"
+            ).order_by(ImportedFile.id.desc()).first()
+            if previous is not None and previous.sha256 == content_hash:
+                return result(True, skipped=True, duplicate_of=previous.id, sha256=content_hash)
+            
+            self.validator.check_columns(read_head(csv_file_path, 0).columns)
             
-            # Create jobs from unique job roles
-            jobs_created = self._create_jobs_from_csv(df, db)
+            imported_file = ImportedFile(
+                sha256=content_hash,
+                file_name=file_name or os.path.basename(csv_file_path),
+                size_bytes=os.path.getsize(csv_file_path),
+                status="running"
+            )
+            db.add(imported_file)
+            db.commit()
+            rejected_writer = RejectedRowsWriter(self._error_file_path(imported_file.id), self.import_columns)
             
-            # Create candidates from employee data
-            candidates_created = self._create_candidates_from_csv(df, db)
+            # Jobs already in the database; updated as chunks add new ones
+            known_job_keys = set(db.query(Job.title, Job.department).all())
+            
+            exclude = {'Attrition': 'Yes'} if active_only else None
+            chunks = self._prepared_chunks(csv_file_path, db, imported_file.id, chunk_size, workers, exclude)
+            try:
+                for prepared in chunks:
+                    if workers > 1:
+                        # Chunks are diffed ahead of the writer, so an employee
+                        # repeated within the file may only show up as already
+                        # written now
+                        prepared = self._reject_written_employees(prepared, db, imported_file.id)
+                    
+                    # Create jobs from unique job roles
+                    jobs_created = self._create_jobs_from_csv(prepared["rows"], db, known_job_keys)
+                    
+                    # Update candidates whose rows changed, then create the missing ones
+                    candidates_updated, missing = self._update_candidates(
+                        prepared["changed_candidates"], prepared["left_emails"], db
+                    )
+                    candidates_created = self._insert_candidates(prepared["new_candidates"] + missing, db)
+                    
+                    self._record_row_hashes(prepared["rows"], db, imported_file.id)
+                    
+                    if cancel_event is not None and cancel_event.is_set():
+                        db.rollback()
+                        finish("cancelled")
+                        return result(False, cancelled=True, error="Import cancelled")
+                    db.commit()
+                    rejected_writer.write(prepared["rejected"])
+                    
+                    rows_read = prepared["rows_read"]
+                    progress["rows_read"] += rows_read
+                    progress["rows_inserted"] += candidates_created
+                    progress["rows_updated"] += candidates_updated
+                    progress["rows_unchanged"] += prepared["employees"] - len(prepared["rows"])
+                    progress["rows_rejected"] += len(prepared["rejected"])
+                    progress["rows_skipped"] += rows_read - candidates_created - candidates_updated
+                    progress["jobs_created"] += jobs_created
+                    if progress_callback:
+                        progress_callback(dict(progress))
+            finally:
+                chunks.close()
             
             # Create skills
-            skills_created = self._create_skills_from_csv(df, db)
+            skills_created = self._create_skills_from_csv(db)
             
-            return {
-                "success": True,
-                "jobs_created": jobs_created,
-                "candidates_created": candidates_created,
-                "skills_created": skills_created,
-                "total_records": len(df)
-            }
+            finish("completed")
+            return result(True, sha256=content_hash)
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "jobs_created": 0,
-                "candidates_created": 0,
-                "skills_created": 0
-            }
+            db.rollback()
+            if imported_file is not None:
+                try:
+                    finish("failed")
+                except Exception:
+                    db.rollback()
+            return result(False, error=str(e))
+    
+    def _file_sha256(self, csv_file_path: str) -> str:
+        """
+        Hash a file's content without loading it into memory
+        """
+        hasher = hashlib.sha256()
+        with open(csv_file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+    
+    def _error_file_path(self, file_id: int) -> str:
+        errors_dir = settings.import_errors_dir or os.path.join(tempfile.gettempdir(), "workforce_import_errors")
+        os.makedirs(errors_dir, exist_ok=True)
+        return os.path.join(errors_dir, f"import_{file_id}_errors.csv")
+    
+    def _row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        64-bit hash of every row's import columns, as signed integers for
+        storage. Columns are taken in a fixed order, so the same data hashes
+        the same whichever format or column order it came in.
+        """
+        return pd.util.hash_pandas_object(df[self.import_columns], index=False).to_numpy().view(np.int64)
+    
+    def _diff_against_ledger(
+        self,
+        rows: pd.DataFrame,
+        db: Session,
+        file_id: int
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Compare a validated chunk with the row hashes recorded by earlier imports.
+        
+        Returns (new_rows, changed_rows, repeated_rows); unchanged rows are
+        dropped. Repeated rows are employees already imported earlier in this
+        same file.
+        """
+        rows = rows.assign(_row_hash=self._row_hashes(rows))
+        
+        numbers = rows['EmployeeNumber'].tolist()
+        ledger = {}
+        for start in range(0, len(numbers), 900):
+            batch = numbers[start:start + 900]
+            ledger.update(
+                (number, (row_hash, row_file_id))
+                for number, row_hash, row_file_id in db.query(
+                    ImportedRow.employee_number, ImportedRow.row_hash, ImportedRow.file_id
+                ).filter(ImportedRow.employee_number.in_(batch))
+            )
+        
+        entries = [ledger.get(number) for number in numbers]
+        is_new = np.array([entry is None for entry in entries], dtype=bool)
+        is_repeated = np.array([entry is not None and entry[1] == file_id for entry in entries], dtype=bool)
+        is_changed = np.array([
+            entry is not None and entry[1] != file_id and entry[0] != row_hash
+            for entry, row_hash in zip(entries, rows['_row_hash'].tolist())
+        ], dtype=bool)
+        
+        return rows[is_new], rows[is_changed], rows[is_repeated]
+    
+    def _validated_chunk(self, chunk: pd.DataFrame, db: Session, file_id: int) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Validate a chunk and diff its valid rows against the ledger.
+        
+        Returns (new_rows, changed_rows, rejected_rows), where rejected rows
+        include employees repeated from an earlier chunk of the file.
+        """
+        valid, rejected = self.validator.validate(chunk)
+        new_rows, changed_rows, repeated = self._diff_against_ledger(valid, db, file_id)
+        if not repeated.empty:
+            rejected = pd.concat([
+                rejected,
+                repeated[self.import_columns].assign(errors=REPEATED_EMPLOYEE_ERROR)
+            ])
+        return new_rows, changed_rows, rejected
+    
+    def _prepared_chunks(
+        self,
+        csv_file_path: str,
+        db: Session,
+        file_id: int,
+        chunk_size: int,
+        workers: int,
+        exclude: Optional[Dict[str, str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Read the file in chunks, diff each against the ledger and convert it,
+        yielding prepared chunks (see _prepare_chunk) in file order.
+        
+        With more than one worker this is a pipeline: a reader thread parses
+        chunks into a queue of at most `workers` chunks, each is diffed here
+        and handed to a process pool, and at most 2 x workers chunks are
+        converted ahead of the caller, which writes them one at a time. Both
+        bounds apply backpressure, so memory stays flat however far the
+        writer falls behind.
+        """
+        if workers <= 1:
+            for chunk in read_chunks(csv_file_path, chunk_size, self.import_columns, exclude, self.import_dtypes):
+                new_rows, changed_rows, rejected = self._validated_chunk(chunk, db, file_id)
+                prepared = self._prepare_chunk(new_rows, changed_rows)
+                yield dict(
+                    prepared,
+                    rows_read=len(chunk),
+                    employees=len(chunk) - len(rejected),
+                    rejected=rejected
+                )
+            return
+        
+        chunk_queue = queue.Queue(maxsize=workers)
+        stop_event = threading.Event()
+        reader = threading.Thread(
+            target=self._read_chunks,
+            args=(csv_file_path, chunk_size, exclude, chunk_queue, stop_event),
+            name="csv-import-reader",
+            daemon=True
+        )
+        # Spawned rather than forked workers: this may run on a background
+        # thread of a multi-threaded server
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_conversion_worker
+        )
+        in_flight = deque()
+        
+        def collect():
+            rows_read, rejected, future = in_flight.popleft()
+            return dict(future.result(), rows_read=rows_read, employees=rows_read - len(rejected), rejected=rejected)
+        
+        reader.start()
+        try:
+            while True:
+                chunk = chunk_queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                
+                new_rows, changed_rows, rejected = self._validated_chunk(chunk, db, file_id)
+                future = pool.submit(_prepare_chunk_in_worker, new_rows, changed_rows)
+                in_flight.append((len(chunk), rejected, future))
+                
+                if len(in_flight) >= 2 * workers:
+                    yield collect()
+            
+            while in_flight:
+                yield collect()
+        finally:
+            stop_event.set()
+            reader.join()
+            pool.shutdown(cancel_futures=True)
+    
+    def _read_chunks(
+        self,
+        csv_file_path: str,
+        chunk_size: int,
+        exclude: Optional[Dict[str, str]],
+        chunk_queue: queue.Queue,
+        stop_event: threading.Event
+    ) -> None:
+        """
+        Reader stage of the pipeline: parse chunks into chunk_queue, then put
+        None (or the exception that stopped reading)
+        """
+        def put(item) -> bool:
+            while not stop_event.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        try:
+            for chunk in read_chunks(csv_file_path, chunk_size, self.import_columns, exclude, self.import_dtypes):
+                if not put(chunk):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(None)
+    
+    def _prepare_chunk(self, new_rows: pd.DataFrame, changed_rows: pd.DataFrame) -> Dict:
+        """
+        Convert and score a chunk's new and changed employees.
+        
+        This needs no database access, so it can run in a worker process. The
+        result holds the rows to record in the ledger (with their import
+        columns), candidate rows for new and changed employees who are
+        still active, and the emails of changed employees who have since left.
+        """
+        pending = pd.concat([new_rows, changed_rows])
+        changed_left = (changed_rows['Attrition'] == 'Yes').to_numpy()
+        
+        return {
+            "rows": pending[[*self.import_columns, '_row_hash']],
+            "new_candidates": self._build_candidate_rows(new_rows[new_rows['Attrition'] != 'Yes']),
+            "changed_candidates": self._build_candidate_rows(changed_rows[~changed_left]),
+            "left_emails": self._employee_emails(changed_rows[changed_left]).tolist()
+        }
+    
+    def _reject_written_employees(self, prepared: Dict, db: Session, file_id: int) -> Dict:
+        """
+        Move employees that an earlier chunk of this file already wrote to the
+        rejected rows, so the first occurrence in the file wins
+        """
+        numbers = prepared["rows"]['EmployeeNumber'].tolist()
+        written = set()
+        for start in range(0, len(numbers), 900):
+            batch = numbers[start:start + 900]
+            written.update(number for (number,) in db.query(ImportedRow.employee_number).filter(
+                ImportedRow.employee_number.in_(batch),
+                ImportedRow.file_id == file_id
+            ))
+        if not written:
+            return prepared
+        
+        written_emails = set(self._employee_emails(pd.DataFrame({'EmployeeNumber': list(written)})))
+        is_written = prepared["rows"]['EmployeeNumber'].isin(written)
+        repeated = prepared["rows"][is_written][self.import_columns].assign(errors=REPEATED_EMPLOYEE_ERROR)
+        return dict(
+            prepared,
+            rows=prepared["rows"][~is_written],
+            rejected=pd.concat([prepared["rejected"], repeated]),
+            employees=prepared["employees"] - len(repeated),
+            new_candidates=[row for row in prepared["new_candidates"] if row["email"] not in written_emails],
+            changed_candidates=[row for row in prepared["changed_candidates"] if row["email"] not in written_emails],
+            left_emails=[email for email in prepared["left_emails"] if email not in written_emails]
+        )
     
-    def _create_jobs_from_csv(self, df: pd.DataFrame, db: Session) -> int:
+    def _record_row_hashes(self, rows: pd.DataFrame, db: Session, file_id: int) -> None:
         """
-        Create job roles from unique job roles in the CSV
+        Upsert the ledger entries of the rows imported from this chunk
+        """
+        if rows.empty:
+            return
+        
+        upsert(db, ImportedRow, [
+            {"employee_number": number, "row_hash": row_hash, "file_id": file_id}
+            for number, row_hash in zip(rows['EmployeeNumber'].tolist(), rows['_row_hash'].tolist())
+        ], "employee_number")
+    
+    def _create_jobs_from_csv(self, df: pd.DataFrame, db: Session, known_job_keys: set) -> int:
+        """
+        Create job roles from unique job roles in the CSV.
+        
+        known_job_keys holds the (title, department) pairs that already exist
+        and is extended with the jobs created here, so a job is created once
+        across all chunks of a file.
         """
         unique_jobs = df[['JobRole', 'Department', 'JobLevel', 'MonthlyIncome']].drop_duplicates()
-        jobs_created = 0
+        unique_jobs = unique_jobs.assign(
+            title=unique_jobs['JobRole'].map(lambda role: self.job_role_mapping.get(role, role))
+        )
+        
+        # One job per (title, department); the first row seen sets level and salary
+        unique_jobs = unique_jobs.drop_duplicates(subset=['title', 'Department'])
         
-        for _, row in unique_jobs.iterrows():
-            job_role = row['JobRole']
-            department = row['Department']
-            job_level = self.job_level_mapping.get(row['JobLevel'], 'Mid')
-            monthly_income = row['MonthlyIncome']
+        # Skip jobs that already exist
+        is_new = [key not in known_job_keys for key in zip(unique_jobs['title'], unique_jobs['Department'])]
+        new_jobs = unique_jobs[is_new]
+        
+        job_rows = []
+        for job_role, department, level_code, monthly_income, title in new_jobs.itertuples(index=False):
+            job_level = self.job_level_mapping.get(level_code, 'Mid')
             
             # Calculate salary range based on job level and income
             min_salary = monthly_income * 0.8
@@ -137,9 +562,8 @@ class DataImportService:
             # Get required skills for this job role
             required_skills = list(self.skills_mapping.get(job_role, {}).keys())
             
-            # Create job object
-            job_data = {
-                "title": self.job_role_mapping.get(job_role, job_role),
+            job_rows.append({
+                "title": title,
                 "department": department,
                 "level": job_level,
                 "min_salary": float(min_salary),
@@ -157,66 +581,82 @@ class DataImportService:
                 ],
                 "benefits": ["Health insurance", "401k", "Paid time off"],
                 "location": "Remote",  # Default location
-                "work_type": "Full-time"
-            }
-            
-            # Check if job already exists
-            existing_job = db.query(Job).filter(
-                Job.title == job_data["title"],
-                Job.department == job_data["department"]
-            ).first()
-            
-            if not existing_job:
-                db_job = Job(**job_data)
-                db.add(db_job)
-                jobs_created += 1
+                "work_type": "Full-time",
+                "is_active": True
+            })
         
-        db.commit()
-        return jobs_created
+        self._bulk_insert(db, Job, job_rows)
+        known_job_keys.update((row["title"], row["department"]) for row in job_rows)
+        return len(job_rows)
     
-    def _create_candidates_from_csv(self, df: pd.DataFrame, db: Session) -> int:
+    def _employee_emails(self, employees: pd.DataFrame) -> pd.Series:
+        return "employee" + employees['EmployeeNumber'].astype(str) + "@company.com"
+    
+    def _build_candidate_rows(self, employees: pd.DataFrame) -> List[Dict]:
         """
-        Create candidates from employee data in the CSV
+        Convert employees to candidate rows and score them
         """
-        candidates_created = 0
+        candidate_rows = self._convert_employees_to_candidates(employees)
         
-        for _, row in df.iterrows():
-            # Skip if employee has left (attrition = 'Yes')
-            if row['Attrition'] == 'Yes':
-                continue
-            
-            # Generate candidate data
-            candidate_data = self._convert_employee_to_candidate(row)
-            
-            # Check if candidate already exists (by email)
-            email = f"employee{row['EmployeeNumber']}@company.com"
-            existing_candidate = db.query(Candidate).filter(Candidate.email == email).first()
-            
-            if not existing_candidate:
-                # Assess skills and calculate overall score
-                skill_scores = self.skills_service.assess_candidate_skills(
-                    self._create_candidate_object(candidate_data)
-                )
-                overall_score = self.skills_service.calculate_overall_score(
-                    self._create_candidate_object(candidate_data), skill_scores
-                )
-                
-                # Update candidate data with AI-generated scores
-                candidate_data["skill_scores"] = skill_scores
-                candidate_data["overall_score"] = overall_score
-                
-                db_candidate = Candidate(**candidate_data)
-                db.add(db_candidate)
-                candidates_created += 1
+        # Assess skills and calculate overall scores in one pass
+        skill_scores, overall_scores = self.skills_service.assess_candidates_bulk(
+            [row["skills"] for row in candidate_rows],
+            [row["years_experience"] for row in candidate_rows],
+            [row["education_level"] for row in candidate_rows]
+        )
+        for row, scores, overall in zip(candidate_rows, skill_scores, overall_scores):
+            row["skill_scores"] = scores
+            row["overall_score"] = overall
+        return candidate_rows
+    
+    def _insert_candidates(self, candidate_rows: List[Dict], db: Session) -> int:
+        """
+        Insert candidates, skipping those that already exist (by email)
+        """
+        existing_emails = self._existing_keys(db, Candidate.email, [row["email"] for row in candidate_rows])
+        new_rows = [row for row in candidate_rows if row["email"] not in existing_emails]
+        self._bulk_insert(db, Candidate, new_rows)
+        return len(new_rows)
+    
+    def _update_candidates(self, candidate_rows: List[Dict], left_emails: List[str], db: Session) -> Tuple[int, List[Dict]]:
+        """
+        Refresh existing candidates from rows that changed since the last import.
         
-        db.commit()
-        return candidates_created
+        Employees who have since left (attrition = 'Yes') are marked inactive
+        and unavailable rather than deleted. Returns the number of candidates
+        updated and the rows with no candidate yet, to be inserted instead.
+        """
+        emails = [row["email"] for row in candidate_rows] + left_emails
+        ids = {}
+        for start in range(0, len(emails), 900):
+            batch = emails[start:start + 900]
+            ids.update((email, candidate_id) for candidate_id, email in db.query(
+                Candidate.id, Candidate.email
+            ).filter(Candidate.email.in_(batch)))
+        
+        updates = []
+        missing = []
+        for row in candidate_rows:
+            if row["email"] in ids:
+                update_row = dict(row, id=ids[row["email"]])
+                del update_row["email"]
+                updates.append(update_row)
+            else:
+                missing.append(row)
+        updates.extend(
+            {"id": ids[email], "status": "Inactive", "is_available": False}
+            for email in left_emails if email in ids
+        )
+        
+        chunk_size = settings.import_chunk_size
+        for start in range(0, len(updates), chunk_size):
+            db.execute(update(Candidate), updates[start:start + chunk_size])
+        return len(updates), missing
     
-    def _create_skills_from_csv(self, df: pd.DataFrame, db: Session) -> int:
+    def _create_skills_from_csv(self, db: Session) -> int:
         """
         Create skills from the skills mapping
         """
-        skills_created = 0
         all_skills = set()
         
         # Collect all skills from the mapping
@@ -255,86 +695,129 @@ class DataImportService:
             'Compliance': 'Business'
         }
         
-        for skill_name in all_skills:
-            # Check if skill already exists
-            existing_skill = db.query(Skill).filter(Skill.name == skill_name).first()
-            
-            if not existing_skill:
-                skill_data = {
-                    "name": skill_name,
-                    "category": skill_categories.get(skill_name, "Other"),
-                    "description": f"Skill in {skill_name}",
-                    "market_demand": np.random.uniform(6.0, 9.0),  # Random demand score
-                    "salary_impact": np.random.uniform(5.0, 8.0),  # Random salary impact
-                    "industry_relevance": np.random.uniform(7.0, 9.0)  # Random relevance
-                }
-                
-                db_skill = Skill(**skill_data)
-                db.add(db_skill)
-                skills_created += 1
+        # Check which skills already exist
+        existing_skills = self._existing_keys(db, Skill.name, list(all_skills))
+        new_skills = sorted(all_skills - existing_skills)
+        
+        skill_rows = [
+            {
+                "name": skill_name,
+                "category": skill_categories.get(skill_name, "Other"),
+                "description": f"Skill in {skill_name}",
+                "market_demand": float(np.random.uniform(6.0, 9.0)),  # Random demand score
+                "salary_impact": float(np.random.uniform(5.0, 8.0)),  # Random salary impact
+                "industry_relevance": float(np.random.uniform(7.0, 9.0)),  # Random relevance
+                "is_active": True
+            }
+            for skill_name in new_skills
+        ]
         
+        self._bulk_insert(db, Skill, skill_rows)
         db.commit()
-        return skills_created
+        return len(skill_rows)
     
-    def _convert_employee_to_candidate(self, row: pd.Series) -> Dict:
-        """
-        Convert employee data to candidate format
-        """
-        job_role = row['JobRole']
-        education_level = self.education_mapping.get(row['Education'], 'Bachelor')
-        
-        # Generate skills based on job role and other factors
-        base_skills = self.skills_mapping.get(job_role, {})
-        
-        # Adjust skills based on performance and satisfaction
-        adjusted_skills = {}
-        for skill, base_score in base_skills.items():
-            # Adjust based on job satisfaction and performance
-            satisfaction_bonus = (row['JobSatisfaction'] - 2.5) * 0.2
-            performance_bonus = (row['PerformanceRating'] - 2.5) * 0.2
-            adjusted_score = base_score + satisfaction_bonus + performance_bonus
-            adjusted_skills[skill] = max(1, min(10, int(adjusted_score)))
-        
-        # Add some additional skills based on education and experience
-        if row['Education'] >= 4:  # Master's or higher
-            adjusted_skills['Leadership'] = 7
-            adjusted_skills['Strategic Thinking'] = 6
-        
-        if row['TotalWorkingYears'] > 10:
-            adjusted_skills['Experience'] = 9
-            adjusted_skills['Problem Solving'] = 8
-        
-        # Generate candidate data
-        candidate_data = {
-            "first_name": f"Employee{row['EmployeeNumber']}",
-            "last_name": f"From{row['Department']}",
-            "email": f"employee{row['EmployeeNumber']}@company.com",
-            "phone": f"+1-555-{row['EmployeeNumber']:04d}",
-            "current_position": self.job_role_mapping.get(job_role, job_role),
+    def _existing_keys(self, db: Session, column, keys: List) -> set:
+        """
+        Return the subset of keys already present in column, querying in
+        batches that stay under SQLite's bound-parameter limit
+        """
+        existing = set()
+        for start in range(0, len(keys), 900):
+            batch = keys[start:start + 900]
+            existing.update(value for (value,) in db.query(column).filter(column.in_(batch)))
+        return existing
+    
+    def _bulk_insert(self, db: Session, model, rows: List[Dict]) -> None:
+        """
+        Insert rows with multi-row INSERT statements, bypassing ORM object creation
+        """
+        chunk_size = settings.import_chunk_size
+        for start in range(0, len(rows), chunk_size):
+            db.execute(insert(model), rows[start:start + chunk_size])
+    
+    def _convert_employees_to_candidates(self, employees: pd.DataFrame) -> List[Dict]:
+        """
+        Convert employee rows to candidate records.
+        
+        Every column is computed over the whole frame; dicts are only built at
+        the end, as the rows handed to the bulk insert.
+        """
+        job_role = employees['JobRole'].astype(object)
+        
+        columns = {
+            "first_name": "Employee" + employees['EmployeeNumber'].astype(str),
+            "last_name": "From" + employees['Department'].astype(str),
+            "email": self._employee_emails(employees),
+            "phone": "+1-555-" + employees['EmployeeNumber'].astype(str).str.zfill(4),
+            "current_position": job_role.map(self.job_role_mapping).fillna(job_role).astype(str),
+            "years_experience": employees['TotalWorkingYears'].astype(float),
+            "education_level": employees['Education'].map(self.education_mapping).fillna('Bachelor').astype(str),
+            "expected_salary": (employees['MonthlyIncome'] * 12).astype(float),  # Annual salary
+        }
+        records = {name: column.tolist() for name, column in columns.items()}
+        records["skills"] = self._generate_employee_skills(employees)
+        records["preferred_departments"] = [[dept] for dept in employees['Department'].astype(str).tolist()]
+        
+        # Constant fields (the shared list is only read when the rows are serialized)
+        constants = {
             "current_company": "Current Company",
-            "years_experience": float(row['TotalWorkingYears']),
-            "education_level": education_level,
-            "skills": adjusted_skills,
-            "expected_salary": float(row['MonthlyIncome'] * 12),  # Annual salary
             "salary_currency": "USD",
             "preferred_locations": ["Remote", "Current Location"],
             "preferred_work_type": "Full-time",
-            "preferred_departments": [row['Department']],
             "is_available": True,
             "status": "Active"
         }
         
-        return candidate_data
+        names = list(records)
+        return [dict(zip(names, values), **constants) for values in zip(*records.values())]
     
-    def _create_candidate_object(self, candidate_data: Dict) -> Candidate:
+    def _generate_employee_skills(self, employees: pd.DataFrame) -> List[Dict[str, int]]:
         """
-        Create a Candidate object from data for skills assessment
+        Generate skill dicts for every employee from their job role template,
+        adjusted for satisfaction and performance, plus education and
+        experience based extras
         """
-        candidate = Candidate()
-        for key, value in candidate_data.items():
-            if hasattr(candidate, key):
-                setattr(candidate, key, value)
-        return candidate
+        # Adjust skills based on job satisfaction and performance
+        satisfaction_bonus = (employees['JobSatisfaction'].to_numpy(dtype=float) - 2.5) * 0.2
+        performance_bonus = (employees['PerformanceRating'].to_numpy(dtype=float) - 2.5) * 0.2
+        
+        # Additional skills based on education (Master's or higher) and experience
+        rules = [
+            (employees['Education'].to_numpy() >= 4, {'Leadership': 7, 'Strategic Thinking': 6}),
+            (employees['TotalWorkingYears'].to_numpy() > 10, {'Experience': 9, 'Problem Solving': 8})
+        ]
+        
+        # Rows sharing a role and rule outcome share the same skill names, so each
+        # group is a dense matrix: the role template broadcast over its rows
+        group_keys = pd.DataFrame({
+            'role': employees['JobRole'].astype(str).to_numpy(),
+            **{f'rule_{i}': mask for i, (mask, _) in enumerate(rules)}
+        })
+        skills: List[Optional[Dict[str, int]]] = [None] * len(employees)
+        
+        for key, positions in group_keys.groupby(list(group_keys.columns), sort=False).indices.items():
+            role, rule_flags = key[0], key[1:]
+            template = self.skills_mapping.get(role, {})
+            names = list(template)
+            
+            base = np.array(list(template.values()), dtype=float)
+            adjusted = (base[None, :] + satisfaction_bonus[positions, None]) + performance_bonus[positions, None]
+            values = np.clip(np.trunc(adjusted), 1, 10).astype(int)
+            
+            for applies, (_, extra_skills) in zip(rule_flags, rules):
+                if not applies:
+                    continue
+                for skill, score in extra_skills.items():
+                    if skill in names:
+                        values[:, names.index(skill)] = score
+                    else:
+                        names.append(skill)
+                        values = np.column_stack([values, np.full(len(positions), score)])
+            
+            for position, row in zip(positions.tolist(), values.tolist()):
+                skills[position] = dict(zip(names, row))
+        
+        return skills
     
     def _get_experience_for_level(self, level: str) -> int:
         """
@@ -351,13 +834,25 @@ class DataImportService:
     
     def get_import_summary(self, csv_file_path: str) -> Dict:
         """
-        Get summary of data to be imported without actually importing
+        Get summary of data to be imported without actually importing.
+        
+        Only the aggregated columns are read, and the summary is cached in a
+        sidecar file keyed by the data file's modification time and size.
         """
+        cached = self.file_cache.get(csv_file_path, "summary")
+        if cached is not None:
+            return cached
+        
         try:
-            df = pd.read_csv(csv_file_path)
+            columns = ['Attrition', 'JobRole', 'Department', 'MonthlyIncome', 'TotalWorkingYears']
+            # The file may not be valid yet: blank or non-numeric cells are
+            # left out of the statistics rather than failing the read
+            df = read_columns(csv_file_path, columns, dtype=hr_categorical_dtypes(columns))
+            income = pd.to_numeric(df['MonthlyIncome'], errors='coerce')
+            working_years = pd.to_numeric(df['TotalWorkingYears'], errors='coerce')
             
             # Count active employees (no attrition)
-            active_employees = len(df[df['Attrition'] == 'No'])
+            active_employees = int((df['Attrition'] == 'No').sum())
             total_employees = len(df)
             
             # Get unique job roles
@@ -366,32 +861,84 @@ class DataImportService:
             
             # Get salary statistics
             salary_stats = {
-                'min': float(df['MonthlyIncome'].min()),
-                'max': float(df['MonthlyIncome'].max()),
-                'mean': float(df['MonthlyIncome'].mean()),
-                'median': float(df['MonthlyIncome'].median())
+                'min': _statistic(income.min()),
+                'max': _statistic(income.max()),
+                'mean': _statistic(income.mean()),
+                'median': _statistic(income.median()),
+                'invalid_values': int(income.isna().sum())
             }
             
             # Get experience statistics
             experience_stats = {
-                'min': float(df['TotalWorkingYears'].min()),
-                'max': float(df['TotalWorkingYears'].max()),
-                'mean': float(df['TotalWorkingYears'].mean())
+                'min': _statistic(working_years.min()),
+                'max': _statistic(working_years.max()),
+                'mean': _statistic(working_years.mean()),
+                'invalid_values': int(working_years.isna().sum())
             }
             
-            return {
+            summary = {
                 "total_records": total_employees,
                 "active_employees": active_employees,
                 "attrition_rate": (total_employees - active_employees) / total_employees * 100,
-                "unique_job_roles": unique_jobs,
-                "unique_departments": unique_departments,
+                "unique_job_roles": int(unique_jobs),
+                "unique_departments": int(unique_departments),
                 "salary_statistics": salary_stats,
                 "experience_statistics": experience_stats,
-                "job_roles": df['JobRole'].value_counts().to_dict(),
-                "departments": df['Department'].value_counts().to_dict()
+                "job_roles": {str(k): int(v) for k, v in df['JobRole'].value_counts().items()},
+                "departments": {str(k): int(v) for k, v in df['Department'].value_counts().items()}
             }
             
         except Exception as e:
             return {
                 "error": str(e)
-            } 
\ No newline at end of file
+            }
+        
+        self.file_cache.set(csv_file_path, "summary", summary)
+        return summary
+    
+    def get_preview(self, file_path: str, rows: int = 10) -> Dict:
+        """
+        Preview the first rows of a data file. Only those rows are parsed;
+        the total row count comes from a newline scan (or file metadata),
+        cached like the summary. Column information describes the preview rows,
+        which are shown as the file has them: integer columns are not cast, so
+        a malformed value shows up instead of failing the read.
+        """
+        df = read_head(file_path, rows, dtype=hr_categorical_dtypes())
+        
+        total_rows = self.file_cache.get(file_path, "row_count")
+        if total_rows is None:
+            total_rows = count_rows(file_path)
+            self.file_cache.set(file_path, "row_count", total_rows)
+        
+        # Get column information
+        columns_info = []
+        for col in df.columns:
+            columns_info.append({
+                "name": col,
+                "type": str(df[col].dtype),
+                "unique_values": int(df[col].nunique()),
+                "null_count": int(df[col].isnull().sum())
+            })
+        
+        return {
+            "total_rows": total_rows,
+            "total_columns": len(df.columns),
+            "columns_info": columns_info,
+            # Blank cells as null, not NaN, which JSON cannot carry
+            "preview_data": df.astype(object).where(df.notna(), None).to_dict('records')
+        }
+
+def _statistic(value) -> Optional[float]:
+    """A summary statistic as a float, or None when there were no valid values"""
+    return None if pd.isna(value) else float(value)
+
+# Conversion workers of the import pipeline each hold their own service
+_worker_service: Optional[DataImportService] = None
+
+def _init_conversion_worker() -> None:
+    global _worker_service
+    _worker_service = DataImportService()
+
+def _prepare_chunk_in_worker(new_rows: pd.DataFrame, changed_rows: pd.DataFrame) -> Dict:
+    return _worker_service._prepare_chunk(new_rows, changed_rows)
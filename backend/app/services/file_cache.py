@@ -0,0 +1,69 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SidecarCache:
+    """
+    Caches results computed from a data file in a JSON sidecar file, valid for
+    as long as the data file's modification time and size are unchanged.
+    
+    Sidecars live in settings.file_cache_dir, named after a hash of the data
+    file's absolute path. A sidecar that cannot be written only costs the
+    cache, never the request.
+    """
+    suffix = ".cache.json"
+    
+    def get(self, path: str, key: str) -> Optional[Any]:
+        """
+        Cached value for key, or None if there is none for the file as it is now
+        """
+        entries = self._load(path)
+        return entries.get(key) if entries is not None else None
+    
+    def set(self, path: str, key: str, value: Any) -> None:
+        stat = os.stat(path)
+        entries = self._load(path) or {}
+        entries[key] = value
+        sidecar = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "entries": entries}
+        
+        sidecar_path = self._sidecar_path(path)
+        temp_path = None
+        try:
+            # A temp file of its own per writer, so concurrent writers (threads
+            # included) never interleave; the last replace wins whole
+            with tempfile.NamedTemporaryFile(
+                "w", dir=os.path.dirname(sidecar_path), suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                json.dump(sidecar, f)
+            os.replace(temp_path, sidecar_path)
+        except OSError as e:
+            logger.warning("Could not write cache file %s: %s", sidecar_path, e)
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    def _load(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Entries of the sidecar if it matches the file's current mtime and size
+        """
+        try:
+            stat = os.stat(path)
+            with open(self._sidecar_path(path)) as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if sidecar.get("mtime_ns") != stat.st_mtime_ns or sidecar.get("size") != stat.st_size:
+            return None
+        return sidecar.get("entries")
+    
+    def _sidecar_path(self, path: str) -> str:
+        os.makedirs(settings.file_cache_dir, exist_ok=True)
+        name = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(settings.file_cache_dir, name + self.suffix)
@@ -0,0 +1,133 @@
+import os
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+
+# Extensions accepted for import and export, by format
+FORMAT_EXTENSIONS = {
+    "csv": (".csv",),
+    "parquet": (".parquet", ".pq"),
+    "arrow": (".arrow", ".feather", ".ipc")
+}
+
+class UnsupportedFormatError(ValueError):
+    """Raised for files that are neither CSV, Parquet nor Arrow IPC"""
+
+def detect_format(path: str) -> str:
+    """
+    Format of a data file, from its extension
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, extensions in FORMAT_EXTENSIONS.items():
+        if extension in extensions:
+            return fmt
+    supported = ", ".join(ext for extensions in FORMAT_EXTENSIONS.values() for ext in extensions)
+    raise UnsupportedFormatError(f"Unsupported file type '{extension}'; expected one of {supported}")
+
+def is_supported(path: str) -> bool:
+    try:
+        detect_format(path)
+        return True
+    except UnsupportedFormatError:
+        return False
+
+def read_chunks(
+    path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    exclude: Optional[Dict[str, str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a data file as DataFrames of at most chunk_size rows.
+
+    Only the given columns are read. exclude maps a column to a value whose
+    rows are dropped; for Parquet and Arrow files the filter is pushed down to
+    the scan, so skipped row groups are never decoded. dtype maps columns to
+    the types to load them as (columns not in the file are ignored).
+    """
+    fmt = detect_format(path)
+
+    if fmt == "csv":
+        for chunk in pd.read_csv(path, chunksize=chunk_size, usecols=columns, dtype=dtype):
+            for column, value in (exclude or {}).items():
+                chunk = chunk[chunk[column] != value]
+            yield chunk
+        return
+
+    _, pc = _arrow_dataset()
+    dataset = _open_dataset(path, fmt)
+    row_filter = None
+    for column, value in (exclude or {}).items():
+        condition = pc.field(column) != value
+        row_filter = condition if row_filter is None else row_filter & condition
+
+    # Number rows across batches like read_csv numbers rows across chunks
+    offset = 0
+    for batch in dataset.to_batches(columns=columns, filter=row_filter, batch_size=chunk_size):
+        if batch.num_rows:
+            chunk = _cast(batch.to_pandas(), dtype)
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+def read_columns(path: str, columns: List[str], dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Read only the given columns of a whole data file
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, usecols=columns, dtype=dtype)
+    return _cast(_open_dataset(path, fmt).to_table(columns=columns).to_pandas(), dtype)
+
+def read_head(path: str, rows: int, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Read the first rows of a data file without touching the rest of it
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, nrows=rows, dtype=dtype)
+    return _cast(_open_dataset(path, fmt).head(rows).to_pandas(), dtype)
+
+def count_rows(path: str) -> int:
+    """
+    Number of data rows. Parquet and Arrow files answer from their metadata;
+    CSV files are scanned for newlines without being parsed.
+    """
+    fmt = detect_format(path)
+
+    if fmt != "csv":
+        return _open_dataset(path, fmt).count_rows()
+
+    lines = 0
+    last_byte = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            lines += block.count(b"\n")
+            last_byte = block[-1:]
+    if last_byte != b"\n":
+        lines += 1  # final line without a trailing newline
+    return max(lines - 1, 0)  # minus the header
+
+def _cast(df: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Apply dtype to the columns of df that it covers
+    """
+    if not dtype:
+        return df
+    return df.astype({column: kind for column, kind in dtype.items() if column in df.columns})
+
+def _open_dataset(path: str, fmt: str):
+    ds, _ = _arrow_dataset()
+    return ds.dataset(path, format="parquet" if fmt == "parquet" else "ipc")
+
+def _arrow_dataset():
+    """
+    pyarrow's dataset and compute modules; pyarrow is only needed for
+    Parquet and Arrow files
+    """
+    try:
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise UnsupportedFormatError("Parquet and Arrow files require pyarrow to be installed")
+    return ds, pc
@@ -0,0 +1,78 @@
+from typing import Dict, Iterable, Optional
+
+# Declared column types of the HR employee export (IBM HR Analytics
+# attrition format). Low-cardinality strings load as categoricals and
+# integers as the narrowest type that holds their range, which shrinks
+# DataFrames several-fold compared with object and int64 columns.
+HR_CATEGORICAL_COLUMNS = [
+    'Attrition', 'BusinessTravel', 'Department', 'EducationField', 'Gender',
+    'JobRole', 'MaritalStatus', 'Over18', 'OverTime'
+]
+
+HR_INTEGER_COLUMNS = {
+    # Ratings, levels and small counts
+    'Education': 'int8',
+    'EmployeeCount': 'int8',
+    'EnvironmentSatisfaction': 'int8',
+    'JobInvolvement': 'int8',
+    'JobLevel': 'int8',
+    'JobSatisfaction': 'int8',
+    'NumCompaniesWorked': 'int8',
+    'PerformanceRating': 'int8',
+    'RelationshipSatisfaction': 'int8',
+    'StockOptionLevel': 'int8',
+    'TrainingTimesLastYear': 'int8',
+    'WorkLifeBalance': 'int8',
+    # Ages, distances, percentages and years
+    'Age': 'int8',
+    'DistanceFromHome': 'int8',
+    'PercentSalaryHike': 'int8',
+    'StandardHours': 'int8',
+    'TotalWorkingYears': 'int8',
+    'YearsAtCompany': 'int8',
+    'YearsInCurrentRole': 'int8',
+    'YearsSinceLastPromotion': 'int8',
+    'YearsWithCurrManager': 'int8',
+    # Rates, pay and identifiers
+    'DailyRate': 'int16',
+    'HourlyRate': 'int16',
+    'MonthlyIncome': 'int32',
+    'MonthlyRate': 'int32',
+    'EmployeeNumber': 'int32'
+}
+
+HR_SCHEMA: Dict[str, str] = {
+    **{column: 'category' for column in HR_CATEGORICAL_COLUMNS},
+    **HR_INTEGER_COLUMNS
+}
+
+def hr_dtypes(columns: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    The declared dtypes, restricted to columns when given
+    """
+    if columns is None:
+        return dict(HR_SCHEMA)
+    return {column: HR_SCHEMA[column] for column in columns if column in HR_SCHEMA}
+
+def hr_categorical_dtypes(columns: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    The declared categoricals only, for reading files not yet validated:
+    any value loads as a category, where a blank or non-numeric cell would
+    fail the narrow integer types
+    """
+    return {column: dtype for column, dtype in hr_dtypes(columns).items() if dtype == 'category'}
+
+# Valid ranges (inclusive; None for unbounded) and values checked on import
+HR_RANGES = {
+    'EmployeeNumber': (1, None),
+    'Education': (1, 5),
+    'JobLevel': (1, 5),
+    'JobSatisfaction': (1, 4),
+    'PerformanceRating': (1, 4),
+    'MonthlyIncome': (0, None),
+    'TotalWorkingYears': (0, 80)
+}
+
+HR_ALLOWED_VALUES = {
+    'Attrition': ['Yes', 'No']
+}
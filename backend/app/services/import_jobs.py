@@ -0,0 +1,163 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..services.data_import import DataImportService
+from ..services.file_formats import count_rows
+
+class ImportJob:
+    """
+    State of one background CSV import
+    """
+    def __init__(
+        self,
+        file_path: str,
+        chunk_size: Optional[int] = None,
+        cleanup: Optional[Callable[[str], None]] = None,
+        content_hash: Optional[str] = None,
+        file_name: Optional[str] = None,
+        active_only: bool = False
+    ):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.cleanup = cleanup  # called with file_path when the import ends (uploads release their file)
+        self.content_hash = content_hash  # sha256 computed while the file was uploaded
+        self.file_name = file_name
+        self.active_only = active_only
+        self.status = "queued"  # queued, running, cancelling, completed, skipped, failed, cancelled
+        self.total_rows: Optional[int] = None
+        self.progress = {
+            "rows_read": 0, "rows_inserted": 0, "rows_updated": 0,
+            "rows_unchanged": 0, "rows_rejected": 0, "rows_skipped": 0, "jobs_created": 0
+        }
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+
+    def to_dict(self) -> Dict:
+        """
+        Status snapshot including throughput and ETA
+        """
+        elapsed = None
+        throughput = None
+        eta_seconds = None
+
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+            if elapsed > 0:
+                throughput = self.progress["rows_read"] / elapsed
+            if self.status == "running" and throughput and self.total_rows is not None:
+                eta_seconds = max(self.total_rows - self.progress["rows_read"], 0) / throughput
+
+        return {
+            "import_id": self.id,
+            "status": self.status,
+            "file_path": self.file_path,
+            "total_rows": self.total_rows,
+            **self.progress,
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "rows_per_second": round(throughput, 1) if throughput is not None else None,
+            "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at
+        }
+
+class ImportJobManager:
+    """
+    Runs CSV imports on background threads and tracks their progress in memory
+    """
+    def __init__(self, data_import_service: DataImportService):
+        self.data_import_service = data_import_service
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.import_concurrency, thread_name_prefix="csv-import"
+        )
+        self.jobs: Dict[str, ImportJob] = {}
+        self.lock = threading.Lock()
+
+    def submit(
+        self,
+        file_path: str,
+        chunk_size: Optional[int] = None,
+        cleanup: Optional[Callable[[str], None]] = None,
+        content_hash: Optional[str] = None,
+        file_name: Optional[str] = None,
+        active_only: bool = False
+    ) -> ImportJob:
+        """
+        Queue an import and return its job immediately
+        """
+        job = ImportJob(
+            file_path, chunk_size=chunk_size, cleanup=cleanup,
+            content_hash=content_hash, file_name=file_name, active_only=active_only
+        )
+        with self.lock:
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, import_id: str) -> Optional[ImportJob]:
+        return self.jobs.get(import_id)
+
+    def list_jobs(self) -> List[ImportJob]:
+        return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, import_id: str) -> Optional[ImportJob]:
+        """
+        Request cancellation; the running chunk is rolled back at its next commit point
+        """
+        job = self.jobs.get(import_id)
+        if job is not None and job.status in ("queued", "running"):
+            job.cancel_event.set()
+            job.status = "cancelling"
+        return job
+
+    def _run(self, job: ImportJob) -> None:
+        if job.cancel_event.is_set():
+            job.status = "cancelled"
+            self._cleanup(job)
+            return
+
+        job.status = "running"
+        job.started_at = time.perf_counter()
+        db = SessionLocal()
+        try:
+            job.total_rows = count_rows(job.file_path)
+            result = self.data_import_service.import_csv_data(
+                job.file_path, db,
+                chunk_size=job.chunk_size,
+                progress_callback=lambda progress: job.progress.update(progress),
+                cancel_event=job.cancel_event,
+                content_hash=job.content_hash,
+                file_name=job.file_name,
+                active_only=job.active_only
+            )
+            job.result = result
+            if result.get("skipped"):
+                job.status = "skipped"
+            elif result.get("cancelled"):
+                job.status = "cancelled"
+            elif result["success"]:
+                job.status = "completed"
+            else:
+                job.status = "failed"
+                job.error = result.get("error")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.perf_counter()
+            db.close()
+            self._cleanup(job)
+
+    def _cleanup(self, job: ImportJob) -> None:
+        if job.cleanup is not None:
+            job.cleanup(job.file_path)
@@ -0,0 +1,98 @@
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..services.hr_schema import HR_ALLOWED_VALUES, HR_RANGES, HR_SCHEMA
+
+class ImportValidationError(ValueError):
+    """Raised when a file cannot be imported at all, e.g. required columns are missing"""
+
+class ImportValidator:
+    """
+    Vectorized data-quality checks for HR import chunks.
+    
+    Every check is a boolean mask over the whole chunk; a row failing any of
+    them is rejected with all of its failures listed, and the remaining rows
+    are cast to the declared integer types.
+    """
+    def __init__(self, required_columns: List[str]):
+        self.required_columns = required_columns
+        self.integer_columns = {
+            column: dtype for column, dtype in HR_SCHEMA.items()
+            if column in required_columns and dtype.startswith('int')
+        }
+    
+    def check_columns(self, columns) -> None:
+        """
+        Fail the whole import if the file lacks a required column
+        """
+        missing = [column for column in self.required_columns if column not in columns]
+        if missing:
+            raise ImportValidationError(f"Missing required columns: {', '.join(missing)}")
+    
+    def validate(self, chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split a chunk into (valid rows, rejected rows). Rejected rows keep their
+        original values plus an 'errors' column.
+        """
+        errors = pd.Series("", index=chunk.index, dtype=object)
+        
+        def fail(mask, message: str) -> None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.any():
+                errors[mask] = errors[mask] + message + "; "
+        
+        for column in self.required_columns:
+            fail(chunk[column].isna(), f"{column} is missing")
+        
+        numbers = {}
+        for column, dtype in self.integer_columns.items():
+            values = pd.to_numeric(chunk[column], errors='coerce')
+            fail(chunk[column].notna() & values.isna(), f"{column} is not a number")
+            fail(values.notna() & (values % 1 != 0), f"{column} is not a whole number")
+            
+            # Declared ranges, capped to what the column's integer type can hold
+            low, high = HR_RANGES.get(column, (None, None))
+            info = np.iinfo(dtype)
+            low = info.min if low is None else max(low, info.min)
+            high = info.max if high is None else min(high, info.max)
+            fail(values.notna() & ((values < low) | (values > high)), f"{column} must be between {low} and {high}")
+            numbers[column] = values
+        
+        for column, allowed in HR_ALLOWED_VALUES.items():
+            if column in self.required_columns:
+                values = chunk[column]
+                fail(values.notna() & ~values.isin(allowed), f"{column} must be one of {', '.join(allowed)}")
+        
+        # Repeated employee numbers within the chunk: the first one wins
+        fail(chunk['EmployeeNumber'].duplicated(keep='first') & chunk['EmployeeNumber'].notna(),
+             "Duplicate EmployeeNumber")
+        
+        bad = (errors != "").to_numpy()
+        rejected = chunk[bad].assign(errors=errors[bad].str.rstrip("; "))
+        valid = chunk[~bad].assign(**{
+            column: values[~bad].astype(self.integer_columns[column])
+            for column, values in numbers.items()
+        })
+        return valid, rejected
+
+class RejectedRowsWriter:
+    """
+    Appends rejected rows to a CSV error report, created afresh on the first write
+    """
+    def __init__(self, path: str, columns: List[str]):
+        self.path = path
+        self.columns = ["row", "errors", *columns]
+        self.rows_written = 0
+    
+    def write(self, rejected: pd.DataFrame) -> None:
+        if rejected.empty:
+            return
+        report = rejected.assign(row=rejected.index + 1).reindex(columns=self.columns)
+        # The first write replaces any report left at this path by an earlier run
+        first = self.rows_written == 0
+        report.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+        self.rows_written += len(report)
+    
+    @property
+    def written_path(self) -> Optional[str]:
+        return self.path if self.rows_written else None
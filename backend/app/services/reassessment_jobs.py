@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..core.database import SessionLocal
+from ..services.bulk_operations import BulkOperationsService
+
+class ReassessmentJob:
+    """
+    State of one background reassessment of every candidate
+    """
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.id = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.status = "queued"  # queued, running, cancelling, completed, failed, cancelled
+        self.total_candidates: Optional[int] = None
+        self.candidates_processed = 0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+
+    def update_progress(self, progress: Dict) -> None:
+        self.total_candidates = progress["total"]
+        self.candidates_processed = progress["processed"]
+
+    def to_dict(self) -> Dict:
+        """
+        Status snapshot including throughput and ETA
+        """
+        elapsed = None
+        throughput = None
+        eta_seconds = None
+        percent = None
+
+        if self.total_candidates is not None:
+            percent = self.candidates_processed / self.total_candidates * 100 if self.total_candidates else 100.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+            if elapsed > 0:
+                throughput = self.candidates_processed / elapsed
+            if self.status == "running" and throughput and self.total_candidates is not None:
+                eta_seconds = max(self.total_candidates - self.candidates_processed, 0) / throughput
+
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total_candidates": self.total_candidates,
+            "candidates_processed": self.candidates_processed,
+            "percent": round(percent, 1) if percent is not None else None,
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "candidates_per_second": round(throughput, 1) if throughput is not None else None,
+            "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at
+        }
+
+class ReassessmentJobManager:
+    """
+    Runs candidate reassessments on a background thread, one at a time, and
+    tracks their progress in memory
+    """
+    def __init__(self, bulk_service: BulkOperationsService):
+        self.bulk_service = bulk_service
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reassessment")
+        self.jobs: Dict[str, ReassessmentJob] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, chunk_size: Optional[int] = None) -> Tuple[ReassessmentJob, bool]:
+        """
+        Queue a reassessment and return its job immediately, or return the one
+        already queued or running. The flag is True for a new job.
+        """
+        with self.lock:
+            for job in self.jobs.values():
+                if job.status in ("queued", "running", "cancelling"):
+                    return job, False
+            job = ReassessmentJob(chunk_size=chunk_size)
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[ReassessmentJob]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[ReassessmentJob]:
+        return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[ReassessmentJob]:
+        """
+        Request cancellation; the job stops before its next chunk
+        """
+        job = self.jobs.get(job_id)
+        if job is not None and job.status in ("queued", "running"):
+            job.cancel_event.set()
+            job.status = "cancelling"
+        return job
+
+    def _run(self, job: ReassessmentJob) -> None:
+        if job.cancel_event.is_set():
+            job.status = "cancelled"
+            return
+
+        job.status = "running"
+        job.started_at = time.perf_counter()
+        db = SessionLocal()
+        try:
+            result = self.bulk_service.reassess_candidates(
+                db,
+                chunk_size=job.chunk_size,
+                progress_callback=job.update_progress,
+                cancel_event=job.cancel_event
+            )
+            job.result = result
+            job.status = "cancelled" if result["cancelled"] else "completed"
+        except Exception as e:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.perf_counter()
+            db.close()
@@ -0,0 +1,100 @@
+import re
+from sqlalchemy import Select, column, func, literal, literal_column, select, table
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from ..models.search_index import CANDIDATE_SEARCH, JOB_SEARCH, SearchIndex
+
+# Markers around matched terms in snippets
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_WORDS = 16
+
+class InvalidSearchQueryError(ValueError):
+    """Raised when a search query has nothing to search for"""
+
+class SearchQueryBuilder:
+    """
+    Builds ranked full-text queries over the search indexes in
+    models/search_index.py: FTS5 with bm25 on SQLite, tsvector with ts_rank
+    on Postgres.
+
+    Every word of the query must match (prefix matches with a trailing *,
+    e.g. "pyth*", on SQLite). Hits come back as (id, score, snippet), best
+    first; a higher score is a better match.
+    """
+    def __init__(self, dialect_name: str):
+        self.dialect_name = dialect_name
+
+    @classmethod
+    def for_session(cls, db) -> "SearchQueryBuilder":
+        return cls(db.get_bind().dialect.name)
+
+    def candidate_hits(self, query: str) -> Select:
+        return self._hits(CANDIDATE_SEARCH, query)
+
+    def candidate_matches(self, query: str) -> Select:
+        """Ids of all matching candidates, unordered (for counting)"""
+        return self._matches(CANDIDATE_SEARCH, query)
+
+    def job_hits(self, query: str) -> Select:
+        return self._hits(JOB_SEARCH, query)
+
+    def job_matches(self, query: str) -> Select:
+        """Ids of all matching jobs, unordered (for counting)"""
+        return self._matches(JOB_SEARCH, query)
+
+    def _hits(self, index: SearchIndex, query: str) -> Select:
+        if self.dialect_name == "postgresql":
+            source, vector, tsquery = self._postgres_match(index, query)
+            rank = func.ts_rank(vector, tsquery)
+            document = func.concat_ws(" ", *[source.c[name] for name in index.postgres_text])
+            snippet = func.ts_headline(
+                literal("english", REGCONFIG), document, tsquery,
+                f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_WORDS}, MinWords=5"
+            )
+            return (
+                select(source.c.id.label("id"), rank.label("score"), snippet.label("snippet"))
+                .where(vector.bool_op("@@")(tsquery))
+                .order_by(rank.desc(), source.c.id)
+            )
+
+        fts, fts_name, match = self._sqlite_match(index, query)
+        # bm25 is lower for better matches
+        rank = func.bm25(fts_name, *index.weights)
+        snippet = func.snippet(fts_name, -1, HIGHLIGHT_START, HIGHLIGHT_END, "…", SNIPPET_WORDS)
+        return (
+            select(fts.c.rowid.label("id"), (-rank).label("score"), snippet.label("snippet"))
+            .where(match)
+            .order_by(rank, fts.c.rowid)
+        )
+
+    def _matches(self, index: SearchIndex, query: str) -> Select:
+        if self.dialect_name == "postgresql":
+            source, vector, tsquery = self._postgres_match(index, query)
+            return select(source.c.id).where(vector.bool_op("@@")(tsquery))
+
+        fts, _, match = self._sqlite_match(index, query)
+        return select(fts.c.rowid).where(match)
+
+    def _postgres_match(self, index: SearchIndex, query: str):
+        self._terms(query)
+        source = table(index.table, column("id"), *[column(name) for name in index.postgres_text])
+        vector = literal_column(f"{index.table}.search_vector")
+        tsquery = func.websearch_to_tsquery(literal("english", REGCONFIG), query)
+        return source, vector, tsquery
+
+    def _sqlite_match(self, index: SearchIndex, query: str):
+        fts = table(index.fts_table, column("rowid"))
+        # The table name stands for the whole row in MATCH, bm25() and snippet()
+        fts_name = literal_column(index.fts_table)
+        match = fts_name.op("MATCH")(self._fts5_query(query))
+        return fts, fts_name, match
+
+    def _terms(self, query: str):
+        terms = re.findall(r"(\w+)(\*?)", query)
+        if not terms:
+            raise InvalidSearchQueryError("Search query has no words to search for")
+        return terms
+
+    def _fts5_query(self, query: str) -> str:
+        # Quote every word so that user input is never read as FTS5 syntax
+        return " ".join(f'"{word}"{star}' for word, star in self._terms(query))
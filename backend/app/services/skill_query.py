@@ -0,0 +1,113 @@
+import operator
+from typing import Iterable, List, NamedTuple, Optional
+from sqlalchemy import Float, Text, and_, cast, intersect, or_, select, true, type_coerce, union
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlalchemy.orm import Session
+from ..models.candidate import Candidate
+from ..models.skill_index import CANDIDATE_SKILLS
+
+# Comparison operators accepted in a skill predicate, longest first so that
+# ">=" is not read as ">"
+SKILL_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq
+}
+
+class InvalidSkillPredicateError(ValueError):
+    """Raised when a skill predicate cannot be parsed"""
+
+class SkillPredicate(NamedTuple):
+    """
+    A skill a candidate must have, optionally at a proficiency (1-10) compared
+    with op, e.g. SkillPredicate("Python", ">=", 7.0)
+    """
+    skill: str
+    op: Optional[str] = None
+    level: Optional[float] = None
+
+def parse_skill_predicate(text: str) -> SkillPredicate:
+    """
+    Parse "Python", "Python:>=7" or "Python:7" (same as >=7)
+    """
+    skill, _, condition = text.partition(":")
+    skill = skill.strip()
+    condition = condition.strip()
+    if not skill:
+        raise InvalidSkillPredicateError(f"Missing skill name in '{text}'")
+    if not condition:
+        return SkillPredicate(skill)
+
+    op = next((symbol for symbol in SKILL_OPERATORS if condition.startswith(symbol)), ">=")
+    value = condition[len(op):] if condition.startswith(op) else condition
+    try:
+        level = float(value)
+    except ValueError:
+        raise InvalidSkillPredicateError(f"Invalid proficiency '{value}' in '{text}'")
+    return SkillPredicate(skill, "==" if op == "=" else op, level)
+
+class SkillQueryBuilder:
+    """
+    Builds WHERE clauses over candidates.skills.
+
+    On Postgres (JSONB) skill names are matched with the key-existence
+    operators ?, ?& and ?|, which the GIN index on candidates.skills serves;
+    proficiency thresholds are then checked on the matching rows. On SQLite
+    each predicate is an index range over the candidate_skills junction
+    table, and the matching ids are intersected (all) or united (any).
+    """
+    def __init__(self, dialect_name: str):
+        self.dialect_name = dialect_name
+
+    @classmethod
+    def for_session(cls, db: Session) -> "SkillQueryBuilder":
+        return cls(db.get_bind().dialect.name)
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.dialect_name == "postgresql"
+
+    def candidate_skills(self, predicates: Iterable[SkillPredicate], match_all: bool = True):
+        """
+        Candidates whose skills satisfy all (or, with match_all=False, any) of
+        the predicates
+        """
+        predicates = list(predicates)
+        if not predicates:
+            return true()
+
+        if not self.is_postgres:
+            # One index range per predicate, combined on candidate id
+            matching = [self._candidates_with(predicate) for predicate in predicates]
+            if len(matching) == 1:
+                return Candidate.id.in_(matching[0])
+            return Candidate.id.in_(intersect(*matching) if match_all else union(*matching))
+
+        conditions = [self._candidate_skill(predicate) for predicate in predicates]
+        # One indexed key test for the whole set, then the per-skill levels
+        skills = type_coerce(Candidate.skills, JSONB)
+        names = sorted({predicate.skill for predicate in predicates})
+        if match_all:
+            return and_(skills.has_all(self._text_array(names)), *conditions)
+        return and_(skills.has_any(self._text_array(names)), or_(*conditions))
+
+    def _candidate_skill(self, predicate: SkillPredicate):
+        skills = type_coerce(Candidate.skills, JSONB)
+        if predicate.op is None:
+            return skills.has_key(predicate.skill)
+        level = cast(skills[predicate.skill].astext, Float)
+        return SKILL_OPERATORS[predicate.op](level, predicate.level)
+
+    def _candidates_with(self, predicate: SkillPredicate):
+        # Covered by ix_candidate_skills_skill_level: skill, then level range
+        rows = select(CANDIDATE_SKILLS.c.candidate_id).where(CANDIDATE_SKILLS.c.skill == predicate.skill)
+        if predicate.op is not None:
+            rows = rows.where(SKILL_OPERATORS[predicate.op](CANDIDATE_SKILLS.c.level, predicate.level))
+        return rows
+
+    def _text_array(self, values: List[str]):
+        # ?& and ?| take text[]
+        return cast(array(values), ARRAY(Text))
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics.pairwise import cosine_similarity
 from ..models.candidate import Candidate
@@ -63,6 +63,63 @@ class SkillsAssessmentService:
         
         return round(overall_score, 3)
     
+    def assess_candidates_bulk(
+        self,
+        skills: Sequence[Dict[str, int]],
+        years_experience: Sequence[float],
+        education_levels: Sequence[str]
+    ) -> Tuple[List[Dict[str, float]], List[float]]:
+        """
+        Vectorized equivalent of assess_candidate_skills + calculate_overall_score
+        for many candidates at once. Returns (skill_scores, overall_scores) in
+        input order.
+        """
+        n = len(skills)
+        if n == 0:
+            return [], []
+        
+        years = np.asarray(years_experience, dtype=np.float64)
+        education_bonus = np.array([self._get_education_bonus(level) for level in education_levels])
+        education_score = np.array([self._get_education_score(level) for level in education_levels])
+        
+        # Flatten every candidate's skills into one array (CSR layout)
+        counts = np.fromiter((len(s) for s in skills), dtype=np.int64, count=n)
+        proficiency = np.fromiter(
+            (level for s in skills for level in s.values()), dtype=np.float64, count=int(counts.sum())
+        )
+        owner = np.repeat(np.arange(n), counts)
+        
+        # Per-skill score, same formula as assess_candidate_skills
+        experience_multiplier = np.minimum(years / 10.0, 1.5)
+        scores = np.minimum(
+            (proficiency / 10.0) * experience_multiplier[owner] + education_bonus[owner], 1.0
+        )
+        
+        # Per-candidate average skill score. Candidates are grouped by skill count
+        # so each group is a dense (m, k) block and mean(axis=1) sums in the same
+        # order as np.mean does in calculate_overall_score.
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        avg_skill_score = np.zeros(n)
+        for k in np.unique(counts[counts > 0]):
+            members = np.flatnonzero(counts == k)
+            avg_skill_score[members] = scores[starts[members, None] + np.arange(k)].mean(axis=1)
+        
+        # Same weighting as calculate_overall_score
+        experience_score = np.minimum(years / 15.0, 1.0)
+        overall = avg_skill_score * 0.5 + experience_score * 0.3 + education_score * 0.2
+        overall[counts == 0] = 0.0
+        
+        # Split the flat scores back into one dict per candidate
+        score_list = scores.tolist()
+        skill_scores = []
+        start = 0
+        for s in skills:
+            end = start + len(s)
+            skill_scores.append(dict(zip(s.keys(), score_list[start:end])))
+            start = end
+        
+        return skill_scores, np.round(overall, 3).tolist()
+    
     def match_candidate_to_job(self, candidate: Candidate, job: Job) -> Tuple[float, Dict[str, float]]:
         """
         Match candidate to a specific job and return match score and skill matches
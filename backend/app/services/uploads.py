@@ -0,0 +1,292 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+from fastapi.concurrency import run_in_threadpool
+from multipart.multipart import MultipartParser, parse_options_header
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Every file this service spools starts with this, so the expiry sweep of a
+# shared UPLOAD_DIR leaves anything else there alone
+UPLOAD_FILE_PREFIX = "workforce-upload-"
+
+class UploadOffsetError(ValueError):
+    """Raised when a resumable upload chunk does not start at the current offset"""
+    def __init__(self, expected_offset: int):
+        super().__init__(f"Chunk must start at byte {expected_offset}")
+        self.expected_offset = expected_offset
+
+class UploadFormError(ValueError):
+    """Raised for a multipart body without the expected file field"""
+
+class UnsupportedUploadError(UploadFormError):
+    """Raised when save_upload's accept() refuses the file"""
+
+class _MultipartFileWriter:
+    """
+    Callbacks for a streaming multipart parser that write one file field
+    straight to a new file in the upload directory, hashing it on the way
+    """
+    def __init__(self, field: str, upload_dir: str, accept: Callable[[str], bool]):
+        self.field = field.encode()
+        self.upload_dir = upload_dir
+        self.accept = accept
+        self.headers: Dict[bytes, bytes] = {}
+        self.header_field = b""
+        self.header_value = b""
+        self.out = None
+        self.writing = False
+        self.path: Optional[str] = None
+        self.file_name: Optional[str] = None
+        self.rejected: Optional[str] = None
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def callbacks(self) -> Dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end
+        }
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = self.header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        if options.get(b"name") != self.field or b"filename" not in options or self.path or self.rejected:
+            return
+        file_name = options[b"filename"].decode("utf-8", "replace")
+        if not self.accept(file_name):
+            self.rejected = file_name
+            return
+        self.file_name = file_name
+        fd, self.path = tempfile.mkstemp(
+            suffix=os.path.splitext(file_name)[1], prefix=UPLOAD_FILE_PREFIX, dir=self.upload_dir
+        )
+        self.out = os.fdopen(fd, "wb")
+        self.writing = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.writing:
+            block = data[start:end]
+            self.out.write(block)
+            self.hasher.update(block)
+            self.size += len(block)
+
+    def on_part_end(self) -> None:
+        self.writing = False
+
+    def close(self) -> None:
+        if self.out is not None:
+            self.out.close()
+
+class UploadSession:
+    """
+    A resumable upload being appended to a file in the upload directory
+    """
+    def __init__(self, filename: str, path: str, total_size: Optional[int] = None):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.path = path
+        self.total_size = total_size
+        self.offset = 0
+        self.hasher = hashlib.sha256()
+        self.completed = False
+        self.created_at = datetime.now()
+        # monotonic time of the last chunk, for expiring abandoned uploads
+        self.touched_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def to_dict(self) -> Dict:
+        return {
+            "upload_id": self.id,
+            "filename": self.filename,
+            "offset": self.offset,
+            "total_size": self.total_size,
+            "completed": self.completed,
+            "created_at": self.created_at
+        }
+
+class UploadService:
+    """
+    Spools uploaded files to disk while hashing them, so an upload is never
+    held in memory as a whole. Resumable uploads idle for longer than
+    UPLOAD_SESSION_TTL_SECONDS are discarded with their files.
+    
+    A finished upload's file is handed over to its import, which calls
+    release() once done with it; until then the expiry sweep keeps it,
+    however long the import waits or runs.
+    """
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.upload_dir = settings.upload_dir or os.path.join(tempfile.gettempdir(), "workforce_uploads")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.ttl_seconds = settings.upload_session_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.sessions: Dict[str, UploadSession] = {}
+        # Files of finished uploads, not yet released by their import
+        self.handed_over: Set[str] = set()
+        self._handed_over_lock = threading.Lock()
+
+    async def save_upload(
+        self,
+        content_type: str,
+        stream: AsyncIterator[bytes],
+        field: str = "file",
+        accept: Callable[[str], bool] = lambda file_name: True
+    ) -> Dict:
+        """
+        Stream the file field of a multipart/form-data body to a new file, as
+        the body arrives, so it is written to disk once. accept() is given the
+        file name and may refuse the file before any of it is written. File
+        writes run in the threadpool, off the event loop.
+        Returns its path, name, size and sha256.
+        """
+        mime_type, options = parse_options_header(content_type)
+        if mime_type != b"multipart/form-data" or b"boundary" not in options:
+            raise UploadFormError("Expected a multipart/form-data body")
+
+        writer = _MultipartFileWriter(field, self.upload_dir, accept)
+        parser = MultipartParser(options[b"boundary"], writer.callbacks())
+        try:
+            async for block in stream:
+                await run_in_threadpool(parser.write, block)
+                if writer.rejected:
+                    break
+            await run_in_threadpool(parser.finalize)
+        except Exception:
+            await run_in_threadpool(writer.close)
+            if writer.path:
+                await run_in_threadpool(os.unlink, writer.path)
+            raise
+        await run_in_threadpool(writer.close)
+
+        if writer.rejected:
+            raise UnsupportedUploadError(f"Unsupported file '{writer.rejected}'")
+        if writer.path is None:
+            raise UploadFormError(f"No file in the '{field}' field")
+        self._hand_over(writer.path)
+        return {"path": writer.path, "file_name": writer.file_name, "size": writer.size, "sha256": writer.hasher.hexdigest()}
+
+    def create_session(self, filename: str, total_size: Optional[int] = None) -> UploadSession:
+        """
+        Start a resumable upload
+        """
+        self.expire_sessions()
+        suffix = os.path.splitext(filename)[1] or ".csv"
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix=UPLOAD_FILE_PREFIX, dir=self.upload_dir)
+        os.close(fd)
+        session = UploadSession(filename, path, total_size)
+        self.sessions[session.id] = session
+        return session
+
+    def get_session(self, upload_id: str) -> Optional[UploadSession]:
+        self.expire_sessions()
+        return self.sessions.get(upload_id)
+
+    def expire_sessions(self) -> None:
+        """
+        Discard resumable uploads idle for longer than the TTL, and delete
+        upload files that neither a session nor an import holds and that
+        are older than it (left by a previous run of the process)
+        """
+        now = time.monotonic()
+        for session in list(self.sessions.values()):
+            if not session.lock.locked() and now - session.touched_at > self.ttl_seconds:
+                logger.info("Discarding upload %s, idle for %.0f s", session.id, now - session.touched_at)
+                self.discard_session(session)
+
+        with self._handed_over_lock:
+            owned = {session.path for session in list(self.sessions.values())} | self.handed_over
+        cutoff = time.time() - self.ttl_seconds
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(UPLOAD_FILE_PREFIX) or entry.path in owned:
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    async def append_chunk(self, session: UploadSession, offset: int, stream: AsyncIterator[bytes]) -> UploadSession:
+        """
+        Append a streamed chunk that starts at offset. Chunks must arrive in
+        order; a client that lost track of progress can read the session's
+        offset and resume from there. File writes run in the threadpool.
+        """
+        async with session.lock:
+            if session.completed:
+                raise ValueError("Upload already completed")
+            if offset != session.offset:
+                raise UploadOffsetError(session.offset)
+
+            out = await run_in_threadpool(open, session.path, "r+b")
+            try:
+                await run_in_threadpool(out.seek, offset)
+                async for block in stream:
+                    await run_in_threadpool(out.write, block)
+                    session.hasher.update(block)
+                    session.offset += len(block)
+                # Discard anything left over from an earlier, interrupted attempt
+                await run_in_threadpool(out.truncate, session.offset)
+            finally:
+                await run_in_threadpool(out.close)
+            session.touched_at = time.monotonic()
+
+        return session
+
+    def complete_session(self, session: UploadSession) -> Dict:
+        """
+        Finish a resumable upload and hand over its spooled file
+        """
+        if session.total_size is not None and session.offset != session.total_size:
+            raise UploadOffsetError(session.offset)
+        session.completed = True
+        self._hand_over(session.path)
+        self.sessions.pop(session.id, None)
+        return {
+            "path": session.path,
+            "file_name": session.filename,
+            "size": session.offset,
+            "sha256": session.hasher.hexdigest()
+        }
+
+    def release(self, path: str) -> None:
+        """
+        Delete a finished upload's file once its import is done with it
+        """
+        with self._handed_over_lock:
+            self.handed_over.discard(path)
+        if os.path.exists(path):
+            os.unlink(path)
+
+    def _hand_over(self, path: str) -> None:
+        with self._handed_over_lock:
+            self.handed_over.add(path)
+
+    def discard_session(self, session: UploadSession) -> None:
+        self.sessions.pop(session.id, None)
+        if os.path.exists(session.path):
+            os.unlink(session.path)
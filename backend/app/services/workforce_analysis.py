@@ -4,8 +4,9 @@ from typing import Dict, List, Tuple, Optional
 from sqlalchemy.orm import Session
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-from ..models.candidate import Candidate
 from ..models.job import Job
+from ..services.bitmap_index import And, Or, candidate_bitmaps, parse_predicate, predicate
+from ..services.candidate_snapshot import CandidateRecord, candidate_snapshot
 from ..services.skills_assessment import SkillsAssessmentService
 from ..schemas.analysis import WorkforceDistributionRequest, CandidateMatch
 
@@ -44,10 +45,14 @@ class WorkforceAnalysisService:
         """
         Analyze workforce distribution and find optimal candidate matches
         """
-        # Get all available candidates
-        candidates = db.query(Candidate).filter(Candidate.is_available == True).all()
-        
-        if not candidates:
+        # Candidate pool from the bitmap index: available, with at least one
+        # required skill (with none, the skill part of the match is 0 and the
+        # score stays under threshold), and meeting the request's condition
+        condition = parse_predicate(request.candidate_filter) if request.candidate_filter else None
+        is_available = predicate("is_available", True)
+        total_candidates = len(candidate_bitmaps.match(db, is_available))
+        
+        if not total_candidates:
             return {
                 "department": request.department or "General",
                 "total_candidates": 0,
@@ -57,12 +62,21 @@ class WorkforceAnalysisService:
                 "analysis_date": pd.Timestamp.now()
             }
         
+        has_skill = Or(tuple(predicate("skills", skill) for skill in request.required_skills))
+        pool = candidate_bitmaps.match(db, And((is_available, has_skill) + ((condition,) if condition is not None else ())))
+        # Availability is rechecked on the snapshot, which has every change
+        # the index may not have seen yet from another process
+        candidates = [
+            candidate for candidate in candidate_snapshot.current(db).records(pool.to_array())
+            if candidate.is_available
+        ]
+        
+        # Create a mock job for matching
+        mock_job = self._create_mock_job_from_request(request)
+        
         # Find matching candidates
         matched_candidates = []
         for candidate in candidates:
-            # Create a mock job for matching
-            mock_job = self._create_mock_job_from_request(request)
-            
             # Get match score
             match_score, skill_matches = self.skills_service.match_candidate_to_job(candidate, mock_job)
             
@@ -98,7 +112,7 @@ class WorkforceAnalysisService:
         
         return {
             "department": request.department or "General",
-            "total_candidates": len(candidates),
+            "total_candidates": total_candidates,
             "matched_candidates": matched_candidates,
             "distribution_score": distribution_score,
             "recommendations": recommendations,
@@ -148,7 +162,7 @@ class WorkforceAnalysisService:
         """
         Analyze skills gaps across multiple candidates
         """
-        candidates = db.query(Candidate).filter(Candidate.id.in_(candidate_ids)).all()
+        candidates = candidate_snapshot.current(db).records(candidate_ids)
         
         if not candidates:
             return {
@@ -236,7 +250,7 @@ class WorkforceAnalysisService:
         }
         return level_mapping.get(level, 5)
     
-    def _check_salary_fit(self, candidate: Candidate, budget_range: Optional[Dict]) -> bool:
+    def _check_salary_fit(self, candidate: CandidateRecord, budget_range: Optional[Dict]) -> bool:
         """
         Check if candidate's salary expectations fit the budget
         """
@@ -248,7 +262,7 @@ class WorkforceAnalysisService:
         
         return min_budget <= candidate.expected_salary <= max_budget
     
-    def _check_location_fit(self, candidate: Candidate, required_location: Optional[str]) -> bool:
+    def _check_location_fit(self, candidate: CandidateRecord, required_location: Optional[str]) -> bool:
         """
         Check if candidate's location preferences match requirements
         """
@@ -260,7 +274,7 @@ class WorkforceAnalysisService:
         
         return required_location in candidate.preferred_locations
     
-    def _check_experience_fit(self, candidate: Candidate, required_level: str) -> bool:
+    def _check_experience_fit(self, candidate: CandidateRecord, required_level: str) -> bool:
         """
         Check if candidate's experience matches required level
         """
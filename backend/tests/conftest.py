@@ -0,0 +1,105 @@
+import os
+import random
+import shutil
+import tempfile
+
+# The app binds its engines at import time, so point it at a throwaway
+# SQLite file before anything imports it
+_database_dir = tempfile.mkdtemp(prefix="workforce-ai-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/test.db"
+os.environ["FILE_CACHE_DIR"] = os.path.join(_database_dir, "file_cache")
+for _name in ("ASYNC_DATABASE_URL", "READ_DATABASE_URL", "ASYNC_READ_DATABASE_URL"):
+    os.environ.pop(_name, None)
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.candidate import Candidate
+from app.models.job import Job
+
+SKILLS = ["Python", "SQL", "JavaScript", "Machine Learning", "Project Management", "Data Analysis"]
+EDUCATION_LEVELS = ["High School", "Bachelor", "Master", "PhD"]
+STATUSES = ["Active", "Hired", "On Hold"]
+DEPARTMENTS = ["Engineering", "Data Science", "Marketing"]
+LEVELS = ["Junior", "Mid", "Senior", "Lead"]
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_database_dir, ignore_errors=True)
+
+def _sample_candidate_rows(seed: int = 20261019, count: int = 200):
+    """
+    Candidate attributes with seeded random values, the same on every call
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "first_name": f"Candidate{i}",
+            "last_name": rng.choice(["Smith", "Jones", "Garcia", "Chen"]),
+            "email": f"candidate{i}@example.com",
+            "current_position": rng.choice(["Engineer", "Analyst", "Manager", None]),
+            "years_experience": rng.randint(0, 20),
+            "education_level": rng.choice(EDUCATION_LEVELS),
+            "skills": {skill: rng.randint(1, 10) for skill in rng.sample(SKILLS, rng.randint(0, 4))},
+            "overall_score": rng.choice([None, round(rng.random(), 3)]),
+            "expected_salary": rng.choice([None, rng.randint(40, 200) * 1000]),
+            "preferred_locations": rng.sample(["Remote", "New York", "London"], rng.randint(0, 2)),
+            "preferred_departments": rng.sample(DEPARTMENTS, rng.randint(0, 2)),
+            "preferred_work_type": rng.choice(["Full-time", "Contract", "Remote"]),
+            "is_available": rng.random() < 0.7,
+            "status": rng.choice(STATUSES)
+        }
+        for i in range(count)
+    ]
+
+def _sample_jobs(rng: random.Random, count: int):
+    for i in range(count):
+        min_salary = rng.randint(40, 150) * 1000
+        yield Job(
+            title=f"Job {i}",
+            department=rng.choice(DEPARTMENTS),
+            level=rng.choice(LEVELS),
+            min_salary=min_salary,
+            max_salary=min_salary + rng.randint(5, 80) * 1000,
+            required_skills=rng.sample(SKILLS, rng.randint(1, 3)),
+            experience_years=rng.randint(0, 10),
+            education_level=rng.choice(EDUCATION_LEVELS),
+            description="Sample job used by the test suite",
+            responsibilities=["Deliver"],
+            location=rng.choice(["Remote", "New York", "London"]),
+            is_active=rng.random() < 0.75
+        )
+
+@pytest.fixture(scope="session")
+def candidate_rows():
+    """
+    Attributes of the sample candidates, for seeding other databases
+    """
+    return _sample_candidate_rows()
+
+@pytest.fixture(scope="session")
+def sample_data(candidate_rows):
+    """
+    Candidates and jobs with seeded random attributes, written once per run
+    """
+    db = SessionLocal()
+    try:
+        db.add_all(Candidate(**row) for row in candidate_rows)
+        db.add_all(_sample_jobs(random.Random(20261019), 60))
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture(scope="session")
+def client(sample_data):
+    # Not entered as a context manager, so the startup warm-ups do not run
+    # in background threads while tests inspect the queries
+    return TestClient(app)
+
+@pytest.fixture
+def db(sample_data):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
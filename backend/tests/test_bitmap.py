@@ -0,0 +1,90 @@
+"""
+The compressed Bitmap against Python sets, across container kinds.
+"""
+import random
+import numpy as np
+import pytest
+from app.core.bitmap import ARRAY_MAX_SIZE, Bitmap
+
+def random_ids(seed: int, count: int, high_keys=(0,)) -> set:
+    """count distinct ids spread over the 16-bit high keys given"""
+    positions = random.Random(seed).sample(range(len(high_keys) << 16), count)
+    return {(high_keys[position >> 16] << 16) | (position & 0xFFFF) for position in positions}
+
+def kinds(bitmap: Bitmap) -> dict:
+    """Each container's kind, which must follow from its cardinality"""
+    result = {}
+    for high, container in bitmap._containers.items():
+        dense = container.dtype == np.uint8
+        cardinality = int(np.unpackbits(container).sum()) if dense else len(container)
+        assert cardinality > 0, f"Empty container kept for high key {high}"
+        assert dense == (cardinality > ARRAY_MAX_SIZE), f"{cardinality} ids held as {'bitset' if dense else 'array'}"
+        result[high] = "bitset" if dense else "array"
+    return result
+
+SPARSE = random_ids(1, 300)
+DENSE = random_ids(2, 30000)
+AT_THRESHOLD = random_ids(3, ARRAY_MAX_SIZE)
+OVER_THRESHOLD = random_ids(4, ARRAY_MAX_SIZE + 1)
+# Containers of both kinds, under high keys the other operand may not have
+MIXED = random_ids(5, 500, high_keys=(0, 3)) | random_ids(6, 20000, high_keys=(1,)) | random_ids(7, 40, high_keys=(7,))
+
+def test_container_kind_follows_the_threshold():
+    assert kinds(Bitmap.from_ids(AT_THRESHOLD)) == {0: "array"}
+    assert kinds(Bitmap.from_ids(OVER_THRESHOLD)) == {0: "bitset"}
+    assert kinds(Bitmap.from_ids(MIXED)) == {0: "array", 1: "bitset", 3: "array", 7: "array"}
+    assert kinds(Bitmap.from_ids(np.array(sorted(DENSE)))) == {0: "bitset"}
+
+@pytest.mark.parametrize("ids", [set(), SPARSE, DENSE, AT_THRESHOLD, OVER_THRESHOLD, MIXED],
+                         ids=["empty", "sparse", "dense", "at-threshold", "over-threshold", "mixed"])
+def test_membership_and_order(ids):
+    bitmap = Bitmap.from_ids(ids)
+    assert bitmap.to_array().tolist() == sorted(ids)
+    assert (len(bitmap), bool(bitmap)) == (len(ids), bool(ids))
+    probes = sorted(ids)[:50] + [0, 1, 65535, 65536, 1 << 20]
+    assert [probe in bitmap for probe in probes] == [probe in ids for probe in probes]
+    for offset, limit in ((0, 10), (len(ids) // 2, 7000), (len(ids) - 3, 10), (len(ids) + 5, 10)):
+        assert bitmap.page(offset, limit).tolist() == sorted(ids)[offset:offset + limit]
+
+PAIRS = {
+    "sparse-sparse": (SPARSE, random_ids(11, 400)),
+    "sparse-dense": (SPARSE | set(list(DENSE)[:100]), DENSE),
+    "dense-sparse": (DENSE, SPARSE | set(list(DENSE)[:100])),
+    "dense-dense": (DENSE, random_ids(12, 25000)),
+    # Two arrays whose union, and a bitset and array whose difference, cross the threshold
+    "arrays-to-bitset": (random_ids(13, 3000), random_ids(14, 3000)),
+    "bitset-to-array": (OVER_THRESHOLD, set(list(OVER_THRESHOLD)[:10])),
+    "mixed": (MIXED, random_ids(15, 9000, high_keys=(0, 1, 2))),
+    "disjoint-keys": (random_ids(16, 100, high_keys=(4,)), random_ids(17, 100, high_keys=(5,))),
+    "empty": (MIXED, set())
+}
+
+@pytest.mark.parametrize("a, b", PAIRS.values(), ids=PAIRS.keys())
+def test_set_operations_match_python_sets(a, b):
+    left, right = Bitmap.from_ids(a), Bitmap.from_ids(b)
+    for result, expected in (
+        (left & right, a & b), (right & left, a & b),
+        (left | right, a | b), (right | left, a | b),
+        (left - right, a - b), (right - left, b - a)
+    ):
+        assert result.to_array().tolist() == sorted(expected)
+        kinds(result)
+    assert left.intersection_len(right) == right.intersection_len(left) == len(a & b)
+    # The operands are left as they were
+    assert left.to_array().tolist() == sorted(a)
+
+def test_single_ids_cross_the_threshold_both_ways():
+    ids = sorted(AT_THRESHOLD)
+    bitmap = Bitmap.from_ids(ids)
+    added = max(set(range(1 << 16)) - AT_THRESHOLD)
+    grown = bitmap.with_id(added)
+    assert kinds(grown) == {0: "bitset"} and kinds(bitmap) == {0: "array"}
+    assert grown.to_array().tolist() == sorted(AT_THRESHOLD | {added})
+
+    shrunk = grown.without_id(ids[0])
+    assert kinds(shrunk) == {0: "array"}
+    assert shrunk.to_array().tolist() == sorted(set(ids[1:]) | {added})
+
+    single = Bitmap().with_id(5 << 16)
+    assert single.to_array().tolist() == [5 << 16]
+    assert not single.without_id(5 << 16) and single.without_id(6 << 16) is single
@@ -0,0 +1,101 @@
+"""
+Parsing AND/OR/NOT predicates, and evaluating them on the bitmap index
+against Python sets of the same rows.
+"""
+import random
+from types import SimpleNamespace
+import pytest
+from app.services.bitmap_index import (
+    And, CandidateBitmapIndex, InvalidPredicateError, Not, Or, Predicate, _field_values, parse_predicate
+)
+
+def sample_rows(seed: int = 20261019):
+    """Dense ids under one 16-bit high key, sparse ones under another"""
+    rng = random.Random(seed)
+    ids = list(range(1, 9001)) + rng.sample(range(2 << 16, 3 << 16), 300)
+    return [
+        SimpleNamespace(
+            id=candidate_id,
+            is_available=rng.random() < 0.7,
+            status=rng.choice(["Active", "Active", "Hired", "On Hold"]),
+            education_level=rng.choice(["Bachelor", "Master", None]),
+            preferred_work_type=rng.choice(["Full-time", "Contract", None]),
+            preferred_departments=rng.sample(["Engineering", "Sales", "HR"], rng.randint(0, 2)),
+            years_experience=rng.choice([None, rng.uniform(0, 30)]),
+            skills={skill: rng.randint(1, 10) for skill in ("Python", "SQL", "Go") if rng.random() < 0.5} | (
+                {"Rust": 5} if rng.random() < 0.01 else {}
+            )
+        )
+        for candidate_id in ids
+    ]
+
+ROWS = sample_rows()
+
+def having(field: str, value) -> set:
+    return {row.id for row in ROWS if value in _field_values(row)[field]}
+
+EVERYONE = {row.id for row in ROWS}
+PYTHON, SQL, GO, RUST = (having("skills", skill) for skill in ("Python", "SQL", "Go", "Rust"))
+ACTIVE, HIRED, ON_HOLD = (having("status", status) for status in ("Active", "Hired", "On Hold"))
+
+@pytest.fixture(scope="module")
+def state():
+    index = CandidateBitmapIndex()
+    index._changes.load = lambda db: ROWS
+    return index._build(None)
+
+@pytest.mark.parametrize("text, expected", [
+    pytest.param("skills:Python OR skills:SQL AND status:Active", PYTHON | (SQL & ACTIVE), id="and-before-or"),
+    pytest.param("(skills:Python OR skills:SQL) AND status:Active", (PYTHON | SQL) & ACTIVE, id="parentheses"),
+    pytest.param("NOT status:Hired", EVERYONE - HIRED, id="top-level-not"),
+    pytest.param("NOT skills:Python AND skills:SQL", (EVERYONE - PYTHON) & SQL, id="not-before-and"),
+    pytest.param("NOT (skills:Python AND skills:SQL)", EVERYONE - (PYTHON & SQL), id="not-of-group"),
+    pytest.param("NOT skills:Python AND NOT skills:SQL", EVERYONE - PYTHON - SQL, id="only-nots"),
+    pytest.param("NOT NOT skills:Rust", RUST, id="double-not"),
+    pytest.param(
+        'skills:Go AND NOT skills:Rust AND NOT status:"On Hold"', GO - RUST - ON_HOLD, id="and-not-quoted"
+    ),
+    pytest.param(
+        "((skills:Go or skills:Rust) and not (status:Active or status:Hired)) or is_available:FALSE",
+        ((GO | RUST) - ACTIVE - HIRED) | having("is_available", False), id="nested-lowercase"
+    ),
+    pytest.param("experience:10-20 AND NOT experience:20+", having("experience", "10-20"), id="buckets"),
+    pytest.param("skills:Fortran OR NOT skills:Fortran", EVERYONE, id="unknown-value"),
+])
+def test_evaluate_matches_python_sets(state, text, expected):
+    assert state.evaluate(parse_predicate(text)).to_array().tolist() == sorted(expected)
+
+def test_sample_rows_exercise_both_container_kinds(state):
+    # Guards the comparison above against passing on trivial sets
+    assert 0 < len(RUST) < 200 < len(PYTHON & ACTIVE)
+    kinds = {container.dtype.name for bitmap in state.bitmaps["skills"].values() for container in bitmap._containers.values()}
+    assert kinds == {"uint8", "uint16"}
+
+def test_precedence_and_grouping():
+    python, sql, active = Predicate("skills", "Python"), Predicate("skills", "SQL"), Predicate("status", "Active")
+    assert parse_predicate("skills:Python OR skills:SQL AND status:Active") == Or((python, And((sql, active))))
+    assert parse_predicate("(skills:Python OR skills:SQL) AND status:Active") == And((Or((python, sql)), active))
+    assert parse_predicate("NOT skills:Python AND skills:SQL") == And((Not(python), sql))
+    assert parse_predicate("  NOT  (skills:Python)  ") == Not(python)
+    assert parse_predicate('status:"On Hold"') == Predicate("status", "On Hold")
+    assert parse_predicate("is_available:True") == Predicate("is_available", True)
+
+@pytest.mark.parametrize("text", [
+    "",
+    "skills:Python AND",
+    "AND skills:Python",
+    "skills:Python OR OR status:Active",
+    "(skills:Python",
+    "skills:Python)",
+    "()",
+    "NOT",
+    "Python",
+    "skills:Python status:Active",
+    'status:"On Hold',
+    "salary:100",
+    "is_available:maybe",
+    "experience:7-9",
+])
+def test_malformed_predicates_are_refused(text):
+    with pytest.raises(InvalidPredicateError):
+        parse_predicate(text)
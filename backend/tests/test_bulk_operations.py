@@ -0,0 +1,110 @@
+"""
+Bulk candidate upserts and job inserts.
+"""
+import threading
+import time
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.models.candidate import Candidate
+from app.services.bulk_operations import BulkOperationsService
+from app.services.candidate_changes import CandidateChangeFeed
+from app.services.candidate_snapshot import candidate_snapshot
+
+API = settings.api_v1_prefix
+
+def candidate(email: str, **fields):
+    return {
+        "first_name": "Bulk", "last_name": "Test", "email": email,
+        "years_experience": 3, "education_level": "Bachelor", "skills": {"Python": 5},
+        **fields
+    }
+
+def test_upsert_keeps_fields_the_item_leaves_out(client, db):
+    created = client.post(f"{API}/candidates/bulk", json=[candidate(
+        "bulk.keep@example.com", phone="+1-555-0100", salary_currency="EUR",
+        is_available=False, preferred_locations=["London"]
+    )])
+    assert created.status_code == 200, created.text
+    assert [r["status"] for r in created.json()["results"]] == ["created"]
+    candidate_id = created.json()["results"][0]["id"]
+
+    row = db.get(Candidate, candidate_id)
+    row.status = "Hired"
+    db.commit()
+
+    updated = client.post(f"{API}/candidates/bulk", json=[
+        candidate("bulk.keep@example.com", skills={"Python": 9, "SQL": 7}),
+        candidate("bulk.new@example.com")
+    ])
+    assert updated.status_code == 200, updated.text
+    assert [r["status"] for r in updated.json()["results"]] == ["updated", "created"]
+    assert updated.json()["results"][0]["id"] == candidate_id
+
+    db.expire_all()
+    row = db.get(Candidate, candidate_id)
+    assert (row.phone, row.salary_currency, row.is_available, row.preferred_locations, row.status) == (
+        "+1-555-0100", "EUR", False, ["London"], "Hired"
+    )
+    assert row.skills == {"Python": 9, "SQL": 7}
+    new = db.scalar(select(Candidate).where(Candidate.email == "bulk.new@example.com"))
+    assert (new.status, new.is_available, new.salary_currency) == ("Active", True, "USD")
+
+def test_bulk_reports_invalid_items_and_keeps_the_rest(client):
+    response = client.post(
+        f"{API}/candidates/bulk",
+        content=b'{"first_name": "x"}\nnot json\n' + (
+            b'{"first_name": "Bulk", "last_name": "Test", "email": "bulk.ndjson@example.com",'
+            b' "years_experience": 1, "education_level": "Master", "skills": {}}\n'
+        ),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert [r["status"] for r in body["results"]] == ["error", "error", "created"]
+
+def test_bulk_jobs_reject_inverted_salary_ranges(client):
+    job = {
+        "title": "Bulk Job", "department": "Engineering", "level": "Mid", "min_salary": 50000,
+        "max_salary": 90000, "required_skills": ["Python"], "experience_years": 2,
+        "education_level": "Bachelor", "description": "Bulk inserted job", "responsibilities": ["Ship"],
+        "location": "Remote"
+    }
+    response = client.post(f"{API}/jobs/bulk", json=[job, dict(job, min_salary=95000)])
+    assert response.status_code == 200, response.text
+    assert [r["status"] for r in response.json()["results"]] == ["created", "error"]
+
+def test_reassessment_refreshes_the_analysis_snapshot(db, monkeypatch):
+    candidate_snapshot.current(db)
+    db.commit()
+    # Whatever the change feed would pick up, the reassessment must show
+    monkeypatch.setattr(CandidateChangeFeed, "read", lambda self, db: (db.scalar(select(func.count(Candidate.id))), []))
+
+    result = BulkOperationsService().reassess_candidates(db, chunk_size=50)
+    assert result["candidates_processed"] > 0
+
+    by_score = select(Candidate.id).order_by(Candidate.overall_score.desc(), Candidate.id).limit(10)
+    assert [record.id for record in candidate_snapshot.current(db).top_scored(10)] == db.scalars(by_score).all()
+
+def test_reassessment_runs_in_chunks_and_in_the_background(client, db):
+    total = db.scalar(select(func.count(Candidate.id)))
+    response = client.post(f"{API}/candidates/bulk/assess", params={"background": False, "chunk_size": 64})
+    assert response.status_code == 200, response.text
+    assert (response.json()["candidates_processed"], response.json()["chunks"]) == (total, -(-total // 64))
+    assert db.scalar(select(func.count(Candidate.id)).where(Candidate.overall_score.is_(None))) == 0
+
+    started = client.post(f"{API}/candidates/bulk/assess", params={"chunk_size": 100}).json()
+    deadline = time.monotonic() + 30
+    status = client.get(started["status_url"]).json()
+    while status["status"] not in ("completed", "failed", "cancelled") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        status = client.get(started["status_url"]).json()
+    assert status["status"] == "completed", status
+    assert (status["candidates_processed"], status["percent"]) == (total, 100.0)
+    assert client.get(f"{API}/candidates/bulk/assess/missing").status_code == 404
+
+def test_cancelled_reassessment_stops_before_the_next_chunk(db):
+    cancel = threading.Event()
+    cancel.set()
+    result = BulkOperationsService().reassess_candidates(db, chunk_size=10, cancel_event=cancel)
+    assert (result["cancelled"], result["candidates_processed"]) == (True, 0)
@@ -0,0 +1,163 @@
+"""
+The in-process candidate indexes see writes made outside this process.
+
+Rows are changed with raw SQL on a separate connection, as another worker
+or a script would, and must show on the next use.
+"""
+from sqlalchemy import event, select, text
+from app.core import database
+from app.core.config import settings
+from app.models.candidate import Candidate
+from app.services.bitmap_index import CandidateBitmapIndex, Predicate
+from app.services.candidate_changes import CandidateChangeFeed
+from app.services.candidate_snapshot import CandidateSnapshotStore
+
+SAME_SECOND = "(SELECT max(coalesce(updated_at, created_at)) FROM candidates)"
+NEXT_SECOND = "(SELECT datetime(max(coalesce(updated_at, created_at)), '+1 second') FROM candidates)"
+
+def write_elsewhere(statement: str, **parameters) -> None:
+    with database.engine.begin() as conn:
+        conn.execute(text(statement), parameters)
+
+def copy_elsewhere(candidate_id: int) -> int:
+    """Insert a copy of a candidate stamped long ago, as a replica catching up would"""
+    columns = (
+        "first_name, last_name, phone, current_position, current_company, years_experience, education_level, "
+        "skills, skill_scores, overall_score, expected_salary, salary_currency, preferred_locations, "
+        "preferred_work_type, preferred_departments, available_from, is_available, status"
+    )
+    with database.engine.begin() as conn:
+        return conn.execute(text(
+            f"INSERT INTO candidates (email, created_at, {columns}) "
+            f"SELECT 'copy-' || email, '2000-01-01 00:00:00', {columns} FROM candidates WHERE id = :id RETURNING id"
+        ), {"id": candidate_id}).scalar()
+
+def test_bitmap_index_reads_other_processes_writes(db):
+    index = CandidateBitmapIndex(changes_interval_seconds=0)
+    before = index.everyone(db)
+    assert not index.match(db, Predicate("skills", "Fortran"))
+    db.commit()
+
+    candidate_id = int(before.page(0, 1)[0])
+    write_elsewhere(
+        "UPDATE candidates SET skills = json_set(skills, '$.Fortran', 4), status = 'On Hold', "
+        f"updated_at = {NEXT_SECOND} WHERE id = :id",
+        id=candidate_id
+    )
+    assert index.match(db, Predicate("skills", "Fortran")).to_array().tolist() == [candidate_id]
+    assert candidate_id in index.match(db, Predicate("status", "On Hold"))
+    db.commit()
+
+    # Older than the latest change read, so only the count shows it
+    copy_id = copy_elsewhere(candidate_id)
+    assert index.match(db, Predicate("skills", "Fortran")).to_array().tolist() == [candidate_id, copy_id]
+    db.commit()
+
+    write_elsewhere("DELETE FROM candidates WHERE id = :id", id=copy_id)
+    assert index.match(db, Predicate("skills", "Fortran")).to_array().tolist() == [candidate_id]
+    assert len(index.everyone(db)) == len(before)
+
+def test_candidate_snapshot_reads_other_processes_writes(db):
+    store = CandidateSnapshotStore(changes_interval_seconds=0)
+    by_score = select(Candidate.id).where(Candidate.overall_score.isnot(None)).order_by(
+        Candidate.overall_score.desc(), Candidate.id
+    )
+    assert [record.id for record in store.current(db).top_scored(10)] == db.scalars(by_score.limit(10)).all()
+    db.commit()
+
+    candidate_id = db.scalars(by_score).all()[-1]
+    write_elsewhere(
+        "UPDATE candidates SET overall_score = 2, current_position = 'Director', "
+        f"updated_at = {NEXT_SECOND} WHERE id = :id",
+        id=candidate_id
+    )
+    top = store.current(db).top_scored(1)[0]
+    assert (top.id, top.overall_score, top.current_position) == (candidate_id, 2.0, "Director")
+    db.commit()
+
+    copy_id = copy_elsewhere(candidate_id)
+    assert {record.id for record in store.current(db).top_scored(2)} == {candidate_id, copy_id}
+    db.commit()
+
+    write_elsewhere("DELETE FROM candidates WHERE id = :id", id=copy_id)
+    assert copy_id not in [record.id for record in store.current(db).top_scored(1000)]
+
+def test_writes_in_the_second_already_read_are_seen(db):
+    index = CandidateBitmapIndex(changes_interval_seconds=0)
+    store = CandidateSnapshotStore(changes_interval_seconds=0)
+    index.everyone(db)
+    store.current(db)
+    db.commit()
+
+    # Stamped like the latest change the index and snapshot have read, as a
+    # write landing in that same second from another process would be. A row
+    # changed twice within one second is not told apart, so these are rows
+    # last changed earlier.
+    first, second = db.scalars(text(
+        f"SELECT id FROM candidates WHERE coalesce(updated_at, created_at) < {SAME_SECOND} ORDER BY id LIMIT 2"
+    )).all()
+    db.commit()
+    for candidate_id in (first, second):
+        write_elsewhere(
+            f"UPDATE candidates SET skills = json_set(skills, '$.COBOL', 3), overall_score = 30, "
+            f"updated_at = {SAME_SECOND} WHERE id = :id",
+            id=candidate_id
+        )
+        assert candidate_id in index.match(db, Predicate("skills", "COBOL"))
+        assert [record.id for record in store.current(db).top_scored(1)] == [first]
+        db.commit()
+    assert index.match(db, Predicate("skills", "COBOL")).to_array().tolist() == [first, second]
+    assert [record.overall_score for record in store.current(db).top_scored(2)] == [30.0, 30.0]
+
+def test_changes_are_read_at_most_once_per_interval(db, monkeypatch):
+    index = CandidateBitmapIndex(changes_interval_seconds=60)
+    store = CandidateSnapshotStore(changes_interval_seconds=60)
+    candidate_id = int(index.everyone(db).to_array()[-1])
+    store.current(db)
+    db.commit()
+
+    write_elsewhere(
+        "UPDATE candidates SET skills = json_set(skills, '$.Ada', 2), overall_score = 40, "
+        f"updated_at = {NEXT_SECOND} WHERE id = :id",
+        id=candidate_id
+    )
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert not index.match(db, Predicate("skills", "Ada"))
+    assert store.current(db).top_scored(1)[0].id != candidate_id
+    assert statements == []
+
+    # Read once due, without holding the lock a rebuild takes
+    build_lock_held = []
+    read = CandidateChangeFeed.read
+    monkeypatch.setattr(CandidateChangeFeed, "read", lambda feed, db: (
+        build_lock_held.append(index._build_lock.locked()) or read(feed, db)
+    ))
+    index._changes.interval_seconds = store._changes.interval_seconds = 0
+    assert index.match(db, Predicate("skills", "Ada")).to_array().tolist() == [candidate_id]
+    assert store.current(db).top_scored(1)[0].id == candidate_id
+    assert build_lock_held == [False, False]
+
+def test_lower_count_after_a_local_write_is_replica_lag(db, monkeypatch):
+    index = CandidateBitmapIndex(changes_interval_seconds=0)
+    store = CandidateSnapshotStore(changes_interval_seconds=0)
+    total = len(index.everyone(db))
+    assert len(store.current(db)) == total
+    db.commit()
+
+    # Written here, but not on the replica the index and snapshot read from yet
+    written = Candidate(
+        id=int(index.everyone(db).to_array().max()) + 1000, first_name="Local", last_name="Write",
+        email="local.write@example.com", years_experience=4, education_level="Master",
+        skills={"Haskell": 6}, overall_score=50, is_available=True, status="Active"
+    )
+    index.update(written)
+    store.update(written)
+    assert index.match(db, Predicate("skills", "Haskell")).to_array().tolist() == [written.id]
+    assert store.current(db).top_scored(1)[0].id == written.id
+    assert len(index.everyone(db)) == len(store.current(db)) == total + 1
+
+    # Once the replica should have caught up, the count is believed
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 0)
+    assert not index.match(db, Predicate("skills", "Haskell"))
+    assert len(store.current(db)) == total
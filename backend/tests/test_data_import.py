@@ -0,0 +1,328 @@
+"""
+Importing HR files through DataImportService.
+"""
+import io
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import pandas as pd
+import pyarrow.feather as pyarrow_feather
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import Base
+from app.models.candidate import Candidate
+from app.models.import_record import ImportedFile, ImportedRow
+from app.models.job import Job
+from app.services import file_formats
+from app.services.data_import import DataImportService
+from app.services.file_formats import read_chunks
+
+API = f"{settings.api_v1_prefix}/data-import"
+HR_CSV = Path(__file__).resolve().parents[2] / "WA_Fn-UseC_-HR-Employee-Attrition.csv"
+
+def hr_rows(tmp_path, name: str, start: int, stop: int) -> Path:
+    path = tmp_path / name
+    pd.read_csv(HR_CSV).iloc[start:stop].to_csv(path, index=False)
+    return path
+
+def wait_for_import(client, status_url: str):
+    deadline = time.monotonic() + 30
+    status = client.get(status_url).json()
+    while status["status"] in ("queued", "running", "cancelling") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        status = client.get(status_url).json()
+    return status
+
+def test_import_in_small_chunks(db, tmp_path):
+    # Chunks of ten hold only some job roles, so the mapped roles of a chunk
+    # can be unique, which keeps a categorical JobRole categorical
+    path = hr_rows(tmp_path, "small_chunks.csv", 300, 360)
+    result = DataImportService().import_csv_data(str(path), db, chunk_size=10, workers=1)
+    assert result["success"], result
+    # Employees who have left are not turned into candidates
+    assert result["candidates_created"] == (pd.read_csv(path)["Attrition"] == "No").sum()
+
+    positions = set(db.scalars(select(Candidate.current_position).where(
+        Candidate.email.in_(DataImportService()._employee_emails(pd.read_csv(path)).tolist())
+    )))
+    assert positions and "Sales Executive" not in positions
+
+def test_import_commits_and_reports_each_chunk(db, tmp_path):
+    path = hr_rows(tmp_path, "chunked.csv", 400, 450)
+    employees = pd.read_csv(path)
+    progress = []
+    result = DataImportService().import_csv_data(str(path), db, chunk_size=20, workers=1, progress_callback=progress.append)
+    assert result["success"], result
+
+    assert [update["rows_read"] for update in progress] == [20, 40, 50]
+    assert progress[-1]["rows_inserted"] == result["candidates_created"] == (employees["Attrition"] == "No").sum()
+    emails = DataImportService()._employee_emails(employees).tolist()
+    assert db.scalar(select(func.count(Candidate.id)).where(Candidate.email.in_(emails))) == result["candidates_created"]
+
+def test_background_import_reports_progress(client, tmp_path):
+    path = hr_rows(tmp_path, "background.csv", 500, 540)
+    with open(path, "rb") as f:
+        started = client.post(f"{API}/csv/upload", params={"chunk_size": 15}, files={"file": ("background.csv", f, "text/csv")})
+    assert started.status_code == 200, started.text
+    assert started.json()["import_id"] in [job["import_id"] for job in client.get(f"{API}/imports").json()]
+
+    status = wait_for_import(client, started.json()["status_url"])
+    assert status["status"] == "completed", status
+    assert (status["total_rows"], status["rows_read"]) == (40, 40)
+    assert status["result"]["candidates_created"] == (pd.read_csv(path)["Attrition"] == "No").sum()
+    assert client.get(f"{API}/imports/missing").status_code == 404
+
+def test_cancelled_import_keeps_committed_chunks(db, tmp_path):
+    path = hr_rows(tmp_path, "cancelled.csv", 540, 580)
+    cancel = threading.Event()
+    # Cancelled once the first chunk is committed, so the second is rolled back
+    result = DataImportService().import_csv_data(
+        str(path), db, chunk_size=10, workers=1, progress_callback=lambda progress: cancel.set(), cancel_event=cancel
+    )
+    assert (result["success"], result.get("cancelled"), result["total_records"]) == (False, True, 10)
+
+    emails = DataImportService()._employee_emails(pd.read_csv(path)).tolist()
+    assert db.scalar(select(func.count(Candidate.id)).where(Candidate.email.in_(emails))) == result["candidates_created"]
+    assert result["candidates_created"] == (pd.read_csv(path).iloc[:10]["Attrition"] == "No").sum()
+
+def test_reimports_only_convert_what_changed(db, tmp_path):
+    path = hr_rows(tmp_path, "dedupe.csv", 600, 640)
+    service = DataImportService()
+    first = service.import_csv_data(str(path), db, workers=1)
+    assert first["success"] and first["candidates_created"] > 0, first
+
+    again = service.import_csv_data(str(path), db, workers=1)
+    assert (again["skipped"], again["duplicate_of"]) == (True, first["file_id"])
+
+    # Two raises and one employee who has since left
+    employees = pd.read_csv(path)
+    active = employees.index[employees["Attrition"] == "No"]
+    employees.loc[active[:2], "MonthlyIncome"] += 1000
+    employees.loc[active[2], "Attrition"] = "Yes"
+    employees.to_csv(path, index=False)
+    changed = service.import_csv_data(str(path), db, workers=1)
+    assert changed["success"], changed
+    assert (changed["candidates_created"], changed["candidates_updated"], changed["rows_unchanged"]) == (0, 3, 37)
+
+    left = service._employee_emails(employees.loc[[active[2]]]).item()
+    assert db.scalar(select(Candidate.status).where(Candidate.email == left)) != "Active"
+
+def test_rejected_rows_are_reported_with_their_errors(client, tmp_path):
+    employees = pd.read_csv(HR_CSV).iloc[700:740].reset_index(drop=True).astype({"MonthlyIncome": object})
+    employees.loc[2, "MonthlyIncome"] = "abc"
+    employees.loc[11, "Education"] = 9
+    employees.loc[14, "EmployeeNumber"] = employees.loc[13, "EmployeeNumber"]
+    employees.loc[25, ["Attrition", "JobSatisfaction"]] = ["Maybe", None]
+    path = tmp_path / "rejected.csv"
+    employees.to_csv(path, index=False)
+
+    response = client.post(
+        f"{API}/csv/import-from-path", params={"file_path": str(path), "background": False, "chunk_size": 10}
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["rows_rejected"] == 4
+    assert result["candidates_created"] == (employees.drop(index=[2, 11, 14, 25])["Attrition"] == "No").sum()
+
+    report = client.get(result["errors_url"])
+    assert report.status_code == 200, report.text
+    rows = pd.read_csv(io.StringIO(report.text))
+    # Rows are numbered from the first data row of the file, across chunks
+    assert rows[["row", "errors"]].values.tolist() == [
+        [3, "MonthlyIncome is not a number"],
+        [12, "Education must be between 1 and 5"],
+        [15, "Duplicate EmployeeNumber"],
+        [26, "JobSatisfaction is missing; Attrition must be one of Yes, No"]
+    ]
+    assert rows.loc[0, "MonthlyIncome"] == "abc"
+    assert list(rows.columns[:2]) == ["row", "errors"]
+
+def convert_employee_row_by_row(service: DataImportService, row: dict) -> dict:
+    """The importer's original per-row conversion, which the vectorized one must reproduce"""
+    job_role = row['JobRole']
+    adjusted_skills = {}
+    for skill, base_score in service.skills_mapping.get(job_role, {}).items():
+        satisfaction_bonus = (row['JobSatisfaction'] - 2.5) * 0.2
+        performance_bonus = (row['PerformanceRating'] - 2.5) * 0.2
+        adjusted_skills[skill] = max(1, min(10, int(base_score + satisfaction_bonus + performance_bonus)))
+    if row['Education'] >= 4:
+        adjusted_skills['Leadership'] = 7
+        adjusted_skills['Strategic Thinking'] = 6
+    if row['TotalWorkingYears'] > 10:
+        adjusted_skills['Experience'] = 9
+        adjusted_skills['Problem Solving'] = 8
+    return {
+        "first_name": f"Employee{row['EmployeeNumber']}",
+        "last_name": f"From{row['Department']}",
+        "email": f"employee{row['EmployeeNumber']}@company.com",
+        "phone": f"+1-555-{row['EmployeeNumber']:04d}",
+        "current_position": service.job_role_mapping.get(job_role, job_role),
+        "current_company": "Current Company",
+        "years_experience": float(row['TotalWorkingYears']),
+        "education_level": service.education_mapping.get(row['Education'], 'Bachelor'),
+        "skills": adjusted_skills,
+        "expected_salary": float(row['MonthlyIncome'] * 12),
+        "salary_currency": "USD",
+        "preferred_locations": ["Remote", "Current Location"],
+        "preferred_work_type": "Full-time",
+        "preferred_departments": [row['Department']],
+        "is_available": True,
+        "status": "Active"
+    }
+
+@pytest.mark.parametrize("categorical", [False, True], ids=["object", "categorical"])
+def test_vectorized_conversion_matches_row_by_row(categorical):
+    employees = pd.read_csv(HR_CSV)
+    # Edge rows: a role with no skill template, an education level with no
+    # mapping, and satisfaction and performance at both extremes
+    extra = employees.iloc[:3].copy()
+    extra["EmployeeNumber"] = [90001, 90002, 90003]
+    extra["JobRole"] = ["Data Wrangler", "Research Director", "Sales Executive"]
+    extra["Education"] = [2, 6, 5]
+    extra[["JobSatisfaction", "PerformanceRating"]] = [[1, 1], [4, 4], [1, 4]]
+    extra["TotalWorkingYears"] = [0, 11, 10]
+    employees = pd.concat([employees, extra], ignore_index=True)
+    if categorical:
+        employees = employees.astype({"JobRole": "category", "Department": "category"})
+
+    service = DataImportService()
+    converted = service._convert_employees_to_candidates(employees)
+    expected = [
+        convert_employee_row_by_row(service, row)
+        for row in employees.astype({"JobRole": object, "Department": object}).to_dict("records")
+    ]
+
+    assert converted == expected
+    # Same skill key order, so the stored JSON is byte for byte the same
+    assert [list(c["skills"]) for c in converted] == [list(e["skills"]) for e in expected]
+
+def import_into_fresh_database(tmp_path, monkeypatch, path: Path, workers: int = 1, active_only: bool = False):
+    """Import a file into an empty database of its own; returns what it wrote"""
+    name = f"{path.suffix[1:]}_{workers}{'_active' if active_only else ''}"
+    engine = create_engine(f"sqlite:///{tmp_path}/{name}.db")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(settings, "import_errors_dir", str(tmp_path / f"errors_{name}"))
+    db = Session(engine)
+    try:
+        progress = []
+        result = DataImportService().import_csv_data(
+            str(path), db, chunk_size=10, workers=workers, progress_callback=progress.append, active_only=active_only
+        )
+        assert result["success"], result
+        error_file = db.get(ImportedFile, result["file_id"]).error_file
+        report = pd.read_csv(error_file) if error_file else None
+        written = {
+            # Ids follow the order rows were written in
+            "candidates": db.execute(select(
+                Candidate.id, Candidate.email, Candidate.first_name, Candidate.skills, Candidate.expected_salary,
+                Candidate.overall_score, Candidate.status
+            ).order_by(Candidate.id)).all(),
+            "jobs": db.execute(select(Job.id, Job.title, Job.department).order_by(Job.id)).all(),
+            "ledger": db.execute(select(
+                ImportedRow.employee_number, ImportedRow.row_hash, ImportedRow.file_id
+            ).order_by(ImportedRow.employee_number)).all()
+        }
+        return {key: value for key, value in result.items() if key not in ("sha256", "file_name")}, progress, report, written
+    finally:
+        db.close()
+        engine.dispose()
+
+def test_import_with_two_workers_matches_one(tmp_path, monkeypatch):
+    employees = pd.read_csv(HR_CSV).iloc[800:900].reset_index(drop=True)
+    # Employees repeated in the next chunk and within the writer's lookahead,
+    # which only _reject_written_employees catches, in the same chunk, and
+    # far enough apart for the ledger diff to catch
+    for first, again in ((3, 14), (5, 7), (12, 47), (20, 95)):
+        employees.loc[again, "EmployeeNumber"] = employees.loc[first, "EmployeeNumber"]
+    employees.loc[31, "Education"] = 9
+    path = tmp_path / "workers.csv"
+    employees.to_csv(path, index=False)
+
+    single = import_into_fresh_database(tmp_path, monkeypatch, path, workers=1)
+    moved = []
+    reject_written = DataImportService._reject_written_employees
+    def counting_reject_written(service, prepared, db, file_id):
+        checked = reject_written(service, prepared, db, file_id)
+        moved.append(len(checked["rejected"]) - len(prepared["rejected"]))
+        return checked
+    monkeypatch.setattr(DataImportService, "_reject_written_employees", counting_reject_written)
+    pooled = import_into_fresh_database(tmp_path, monkeypatch, path, workers=2)
+
+    result, progress, report, written = single
+    assert result["rows_rejected"] == 5
+    assert sorted(report["row"].tolist()) == [8, 15, 32, 48, 96]
+    assert len(written["candidates"]) == result["candidates_created"] > 0
+    assert pooled[0] == result
+    assert pooled[1] == progress
+    pd.testing.assert_frame_equal(pooled[2], report)
+    assert pooled[3] == written
+    # Some repeats were diffed before their first occurrence was written
+    assert len(moved) == 10 and sum(moved) > 0
+
+def hr_rows_as(tmp_path, fmt: str, start: int, stop: int) -> Path:
+    """HR rows written as CSV, Parquet or an Arrow IPC file"""
+    employees = pd.read_csv(HR_CSV).iloc[start:stop]
+    path = tmp_path / f"employees.{fmt}"
+    if fmt == "csv":
+        employees.to_csv(path, index=False)
+    elif fmt == "parquet":
+        # Small row groups, so the pushed-down filter has groups to skip
+        employees.to_parquet(path, index=False, row_group_size=16)
+    else:
+        pyarrow_feather.write_feather(employees, path, version=2)
+    return path
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_files_read_and_import_like_csv(tmp_path, monkeypatch, fmt):
+    csv_path, path = hr_rows_as(tmp_path, "csv", 900, 980), hr_rows_as(tmp_path, fmt, 900, 980)
+    service = DataImportService()
+    read = lambda path, **options: list(read_chunks(str(path), 7, service.import_columns, dtype=service.import_dtypes, **options))
+
+    # Batches never span row groups, so chunks may be short; rows are still
+    # numbered on across chunks like read_csv numbers them
+    chunks = read(path)
+    assert all(0 < len(chunk) <= 7 for chunk in chunks)
+    expected = pd.concat(read(csv_path))
+    pd.testing.assert_frame_equal(pd.concat(chunks)[expected.columns], expected)
+
+    imported = import_into_fresh_database(tmp_path, monkeypatch, path)
+    from_csv = import_into_fresh_database(tmp_path, monkeypatch, csv_path)
+    assert imported[0] == from_csv[0] and imported[0]["candidates_created"] > 0
+    assert imported[3] == from_csv[3]
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_active_only_is_pushed_down_to_the_scan(tmp_path, monkeypatch, fmt):
+    path = hr_rows_as(tmp_path, fmt, 900, 980)
+    active = (pd.read_csv(HR_CSV).iloc[900:980]["Attrition"] == "No").sum()
+    filters = []
+    open_dataset = file_formats._open_dataset
+    def recording_open_dataset(path, fmt):
+        dataset = open_dataset(path, fmt)
+        to_batches = dataset.to_batches
+        return SimpleNamespace(**{
+            name: getattr(dataset, name) for name in ("count_rows", "head", "to_table")
+        }, to_batches=lambda **options: filters.append(options.get("filter")) or to_batches(**options))
+    monkeypatch.setattr(file_formats, "_open_dataset", recording_open_dataset)
+
+    result, _, _, written = import_into_fresh_database(tmp_path, monkeypatch, path, active_only=True)
+    # Employees who left are never read, so neither counted nor written
+    assert result["total_records"] == result["candidates_created"] == active
+    assert [str(condition) for condition in filters] == ['(Attrition != "Yes")']
+    assert written == import_into_fresh_database(tmp_path, monkeypatch, hr_rows_as(tmp_path, "csv", 900, 980), active_only=True)[3]
+
+def test_reimport_in_another_format_is_unchanged(db, tmp_path):
+    service = DataImportService()
+    first = service.import_csv_data(str(hr_rows_as(tmp_path, "csv", 980, 1020)), db, workers=1)
+    assert first["success"] and first["candidates_created"] > 0, first
+
+    for fmt in ("parquet", "arrow"):
+        path = hr_rows_as(tmp_path, fmt, 980, 1020)
+        again = service.import_csv_data(str(path), db, workers=1)
+        # Another file, but the same rows
+        assert not again.get("skipped") and again["success"], again
+        assert (again["candidates_created"], again["candidates_updated"], again["rows_unchanged"]) == (0, 0, 40)
+        # The same file again is skipped without being read
+        assert service.import_csv_data(str(path), db, workers=1)["skipped"]
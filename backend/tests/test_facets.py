@@ -0,0 +1,97 @@
+"""
+Facet counts of the candidate list against GROUP BY queries over the same
+rows, before and after writes through the API.
+"""
+import pytest
+from sqlalchemy import text
+from app.core.config import settings
+from app.services.bitmap_index import EXPERIENCE_BUCKETS, candidate_bitmaps
+
+API = f"{settings.api_v1_prefix}/candidates"
+
+EXPERIENCE = "CASE " + " ".join(
+    f"WHEN c.years_experience >= {low}" + (f" AND c.years_experience < {high}" if high is not None else "") + f" THEN '{label}'"
+    for label, low, high in EXPERIENCE_BUCKETS
+) + " END"
+
+# Each facet's values counted per candidate, for the rows {where} selects.
+# A NULL list or dict is stored as JSON null, which json_each reads as one
+# NULL element
+GROUPED = {
+    "status": "SELECT c.status, count(*) FROM candidates c WHERE c.status <> '' AND {where} GROUP BY 1",
+    "education_level": "SELECT c.education_level, count(*) FROM candidates c WHERE c.education_level <> '' AND {where} GROUP BY 1",
+    "preferred_departments": (
+        "SELECT d.value, count(DISTINCT c.id) FROM candidates c, json_each(c.preferred_departments) d "
+        "WHERE d.value IS NOT NULL AND {where} GROUP BY 1"
+    ),
+    "experience": f"SELECT {EXPERIENCE}, count(*) FROM candidates c WHERE c.years_experience IS NOT NULL AND {{where}} GROUP BY 1",
+    "skills": (
+        "SELECT s.key, count(*) FROM candidates c, json_each(c.skills) s WHERE s.key IS NOT NULL AND {where} GROUP BY 1"
+    )
+}
+
+# The API selection, and the same selection as SQL
+SELECTIONS = {
+    "none": ({}, {}),
+    "active-python": (
+        {"status": ["Active", "On Hold"], "skill": ["Python"]},
+        {"status": "c.status IN ('Active', 'On Hold')", "skills": "json_extract(c.skills, '$.Python') IS NOT NULL"}
+    )
+}
+
+def expected_facets(db, sql_selection: dict) -> dict:
+    facets = {}
+    for facet, query in GROUPED.items():
+        # A facet is counted without its own selection
+        where = " AND ".join(condition for field, condition in sql_selection.items() if field != facet) or "1 = 1"
+        counts = dict(db.execute(text(query.format(where=where))).all())
+        if facet == "experience":
+            counts = {label: counts.get(label, 0) for label, _, _ in EXPERIENCE_BUCKETS}
+        facets[facet] = counts
+    return facets
+
+def assert_facets_match(client, db):
+    db.commit()
+    for params, sql_selection in SELECTIONS.values():
+        response = client.get(f"{API}/facets", params={**params, "facet_size": 100, "limit": 0})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["facets"] == expected_facets(db, sql_selection), params
+        where = " AND ".join(sql_selection.values()) or "1 = 1"
+        assert body["total"] == db.scalar(text(f"SELECT count(*) FROM candidates c WHERE {where}"))
+        for facet, counts in body["facets"].items():
+            if facet != "experience":
+                assert list(counts.values()) == sorted(counts.values(), reverse=True)
+
+@pytest.fixture
+def fresh_index():
+    # Other tests change rows behind the shared index's back; this one is
+    # about the writes it is told of
+    candidate_bitmaps.invalidate()
+    yield
+    candidate_bitmaps.invalidate()
+
+def test_facet_counts_follow_writes(client, db, fresh_index):
+    assert_facets_match(client, db)
+
+    created = client.post(f"{API}/", json={
+        "first_name": "Facet", "last_name": "Test", "email": "facet.test@example.com", "years_experience": 25,
+        "education_level": "PhD", "skills": {"Python": 4, "Quipu Reading": 9}, "status": "On Hold",
+        "preferred_departments": ["Archives", "Engineering"]
+    })
+    assert created.status_code == 200, created.text
+    candidate_id = created.json()["id"]
+    assert_facets_match(client, db)
+    assert client.get(f"{API}/facets", params={"skill": "Quipu Reading"}).json()["total"] == 1
+
+    updated = client.put(f"{API}/{candidate_id}", json={
+        "status": "Active", "years_experience": 2, "education_level": "Master",
+        "skills": {"SQL": 6, "Quipu Reading": 9}, "preferred_departments": ["Archives"]
+    })
+    assert updated.status_code == 200, updated.text
+    assert_facets_match(client, db)
+
+    deleted = client.delete(f"{API}/{candidate_id}")
+    assert deleted.status_code == 200, deleted.text
+    assert_facets_match(client, db)
+    assert client.get(f"{API}/facets", params={"status": "Deleted"}).json()["total"] >= 1
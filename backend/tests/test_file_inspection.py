@@ -0,0 +1,62 @@
+"""
+Summary and preview of data files that have not been validated yet.
+"""
+import json
+import threading
+from pathlib import Path
+import pandas as pd
+from app.core.config import settings
+from app.services.file_cache import SidecarCache
+
+API = f"{settings.api_v1_prefix}/data-import"
+HR_CSV = Path(__file__).resolve().parents[2] / "WA_Fn-UseC_-HR-Employee-Attrition.csv"
+
+def malformed_csv(tmp_path) -> Path:
+    rows = pd.read_csv(HR_CSV, nrows=10, dtype=str)
+    rows.loc[0, "MonthlyIncome"] = "abc"
+    rows.loc[1, "Education"] = None
+    rows.loc[2, "TotalWorkingYears"] = ""
+    path = tmp_path / "malformed.csv"
+    rows.to_csv(path, index=False)
+    return path
+
+def test_summary_of_malformed_file(client, tmp_path):
+    response = client.get(f"{API}/csv/summary", params={"file_path": str(malformed_csv(tmp_path))})
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["total_records"] == 10
+    assert summary["salary_statistics"]["invalid_values"] == 1
+    assert summary["experience_statistics"]["invalid_values"] == 1
+    assert summary["salary_statistics"]["min"] > 0
+
+def test_preview_of_malformed_file(client, tmp_path):
+    response = client.get(f"{API}/csv/preview", params={"file_path": str(malformed_csv(tmp_path)), "rows": 5})
+    assert response.status_code == 200, response.text
+    preview = response.json()
+    assert preview["total_rows"] == 10
+    assert preview["preview_data"][0]["MonthlyIncome"] == "abc"
+    assert preview["preview_data"][1]["Education"] is None
+
+def test_summary_cache_stays_out_of_the_data_directory(client, tmp_path):
+    path = malformed_csv(tmp_path)
+    first = client.get(f"{API}/csv/summary", params={"file_path": str(path)}).json()
+    assert client.get(f"{API}/csv/summary", params={"file_path": str(path)}).json() == first
+    assert [p.name for p in tmp_path.iterdir()] == ["malformed.csv"]
+
+    sidecar = Path(SidecarCache()._sidecar_path(str(path)))
+    assert sidecar.parent == Path(settings.file_cache_dir)
+    assert "summary" in json.loads(sidecar.read_text())["entries"]
+
+def test_concurrent_cache_writes_leave_one_whole_sidecar(tmp_path):
+    path = malformed_csv(tmp_path)
+    cache = SidecarCache()
+    threads = [threading.Thread(target=cache.set, args=(str(path), f"key{i}", list(range(2000)))) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Writers race on the entries they read, but each sidecar is written whole
+    assert cache.get(str(path), "key7") in (None, list(range(2000)))
+    assert json.loads(Path(cache._sidecar_path(str(path))).read_text())["entries"]
+    assert not list(Path(settings.file_cache_dir).glob("*.tmp"))
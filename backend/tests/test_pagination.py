@@ -0,0 +1,90 @@
+"""
+Keyset pagination of the list endpoints and the cache of their totals.
+"""
+import time
+import pytest
+from sqlalchemy import select
+from app.core import pagination
+from app.core.config import settings
+from app.models.candidate import Candidate
+from app.models.job import Job
+
+API = settings.api_v1_prefix
+
+def walk(client, path: str, **params):
+    """Every id of a list endpoint, page by page along next_cursor"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        items = body["candidates"] if "candidates" in body else body["jobs"]
+        ids += [item["id"] for item in items]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+def expected_order(rows, descending: bool):
+    """(id, sort value) rows ordered by value with NULLs last, then by id"""
+    present = sorted((row for row in rows if row[1] is not None), key=lambda row: (row[1], row[0]), reverse=descending)
+    missing = sorted((row for row in rows if row[1] is None), key=lambda row: row[0], reverse=descending)
+    return [row[0] for row in present + missing]
+
+@pytest.mark.parametrize("descending", [False, True], ids=["ascending", "descending"])
+@pytest.mark.parametrize("sort_by", ["id", "overall_score", "years_experience"])
+def test_candidate_cursors_walk_every_row_once(client, db, sort_by, descending):
+    # Years of experience repeat and scores include NULLs, so most page
+    # boundaries fall inside a run of equal values
+    rows = db.execute(select(Candidate.id, getattr(Candidate, sort_by))).all()
+    ids, pages = walk(client, f"{API}/candidates/", sort_by=sort_by, descending=descending, limit=7)
+    assert ids == expected_order(rows, descending)
+    assert pages == -(-len(rows) // 7)
+
+@pytest.mark.parametrize("descending", [False, True], ids=["ascending", "descending"])
+def test_created_at_cursors_break_ties_by_id(client, db, descending):
+    # The sample jobs were written in the same second, so share created_at
+    rows = db.execute(select(Job.id, Job.created_at)).all()
+    ids, _ = walk(client, f"{API}/jobs/", sort_by="created_at", descending=descending, limit=9)
+    assert ids == expected_order(rows, descending)
+
+def test_cursor_for_another_sort_order_is_refused(client):
+    first = client.get(f"{API}/candidates/", params={"sort_by": "years_experience", "limit": 5}).json()
+    assert first["next_cursor"]
+    for params in (
+        {"sort_by": "overall_score", "cursor": first["next_cursor"]},
+        {"sort_by": "years_experience", "descending": True, "cursor": first["next_cursor"]},
+        {"sort_by": "years_experience", "cursor": "not-a-cursor"},
+        {"sort_by": "years_experience", "cursor": first["next_cursor"], "skip": 5}
+    ):
+        assert client.get(f"{API}/candidates/", params=params).status_code == 400
+
+def test_cursor_pages_have_no_page_number(client):
+    first = client.get(f"{API}/jobs/", params={"limit": 5, "skip": 10}).json()
+    assert first["page"] == 3
+    for path, fields in ((f"{API}/jobs/", None), (f"{API}/candidates/", None), (f"{API}/candidates/", "id")):
+        params = {"limit": 5, **({"fields": fields} if fields else {})}
+        cursor = client.get(path, params=params).json()["next_cursor"]
+        assert client.get(path, params={**params, "cursor": cursor}).json()["page"] is None
+
+def test_count_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(pagination, "_count_cache", pagination.OrderedDict())
+    monkeypatch.setattr(settings, "count_cache_max_entries", 3)
+    for i in range(3):
+        pagination._store_total(("candidates", "search", f"q{i}"), i)
+    # Used since, so the second is now the least recently used
+    assert pagination._cached_total(("candidates", "search", "q0")) == 0
+    pagination._store_total(("candidates", "search", "q3"), 3)
+    assert list(pagination._count_cache) == [
+        ("candidates", "search", "q2"), ("candidates", "search", "q0"), ("candidates", "search", "q3")
+    ]
+
+def test_count_cache_drops_expired_totals(monkeypatch):
+    monkeypatch.setattr(pagination, "_count_cache", pagination.OrderedDict())
+    pagination._count_cache[("jobs", "stale")] = (time.monotonic() - 1, 10)
+    assert pagination._cached_total(("jobs", "stale")) is None
+    assert not pagination._count_cache
+
+    pagination._count_cache[("jobs", "stale")] = (time.monotonic() - 1, 10)
+    pagination._store_total(("jobs", "fresh"), 5)
+    assert list(pagination._count_cache) == [("jobs", "fresh")]
@@ -0,0 +1,31 @@
+"""
+Sparse fieldsets (fields=) on the list endpoints.
+"""
+from app.core.config import settings
+
+API = settings.api_v1_prefix
+
+def test_only_the_requested_fields_are_returned(client):
+    response = client.get(f"{API}/candidates/", params={"fields": "first_name, id,first_name", "limit": 3})
+    assert response.status_code == 200, response.text
+    candidates = response.json()["candidates"]
+    assert len(candidates) == 3
+    assert all(list(candidate) == ["first_name", "id"] for candidate in candidates)
+
+    jobs = client.get(f"{API}/jobs/", params={"fields": "title,department", "limit": 3}).json()["jobs"]
+    assert all(set(job) == {"title", "department"} for job in jobs)
+
+def test_projected_pages_follow_the_cursor(client):
+    # The sort key is loaded for the cursor without being returned
+    params = {"fields": "id", "sort_by": "years_experience", "limit": 10}
+    full = client.get(f"{API}/candidates/", params={"sort_by": "years_experience", "limit": 20}).json()
+    first = client.get(f"{API}/candidates/", params=params).json()
+    second = client.get(f"{API}/candidates/", params={**params, "cursor": first["next_cursor"]}).json()
+    assert [c["id"] for c in first["candidates"] + second["candidates"]] == [c["id"] for c in full["candidates"]]
+    assert set(first["candidates"][0]) == {"id"}
+
+def test_unknown_fields_are_refused(client):
+    for path, fields in ((f"{API}/candidates/", "id,password"), (f"{API}/jobs/", "title,salary"), (f"{API}/jobs/", " , ")):
+        response = client.get(path, params={"fields": fields})
+        assert response.status_code == 400, response.text
+    assert "password" in client.get(f"{API}/candidates/", params={"fields": "id,password"}).json()["detail"]
@@ -0,0 +1,152 @@
+"""
+EXPLAIN QUERY PLAN checks for the list, count and analysis endpoints.
+
+Each request runs against the test database built from the models; every
+statement it sends that reads candidates or jobs is explained on SQLite
+and must be served by an index, never by a full table scan.
+"""
+import re
+from typing import List, Tuple
+import pytest
+from sqlalchemy import event
+from app.core import database
+from app.core.config import settings
+from app.services.bitmap_index import candidate_bitmaps
+from app.services.candidate_snapshot import candidate_snapshot
+
+API = settings.api_v1_prefix
+
+READS_TABLE = re.compile(r"\b(?:FROM|JOIN)\s+(candidates|jobs)\b")
+TABLE_SCAN = re.compile(r"^SCAN (candidates|jobs)$")
+INDEXED = ("USING INDEX", "USING COVERING INDEX", "USING INTEGER PRIMARY KEY")
+# A first page ordered by id walks the table's own b-tree and stops at the
+# LIMIT; SQLite reports that as a SCAN as well
+ID_ORDERED_PAGE = re.compile(r"ORDER BY (candidates|jobs)\.id (ASC|DESC) LIMIT \? OFFSET \?$")
+
+ENDPOINTS = [
+    pytest.param("GET", "/candidates/?limit=20", None, id="candidates"),
+    pytest.param("GET", "/candidates/?limit=20&descending=true", None, id="candidates-desc"),
+    pytest.param("GET", "/candidates/?sort_by=overall_score&descending=true&limit=20", None, id="candidates-by-score"),
+    pytest.param("GET", "/candidates/?sort_by=years_experience&limit=20", None, id="candidates-by-experience"),
+    pytest.param("GET", "/candidates/?sort_by=created_at&limit=20", None, id="candidates-by-created"),
+    pytest.param("GET", "/candidates/?status=Active&limit=20", None, id="candidates-status"),
+    pytest.param("GET", "/candidates/?education_level=Master&limit=20", None, id="candidates-education"),
+    pytest.param("GET", "/candidates/?is_available=true&sort_by=overall_score&limit=20", None, id="candidates-available"),
+    pytest.param("GET", "/candidates/?min_experience=3&max_experience=8&limit=20", None, id="candidates-experience"),
+    pytest.param(
+        "GET", "/candidates/?status=Active&education_level=Bachelor&min_experience=2&limit=20", None,
+        id="candidates-combined"
+    ),
+    pytest.param("GET", "/candidates/?skill=Python&limit=20", None, id="candidates-skill"),
+    pytest.param("GET", "/candidates/?skill=Python:>=7&skill=SQL:<5&limit=20", None, id="candidates-all-skills"),
+    pytest.param(
+        "GET", "/candidates/?skill=Python:>=7&skill=Machine Learning&skill_match=any&limit=20", None,
+        id="candidates-any-skill"
+    ),
+    pytest.param(
+        "GET", "/candidates/?skill=SQL:>=3&status=Active&sort_by=overall_score&descending=true&limit=20", None,
+        id="candidates-skill-status-by-score"
+    ),
+    pytest.param("GET", "/candidates/facets?status=Active&limit=20", None, id="candidates-facets"),
+    pytest.param("GET", "/candidates/search?q=Engineer", None, id="candidates-search"),
+    pytest.param("GET", "/candidates/1", None, id="candidate"),
+    pytest.param("GET", "/candidates/status/list", None, id="candidate-statuses"),
+    pytest.param("GET", "/candidates/education/list", None, id="candidate-education-levels"),
+    pytest.param("GET", "/jobs/?limit=20", None, id="jobs"),
+    pytest.param("GET", "/jobs/?sort_by=max_salary&descending=true&limit=20", None, id="jobs-by-salary"),
+    pytest.param("GET", "/jobs/?sort_by=created_at&limit=20", None, id="jobs-by-created"),
+    pytest.param("GET", "/jobs/?department=Engineering&limit=20", None, id="jobs-department"),
+    pytest.param("GET", "/jobs/?level=Senior&limit=20", None, id="jobs-level"),
+    pytest.param("GET", "/jobs/?is_active=true&limit=20", None, id="jobs-active"),
+    pytest.param("GET", "/jobs/search?q=Sample", None, id="jobs-search"),
+    pytest.param("GET", "/jobs/1", None, id="job"),
+    pytest.param("GET", "/jobs/departments/list", None, id="job-departments"),
+    pytest.param("GET", "/jobs/levels/list", None, id="job-levels"),
+    pytest.param("GET", "/analysis/dashboard/stats", None, id="dashboard"),
+    pytest.param("GET", "/analysis/candidates/top-skilled", None, id="top-skilled"),
+    pytest.param("GET", "/analysis/jobs/high-demand", None, id="high-demand"),
+    pytest.param("GET", "/analysis/skills/market-demand", None, id="market-demand"),
+    pytest.param(
+        "POST", "/analysis/distribute",
+        {"required_skills": ["Python", "SQL"], "experience_level": "Mid", "candidate_filter": "NOT status:Hired"},
+        id="distribute"
+    ),
+    pytest.param("POST", "/analysis/skills-gaps", {"candidate_ids": [1, 2, 3, 4, 5]}, id="skills-gaps"),
+]
+
+@pytest.fixture
+def statements(client, db, monkeypatch):
+    """
+    SELECTs reading candidates or jobs, as sent to the database during the test
+    """
+    # The in-memory indexes load the whole table once; their refreshes,
+    # here on every request, are what should be checked
+    for changes in (candidate_bitmaps._changes, candidate_snapshot._changes):
+        monkeypatch.setattr(changes, "interval_seconds", 0)
+    candidate_bitmaps.everyone(db)
+    candidate_snapshot.current(db)
+
+    captured: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT") and READS_TABLE.search(statement):
+            captured.append((statement, parameters))
+
+    engines = {database.engine, database.read_engine} | {
+        engine.sync_engine for engine in (database.async_engine, database.async_read_engine) if engine is not None
+    }
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture)
+
+def query_plan(statement: str, parameters) -> List[str]:
+    with database.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[3] for row in rows]
+
+def assert_indexed(statement: str, parameters) -> None:
+    plan = query_plan(statement, parameters)
+    sql = " ".join(statement.split())
+    if len(plan) == 1 and TABLE_SCAN.match(plan[0]) and ID_ORDERED_PAGE.search(sql):
+        return
+    scans = [step for step in plan if TABLE_SCAN.match(step)]
+    assert not scans, f"Table scan {scans} in plan {plan} for: {sql}"
+    assert any(marker in step for step in plan for marker in INDEXED), f"No index in plan {plan} for: {sql}"
+
+@pytest.mark.parametrize("method, path, body", ENDPOINTS)
+def test_endpoint_queries_use_indexes(client, statements, method, path, body):
+    response = client.request(method, f"{API}{path}", json=body)
+    assert response.status_code == 200, response.text
+
+    assert statements, "No candidate or job query was captured"
+    for statement, parameters in statements:
+        assert_indexed(statement, parameters)
+
+@pytest.mark.parametrize("path", [
+    "/candidates/?limit=20",
+    "/candidates/?sort_by=overall_score&descending=true&limit=20",
+    "/candidates/?sort_by=years_experience&limit=20",
+    "/candidates/?sort_by=created_at&descending=true&limit=20",
+    "/candidates/?status=Active&limit=20",
+    "/candidates/?skill=Python:>=3&limit=5",
+    "/jobs/?limit=20",
+    "/jobs/?sort_by=max_salary&limit=20",
+    "/jobs/?sort_by=created_at&descending=true&limit=20",
+    "/jobs/?department=Engineering&limit=5",
+])
+def test_next_page_queries_use_indexes(client, statements, path):
+    first_page = client.get(f"{API}{path}")
+    assert first_page.status_code == 200, first_page.text
+    cursor = first_page.json()["next_cursor"]
+    assert cursor, "Expected a second page"
+    statements.clear()
+
+    response = client.get(f"{API}{path}&cursor={cursor}")
+    assert response.status_code == 200, response.text
+    assert statements
+    for statement, parameters in statements:
+        assert_indexed(statement, parameters)
@@ -0,0 +1,57 @@
+"""
+Reads go to the read engine, writes and a recent writer's reads to the primary.
+"""
+import time
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core import database
+from app.core.config import settings
+
+API = settings.api_v1_prefix
+
+@pytest.fixture
+def sessions_used(client, monkeypatch):
+    """Names of the async session factories the requests open, in order"""
+    used = []
+    for name in ("AsyncSessionLocal", "AsyncReadSessionLocal"):
+        factory = getattr(database, name)
+        monkeypatch.setattr(database, name, lambda factory=factory, name=name: used.append(name) or factory())
+    client.cookies.clear()
+    yield used
+    # The client is shared; later tests must not read from the primary
+    client.cookies.clear()
+
+def test_sqlite_reads_use_a_read_only_connection(db):
+    assert database.sqlite_read_only_url("sqlite:///./data.db").endswith("?mode=ro&uri=true")
+    assert database.sqlite_read_only_url("sqlite:///:memory:") is None
+    assert database.sqlite_read_only_url("postgresql://db/workforce") is None
+
+    read_db = database.ReadSessionLocal()
+    try:
+        assert read_db.execute(text("SELECT count(*) FROM candidates")).scalar() > 0
+        with pytest.raises(OperationalError, match="readonly"):
+            read_db.execute(text("UPDATE candidates SET status = status"))
+    finally:
+        read_db.close()
+
+def test_reads_follow_the_client_to_the_primary_after_a_write(client, sessions_used):
+    assert client.get(f"{API}/candidates/", params={"limit": 1}).status_code == 200
+    assert client.get(f"{API}/jobs/", params={"limit": 1}, headers={"X-Read-Your-Writes": "1"}).status_code == 200
+    assert sessions_used == ["AsyncReadSessionLocal", "AsyncSessionLocal"]
+
+    created = client.post(f"{API}/candidates/", json={
+        "first_name": "Routing", "last_name": "Test", "email": "routing@example.com",
+        "years_experience": 2, "education_level": "Bachelor", "skills": {"SQL": 4}
+    })
+    assert created.status_code == 200, created.text
+    until = float(client.cookies[database.READ_PRIMARY_COOKIE])
+    assert 0 < until - time.time() <= settings.read_your_writes_seconds
+
+    del sessions_used[:]
+    assert client.get(f"{API}/candidates/{created.json()['id']}").status_code == 200
+    client.cookies.set(database.READ_PRIMARY_COOKIE, f"{time.time() - 1:.3f}")
+    assert client.get(f"{API}/candidates/{created.json()['id']}").status_code == 200
+    client.cookies.set(database.READ_PRIMARY_COOKIE, "soon")
+    assert client.get(f"{API}/candidates/", params={"limit": 1}).status_code == 200
+    assert sessions_used == ["AsyncSessionLocal", "AsyncReadSessionLocal", "AsyncReadSessionLocal"]
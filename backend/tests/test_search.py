@@ -0,0 +1,129 @@
+"""
+Full-text search of candidates and jobs on SQLite FTS5, and the triggers
+keeping the index in step with the tables.
+"""
+from sqlalchemy import text
+from app.core.config import settings
+from app.models.candidate import Candidate
+
+API = settings.api_v1_prefix
+
+def candidate(email: str, **fields):
+    return {
+        "first_name": "Search", "last_name": "Test", "email": email, "years_experience": 3,
+        "education_level": "Bachelor", "skills": {"Python": 5}, **fields
+    }
+
+def create_candidates(client, *candidates):
+    ids = []
+    for body in candidates:
+        response = client.post(f"{API}/candidates/", json=body)
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+def indexed(db, fts_table: str, query: str):
+    """Rowids the FTS5 table itself matches, whatever the source table holds"""
+    return db.scalars(text(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :q ORDER BY rowid"), {"q": query}).all()
+
+def test_candidate_search_ranks_and_highlights(client):
+    by_name, by_position, by_skill, by_company = create_candidates(
+        client,
+        candidate("zephyr.name@example.com", first_name="Zephyrine", last_name="Quill"),
+        candidate("zephyr.position@example.com", current_position="Zephyrine Operations Lead"),
+        candidate("zephyr.skill@example.com", skills={"Zephyrine": 7, "SQL": 4}),
+        candidate("zephyr.company@example.com", current_company="Zephyrine Logistics and Freight Holdings")
+    )
+    response = client.get(f"{API}/candidates/search", params={"q": "zephyrine"})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["total"], body["page"], body["size"]) == (4, 1, 20)
+
+    hits = body["results"]
+    # Name weighs most, position and skills next, company least
+    assert [hit["candidate"]["id"] for hit in hits][0] == by_name
+    assert [hit["candidate"]["id"] for hit in hits][-1] == by_company
+    assert {hit["candidate"]["id"] for hit in hits[1:3]} == {by_position, by_skill}
+    scores = [hit["score"] for hit in hits]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+    assert all("<mark>Zephyrine</mark>" in hit["snippet"] for hit in hits)
+    position_hit, = [hit for hit in hits if hit["candidate"]["id"] == by_position]
+    assert "<mark>Zephyrine</mark> Operations Lead" in position_hit["snippet"]
+
+    # Every word must match; a trailing * matches a prefix
+    assert [hit["candidate"]["id"] for hit in client.get(
+        f"{API}/candidates/search", params={"q": "zephyrine quill"}
+    ).json()["results"]] == [by_name]
+    assert client.get(f"{API}/candidates/search", params={"q": "zephy*"}).json()["total"] == 4
+
+def test_search_pages_and_totals(client):
+    create_candidates(client, *[
+        candidate(f"pager{i}@example.com", current_position="Pagewright " + "Assistant " * i) for i in range(7)
+    ])
+    everything = client.get(f"{API}/candidates/search", params={"q": "pagewright", "limit": 100}).json()
+    assert everything["total"] == len(everything["results"]) == 7
+
+    pages = [client.get(f"{API}/candidates/search", params={"q": "pagewright", "skip": skip, "limit": 3}).json() for skip in (0, 3, 6)]
+    assert [page["page"] for page in pages] == [1, 2, 3]
+    assert {page["total"] for page in pages} == {7}
+    assert [hit["candidate"]["id"] for page in pages for hit in page["results"]] == [
+        hit["candidate"]["id"] for hit in everything["results"]
+    ]
+    assert client.get(f"{API}/candidates/search", params={"q": "pagewright", "include_total": False}).json()["total"] is None
+
+def test_search_input_is_never_fts5_syntax(client):
+    for q in ('C++', '"unbalanced', 'NEAR(a b)', 'title:x OR', 'a AND NOT'):
+        response = client.get(f"{API}/candidates/search", params={"q": q})
+        assert response.status_code == 200, (q, response.text)
+    assert client.get(f"{API}/candidates/search", params={"q": "!!! ---"}).status_code == 400
+    assert client.get(f"{API}/jobs/search", params={"q": "()"}).status_code == 400
+
+def test_job_search_ranks_title_over_description(client):
+    job = {
+        "department": "Engineering", "level": "Mid", "min_salary": 50000, "max_salary": 90000,
+        "required_skills": ["Python"], "experience_years": 2, "education_level": "Bachelor",
+        "responsibilities": ["Ship"], "location": "Remote"
+    }
+    ids = []
+    for title, description in (
+        ("Backend Engineer", "Works alongside the Quasarwright platform team on services"),
+        ("Quasarwright Engineer", "Builds and runs the platform services"),
+    ):
+        response = client.post(f"{API}/jobs/", json={**job, "title": title, "description": description})
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+
+    body = client.get(f"{API}/jobs/search", params={"q": "quasarwright"}).json()
+    assert body["total"] == 2
+    assert [hit["job"]["id"] for hit in body["results"]] == ids[::-1]
+    assert body["results"][0]["snippet"] == "<mark>Quasarwright</mark> Engineer"
+
+def test_triggers_keep_the_index_current(client, db):
+    candidate_id, = create_candidates(client, candidate("trigger@example.com", first_name="Vellichor", skills={"Zorblang": 3}))
+    assert indexed(db, "candidates_fts", "vellichor") == [candidate_id]
+    assert indexed(db, "candidates_fts", "zorblang") == [candidate_id]
+
+    # Updated through the API: the old words go, the new ones come
+    response = client.put(f"{API}/candidates/{candidate_id}", json={"first_name": "Sonder", "skills": {"Quuxlang": 2}})
+    assert response.status_code == 200, response.text
+    assert indexed(db, "candidates_fts", "vellichor") == indexed(db, "candidates_fts", "zorblang") == []
+    assert indexed(db, "candidates_fts", "sonder quuxlang") == [candidate_id]
+    assert [hit["candidate"]["id"] for hit in client.get(
+        f"{API}/candidates/search", params={"q": "sonder"}
+    ).json()["results"]] == [candidate_id]
+
+    # Upserted by the bulk route's INSERT ... ON CONFLICT DO UPDATE
+    bulk = client.post(f"{API}/candidates/bulk", json=[candidate("trigger@example.com", current_position="Hiraeth Keeper")])
+    assert [r["status"] for r in bulk.json()["results"]] == ["updated"]
+    assert indexed(db, "candidates_fts", "hiraeth python") == [candidate_id]
+    assert indexed(db, "candidates_fts", "sonder") == []
+
+    # A column the index does not hold leaves its row as it was
+    db.execute(text("UPDATE candidates SET overall_score = 1 WHERE id = :id"), {"id": candidate_id})
+    db.commit()
+    assert indexed(db, "candidates_fts", "hiraeth python") == [candidate_id]
+
+    db.execute(text("DELETE FROM candidates WHERE id = :id"), {"id": candidate_id})
+    db.commit()
+    assert indexed(db, "candidates_fts", "hiraeth") == []
+    assert db.scalar(text("SELECT count(*) FROM candidates_fts")) == db.query(Candidate).count()
@@ -0,0 +1,135 @@
+"""
+SkillQueryBuilder against a plain Python evaluation of the same predicates.
+
+Runs on the SQLite test database, and on Postgres when TEST_POSTGRES_URL
+points at a database the tests may create and drop tables in.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app.core.database import Base
+from app.models.candidate import Candidate
+from app.services.data_import import DataImportService
+from app.services.skill_query import SKILL_OPERATORS, SkillPredicate, SkillQueryBuilder, parse_skill_predicate
+
+HR_CSV = Path(__file__).resolve().parents[2] / "WA_Fn-UseC_-HR-Employee-Attrition.csv"
+
+PREDICATE_SETS = [
+    pytest.param(["Python"], id="has-skill"),
+    pytest.param(["Python:>=7"], id="at-least"),
+    pytest.param(["Python:>7"], id="above"),
+    pytest.param(["SQL:<5"], id="below"),
+    pytest.param(["SQL:<=5"], id="at-most"),
+    pytest.param(["JavaScript:==4"], id="exactly"),
+    pytest.param(["Machine Learning:6"], id="name-with-space"),
+    pytest.param(["Python", "SQL"], id="two-skills"),
+    pytest.param(["Python:>=5", "SQL:<8", "Data Analysis"], id="mixed"),
+    pytest.param(["Python:>=9", "Python:<=2"], id="same-skill-twice"),
+    pytest.param(["Rust"], id="unknown-skill"),
+    pytest.param([], id="no-predicates"),
+]
+
+def python_filter(skills_by_id: Dict[int, Dict], predicates: List[SkillPredicate], match_all: bool) -> List[int]:
+    def satisfies(skills: Dict, predicate: SkillPredicate) -> bool:
+        if predicate.skill not in skills:
+            return False
+        return predicate.op is None or SKILL_OPERATORS[predicate.op](skills[predicate.skill], predicate.level)
+
+    combine = all if match_all else any
+    return sorted(
+        candidate_id for candidate_id, skills in skills_by_id.items()
+        if not predicates or combine(satisfies(skills or {}, predicate) for predicate in predicates)
+    )
+
+@pytest.fixture(scope="module")
+def postgres_session(candidate_rows):
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    engine = create_engine(url)
+    tables = [Candidate.__table__]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all(Candidate(**row) for row in candidate_rows)
+        session.commit()
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine, tables=tables)
+        engine.dispose()
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def skill_db(request) -> Session:
+    if request.param == "postgresql":
+        return request.getfixturevalue("postgres_session")
+    return request.getfixturevalue("db")
+
+@pytest.mark.parametrize("match_all", [True, False], ids=["all", "any"])
+@pytest.mark.parametrize("texts", PREDICATE_SETS)
+def test_candidate_skills_matches_python_filter(skill_db, texts, match_all):
+    predicates = [parse_skill_predicate(text) for text in texts]
+    skills_by_id = dict(skill_db.execute(select(Candidate.id, Candidate.skills)).all())
+
+    condition = SkillQueryBuilder.for_session(skill_db).candidate_skills(predicates, match_all=match_all)
+    matched = skill_db.scalars(select(Candidate.id).where(condition).order_by(Candidate.id)).all()
+
+    assert matched == python_filter(skills_by_id, predicates, match_all)
+
+def test_sample_data_exercises_the_predicates(db):
+    # Guards the comparison above against passing on empty results
+    skills_by_id = dict(db.execute(select(Candidate.id, Candidate.skills)).all())
+    for texts in (["Python:>=7"], ["SQL:<5"], ["Machine Learning:6"], ["Python", "SQL"]):
+        predicates = [parse_skill_predicate(text) for text in texts]
+        assert 0 < len(python_filter(skills_by_id, predicates, True)) < len(skills_by_id)
+
+def junction_rows(db: Session):
+    return set(db.execute(text("SELECT candidate_id, skill, level FROM candidate_skills")).all())
+
+def json_rows(db: Session):
+    return {
+        (candidate_id, skill, float(level))
+        for candidate_id, skills in db.execute(select(Candidate.id, Candidate.skills)).all()
+        for skill, level in (skills or {}).items()
+    }
+
+def test_candidate_skills_table_follows_every_write_path(client, db, tmp_path):
+    api = f"{settings.api_v1_prefix}/candidates"
+    candidate = {
+        "first_name": "Junction", "last_name": "Test", "email": "junction@example.com",
+        "years_experience": 4, "education_level": "Bachelor", "skills": {"Python": 6, "Go": 3}
+    }
+    created = client.post(f"{api}/", json=candidate)
+    assert created.status_code == 200, created.text
+    candidate_id = created.json()["id"]
+
+    updated = client.put(f"{api}/{candidate_id}", json={"skills": {"Python": 9, "Rust": 2}})
+    assert updated.status_code == 200, updated.text
+
+    bulk = client.post(f"{api}/bulk", json=[
+        {**candidate, "skills": {"SQL": 5}},
+        {**candidate, "email": "junction2@example.com", "skills": {"Go": 8, "Machine Learning": 1}}
+    ])
+    assert bulk.status_code == 200 and not bulk.json()["failed"], bulk.text
+
+    # Imported twice: inserted, then updated with changed skills
+    rows = pd.read_csv(HR_CSV, nrows=20)
+    rows.to_csv(tmp_path / "first.csv", index=False)
+    # Education 5 and over ten working years add skills to every row
+    rows.assign(Education=5, TotalWorkingYears=rows["TotalWorkingYears"] + 11).to_csv(tmp_path / "second.csv", index=False)
+    service = DataImportService()
+    for name in ("first.csv", "second.csv"):
+        result = service.import_csv_data(str(tmp_path / name), db)
+        assert result["success"], result
+    assert result["candidates_updated"] > 0
+
+    db.expire_all()
+    assert db.scalar(select(Candidate.skills).where(Candidate.id == candidate_id)) == {"SQL": 5}
+    assert junction_rows(db) == json_rows(db)
@@ -0,0 +1,31 @@
+"""
+The vectorized bulk assessment against the per-candidate one.
+"""
+from app.models.candidate import Candidate
+from app.services.skills_assessment import SkillsAssessmentService
+
+def test_bulk_assessment_matches_the_scalar_assessment(candidate_rows):
+    rows = candidate_rows + [
+        # No skills, an unknown education level, experience past every cap
+        {**candidate_rows[0], "skills": {}},
+        {**candidate_rows[1], "education_level": "Bootcamp", "skills": {"Go": 3}},
+        {**candidate_rows[2], "years_experience": 40, "skills": {"Python": 10, "SQL": 1, "Go": 7}}
+    ]
+    service = SkillsAssessmentService()
+    skill_scores, overall_scores = service.assess_candidates_bulk(
+        [row["skills"] for row in rows],
+        [row["years_experience"] for row in rows],
+        [row["education_level"] for row in rows]
+    )
+
+    expected_skill_scores, expected_overall_scores = [], []
+    for row in rows:
+        candidate = Candidate(**row)
+        scores = service.assess_candidate_skills(candidate)
+        expected_skill_scores.append(scores)
+        expected_overall_scores.append(service.calculate_overall_score(candidate, scores))
+
+    assert skill_scores == expected_skill_scores
+    assert overall_scores == expected_overall_scores
+    assert list(skill_scores[-1]) == ["Python", "SQL", "Go"]
+    assert service.assess_candidates_bulk([], [], []) == ([], [])
@@ -0,0 +1,101 @@
+"""
+The SQLite connection profile and WAL maintenance.
+"""
+import os
+import threading
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.core import database
+from app.core.config import settings
+from app.core.sqlite_profile import SQLiteMaintenance, configure_sqlite_engine
+
+def pragmas(engine, *names):
+    with engine.connect() as connection:
+        return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+
+@pytest.fixture
+def tuned_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/tuned.db")
+    configure_sqlite_engine(engine)
+    yield engine
+    engine.dispose()
+
+def test_connections_use_the_profile():
+    assert pragmas(
+        database.engine,
+        "journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store", "journal_size_limit"
+    ) == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_mb * 1024,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "temp_store": 2,  # MEMORY
+        "journal_size_limit": settings.sqlite_wal_truncate_mb * 1024 * 1024
+    }
+
+def test_read_only_connections_follow_the_file():
+    assert database.read_engine is not database.engine
+    assert pragmas(database.read_engine, "journal_mode", "synchronous", "busy_timeout", "temp_store") == {
+        "journal_mode": "wal", "synchronous": 1, "busy_timeout": settings.sqlite_busy_timeout_ms, "temp_store": 2
+    }
+    with database.read_engine.connect() as connection, pytest.raises(OperationalError, match="readonly"):
+        connection.exec_driver_sql("DELETE FROM candidates")
+
+def test_tuning_can_be_turned_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sqlite_tuning", False)
+    engine = create_engine(f"sqlite:///{tmp_path}/untuned.db")
+    configure_sqlite_engine(engine)
+    assert pragmas(engine, "journal_mode", "synchronous") == {"journal_mode": "delete", "synchronous": 2}
+    assert not SQLiteMaintenance(engine).enabled
+    engine.dispose()
+
+def test_maintenance_checkpoints_the_wal(tuned_engine):
+    maintenance = SQLiteMaintenance(tuned_engine)
+    assert maintenance.enabled
+    with tuned_engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+        connection.execute(text("INSERT INTO notes (body) VALUES (:body)"), [{"body": "x" * 500}] * 200)
+    assert maintenance.wal_size() > 0
+
+    result = maintenance.run_once()
+    # Nothing else holds the database, so a passive checkpoint copies every frame
+    assert (result["mode"], result["busy"]) == ("PASSIVE", False)
+    assert result["wal_frames"] > 0 and result["checkpointed"] == result["wal_frames"]
+    assert maintenance.wal_size() > 0
+
+def test_maintenance_truncates_a_large_wal(tuned_engine, monkeypatch):
+    maintenance = SQLiteMaintenance(tuned_engine)
+    with tuned_engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+        connection.execute(text("INSERT INTO notes (body) VALUES (:body)"), [{"body": "x" * 500}] * 200)
+
+    monkeypatch.setattr(settings, "sqlite_wal_truncate_mb", 0)
+    result = maintenance.run_once()
+    assert (result["mode"], result["busy"]) == ("TRUNCATE", False)
+    assert os.path.exists(maintenance.wal_path) and maintenance.wal_size() == 0
+    with tuned_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM notes").scalar() == 200
+
+def test_maintenance_skips_in_memory_databases():
+    engine = create_engine("sqlite://")
+    maintenance = SQLiteMaintenance(engine, interval_seconds=1)
+    assert (maintenance.wal_path, maintenance.enabled) == (None, False)
+    maintenance.start()
+    assert maintenance.thread is None
+
+def test_maintenance_thread_runs_until_stopped(tuned_engine, monkeypatch):
+    maintenance = SQLiteMaintenance(tuned_engine, interval_seconds=0.01)
+    runs = threading.Semaphore(0)
+    run_once = maintenance.run_once
+    monkeypatch.setattr(maintenance, "run_once", lambda: (runs.release(), run_once())[1])
+
+    maintenance.start()
+    assert runs.acquire(timeout=5) and runs.acquire(timeout=5)
+    maintenance.stop()
+    assert maintenance.thread is None
+    # stop() optimizes one last time; nothing runs after that
+    while runs.acquire(blocking=False):
+        pass
+    assert not runs.acquire(timeout=0.05)
@@ -0,0 +1,106 @@
+"""
+Streaming multipart uploads and the expiry of abandoned resumable uploads.
+"""
+import asyncio
+import hashlib
+import os
+import pytest
+from app.core.config import settings
+from app.services.file_formats import is_supported
+from app.services.uploads import (
+    UPLOAD_FILE_PREFIX, UnsupportedUploadError, UploadFormError, UploadOffsetError, UploadService
+)
+
+API = f"{settings.api_v1_prefix}/data-import"
+BOUNDARY = "test-boundary"
+
+def multipart_body(file_name: str, content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nbefore the file\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{file_name}\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+async def in_blocks(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+def save(service: UploadService, body: bytes):
+    content_type = f"multipart/form-data; boundary={BOUNDARY}"
+    return asyncio.run(service.save_upload(content_type, in_blocks(body), accept=is_supported))
+
+def test_save_upload_writes_the_file_field_as_it_arrives(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    content = b"EmployeeNumber,Age\r\n1,30\r\n2,41\r\n" * 50
+    upload = save(UploadService(), multipart_body("people.csv", content))
+
+    assert upload["file_name"] == "people.csv"
+    assert (upload["size"], upload["sha256"]) == (len(content), hashlib.sha256(content).hexdigest())
+    with open(upload["path"], "rb") as f:
+        assert f.read() == content
+    assert os.listdir(tmp_path) == [os.path.basename(upload["path"])]
+
+def test_save_upload_refuses_before_writing(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    with pytest.raises(UnsupportedUploadError):
+        save(UploadService(), multipart_body("people.txt", b"abc"))
+    with pytest.raises(UploadFormError):
+        asyncio.run(UploadService().save_upload("text/csv", in_blocks(b"abc")))
+    assert os.listdir(tmp_path) == []
+
+def test_upload_route_rejects_unsupported_files(client):
+    response = client.post(f"{API}/csv/upload", files={"file": ("people.txt", b"abc", "text/plain")})
+    assert response.status_code == 400, response.text
+
+def test_idle_upload_sessions_expire_with_their_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    service = UploadService(ttl_seconds=60)
+    idle = service.create_session("idle.csv")
+    active = service.create_session("active.csv")
+    idle.touched_at -= 61
+    # Left by an earlier run of the process, and a file that is not an upload
+    orphan = tmp_path / f"{UPLOAD_FILE_PREFIX}orphan.csv"
+    foreign = tmp_path / "report.csv"
+    for path in (orphan, foreign):
+        path.write_bytes(b"x")
+        os.utime(path, (0, 0))
+
+    assert service.get_session(idle.id) is None
+    assert service.get_session(active.id) is active
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(active.path), "report.csv"])
+
+def test_finished_uploads_are_kept_until_their_import_releases_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    service = UploadService(ttl_seconds=60)
+    saved = save(service, multipart_body("people.csv", b"EmployeeNumber\r\n1\r\n"))
+    session = service.create_session("people.csv")
+    completed = service.complete_session(session)
+    # Queued behind a long import for longer than the TTL
+    for upload in (saved, completed):
+        os.utime(upload["path"], (0, 0))
+
+    service.expire_sessions()
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(upload["path"]) for upload in (saved, completed))
+
+    service.release(saved["path"])
+    service.release(completed["path"])
+    assert os.listdir(tmp_path) == []
+
+def test_resumable_upload_appends_chunks_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    service = UploadService()
+    content = b"EmployeeNumber,Age\r\n" + b"1,30\r\n" * 40
+    session = service.create_session("people.csv", total_size=len(content))
+
+    asyncio.run(service.append_chunk(session, 0, in_blocks(content[:100])))
+    with pytest.raises(UploadOffsetError) as refused:
+        asyncio.run(service.append_chunk(session, 150, in_blocks(content[150:])))
+    assert refused.value.expected_offset == 100
+    with pytest.raises(UploadOffsetError):
+        service.complete_session(session)
+
+    asyncio.run(service.append_chunk(session, 100, in_blocks(content[100:])))
+    upload = service.complete_session(session)
+    assert (upload["size"], upload["sha256"]) == (len(content), hashlib.sha256(content).hexdigest())
+    with open(upload["path"], "rb") as f:
+        assert f.read() == content
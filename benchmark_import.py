@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSV import throughput for Workforce Distribution.ai
+
+Scales the bundled HR Employee Attrition CSV up to the requested number of
+rows (renumbering EmployeeNumber so every row is a new employee) and imports
+it into a throwaway SQLite database with DataImportService.
+
+Usage: python benchmark_import.py [rows] [chunk_size] [workers]   (default: 1000000 rows)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+CSV_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "WA_Fn-UseC_-HR-Employee-Attrition.csv")
+DEFAULT_ROWS = 1_000_000
+
+def build_scaled_csv(target_rows: int, output_path: str) -> int:
+    """Repeat the bundled CSV until it holds target_rows employees"""
+    base = pd.read_csv(CSV_FILE_PATH)
+    written = 0
+
+    # Write one copy at a time so building the file does not skew peak memory
+    while written < target_rows:
+        copy = base.head(target_rows - written).copy()
+        copy['EmployeeNumber'] = range(written + 1, written + len(copy) + 1)
+        copy.to_csv(output_path, mode='a', header=written == 0, index=False)
+        written += len(copy)
+    return written
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def run_benchmark(target_rows: int, chunk_size: int = None, workers: int = None):
+    """Import a scaled CSV into a fresh SQLite database and report throughput"""
+    workdir = tempfile.mkdtemp(prefix="import_bench_")
+    csv_path = os.path.join(workdir, "scaled.csv")
+    db_path = os.path.join(workdir, "bench.db")
+
+    # Point the backend at the throwaway database before importing it
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from app.core.database import Base, SessionLocal, engine
+    from app.services.data_import import DataImportService
+
+    print(f"📄 Building CSV with {target_rows:,} rows...")
+    rows = build_scaled_csv(target_rows, csv_path)
+    print(f"   {os.path.getsize(csv_path) / 1024 / 1024:,.1f} MB written to {csv_path}")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("🚀 Importing...")
+        started = time.perf_counter()
+        result = DataImportService().import_csv_data(csv_path, db, chunk_size=chunk_size, workers=workers)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    if not result.get("success"):
+        print(f"❌ Import failed: {result.get('error')}")
+        return None
+
+    print("✅ Import finished")
+    print(f"   Rows read: {rows:,}")
+    print(f"   Candidates created: {result['candidates_created']:,}")
+    print(f"   Jobs created: {result['jobs_created']:,}")
+    print(f"   Skills created: {result['skills_created']:,}")
+    print(f"   Elapsed: {elapsed:,.1f} s")
+    print(f"   Throughput: {rows / elapsed:,.0f} rows/s")
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"   Peak RSS: {peak:,.0f} MB")
+    return elapsed
+
+def main():
+    """Main function"""
+    target_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    run_benchmark(target_rows, chunk_size, workers)
+
+if __name__ == "__main__":
+    main()
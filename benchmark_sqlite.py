@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite reader/writer concurrency for Workforce Distribution.ai
+
+Builds two throwaway databases with the same candidates, one with SQLite's
+defaults (rollback journal) and one with the deployment profile from
+backend/app/core/sqlite_profile.py (WAL and tuned pragmas). Against each, a
+writer thread commits import-sized batches of updates while reader threads
+run a dashboard aggregate over all candidates, and the reader latency and both
+throughputs are reported.
+
+Usage: python benchmark_sqlite.py [candidates] [readers] [seconds]   (default: 50000 4 10)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import Base
+from app.core.sqlite_profile import configure_sqlite_engine
+from app.models.candidate import Candidate
+
+DEFAULT_CANDIDATES = 50_000
+DEFAULT_READERS = 4
+DEFAULT_SECONDS = 10
+WRITE_BATCH = 5000  # rows per write transaction, like an import chunk
+
+def build_database(path: str, candidates: int, tuned: bool):
+    """Create a database at path holding the given number of candidates"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if tuned:
+        configure_sqlite_engine(engine)
+    Base.metadata.create_all(bind=engine)
+
+    rows = [
+        {
+            "first_name": "Employee", "last_name": str(i), "email": f"employee{i}@company.com",
+            "years_experience": i % 40, "education_level": "Bachelor",
+            "skills": {"Python": i % 10 + 1}, "overall_score": random.random(),
+            "is_available": True, "status": "Active"
+        }
+        for i in range(candidates)
+    ]
+    with engine.begin() as connection:
+        for start in range(0, len(rows), WRITE_BATCH):
+            connection.execute(insert(Candidate), rows[start:start + WRITE_BATCH])
+    return engine
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+def run_workload(engine, candidates: int, readers: int, seconds: float):
+    """Run one writer and the given number of readers for a fixed time"""
+    stop = threading.Event()
+    latencies = []
+    read_errors = [0]
+    commits = [0]
+    write_errors = [0]
+    lock = threading.Lock()
+
+    def reader():
+        # Dashboard-style aggregate: scans the table while holding a read lock
+        query = (
+            select(Candidate.status, func.count(), func.avg(Candidate.overall_score), func.max(Candidate.years_experience))
+            .where(Candidate.is_available.is_(True))
+            .group_by(Candidate.status)
+        )
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(query).all()
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                with lock:
+                    read_errors[0] += 1
+
+    def writer():
+        while not stop.is_set():
+            first = random.randint(1, max(candidates - WRITE_BATCH, 1))
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(Candidate)
+                        .where(Candidate.id.between(first, first + WRITE_BATCH - 1))
+                        .values(overall_score=random.random())
+                    )
+                commits[0] += 1
+            except OperationalError:
+                write_errors[0] += 1
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "reads_per_second": len(latencies) / seconds,
+        "read_p50_ms": percentile(latencies, 0.50) * 1000,
+        "read_p99_ms": percentile(latencies, 0.99) * 1000,
+        "read_max_ms": max(latencies, default=0.0) * 1000,
+        "read_errors": read_errors[0],
+        "commits_per_second": commits[0] / seconds,
+        "write_errors": write_errors[0]
+    }
+
+def main():
+    """Main function"""
+    candidates = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CANDIDATES
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_READERS
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_SECONDS
+    workdir = tempfile.mkdtemp(prefix="sqlite_bench_")
+
+    results = {}
+    for label, tuned in (("default", False), ("profile", True)):
+        print(f"📄 Building {label} database with {candidates:,} candidates...")
+        engine = build_database(os.path.join(workdir, f"{label}.db"), candidates, tuned)
+        print(f"🚀 1 writer + {readers} readers for {seconds:.0f} s...")
+        results[label] = run_workload(engine, candidates, readers, seconds)
+        engine.dispose()
+
+    print()
+    print(f"{'':22}{'default':>12}{'profile':>12}")
+    for key in results["default"]:
+        print(f"{key:22}{results['default'][key]:>12,.1f}{results['profile'][key]:>12,.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
+import time
 from datetime import datetime
+from urllib.parse import urlencode
 import numpy as np
 
 # Configuration
@@ -452,8 +454,8 @@ def jobs_management():
         with col3:
             active_filter = st.selectbox("Filter by Status", ["All", "Active", "Inactive"])
         
-        # Get jobs
-        jobs = make_api_request("/jobs/")
+        # Get jobs (only the columns shown in the table)
+        jobs = make_api_request("/jobs/?fields=id,title,department,level,min_salary,max_salary,is_active")
         
         if jobs and jobs.get("jobs"):
             jobs_df = pd.DataFrame(jobs["jobs"])
@@ -622,33 +624,48 @@ def candidates_management():
     with tab2:
         st.markdown("### 📋 Talent Network Overview")
         
-        # Filters
+        # Filters, with the number of candidates behind each option for the current selection
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        facet_params = []
+        if st.session_state.get("status_filter", "All") != "All":
+            facet_params.append(("status", st.session_state["status_filter"]))
+        if st.session_state.get("education_filter", "All") != "All":
+            facet_params.append(("education_level", st.session_state["education_filter"]))
+        if st.session_state.get("available_filter", "All") != "All":
+            facet_params.append(("is_available", str(st.session_state["available_filter"] == "Available").lower()))
+        facets = (make_api_request("/candidates/facets?limit=0&" + urlencode(facet_params)) or {}).get("facets", {})
+        
+        def facet_options(facet, current):
+            counts = facets.get(facet, {})
+            options = ["All"] + list(counts) + ([current] if current not in counts and current != "All" else [])
+            return options, lambda value: value if value == "All" else f"{value} ({counts.get(value, 0):,})"
+        
         col1, col2, col3 = st.columns(3)
         with col1:
-            status_filter = st.selectbox("Filter by Status", ["All"] + 
-                [status for status in make_api_request("/candidates/status/list") or []])
+            options, label = facet_options("status", st.session_state.get("status_filter", "All"))
+            status_filter = st.selectbox("Filter by Status", options, format_func=label, key="status_filter")
         with col2:
-            education_filter = st.selectbox("Filter by Education", ["All"] + 
-                [edu for edu in make_api_request("/candidates/education/list") or []])
+            options, label = facet_options("education_level", st.session_state.get("education_filter", "All"))
+            education_filter = st.selectbox("Filter by Education", options, format_func=label, key="education_filter")
         with col3:
-            available_filter = st.selectbox("Filter by Availability", ["All", "Available", "Not Available"])
+            available_filter = st.selectbox("Filter by Availability", ["All", "Available", "Not Available"], key="available_filter")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            skills_filter = st.text_input("Filter by Skills", placeholder="e.g. Python:>=7, SQL")
+        with col2:
+            skill_match = st.selectbox("Skills Must Match", ["all", "any"])
         
-        # Get candidates
-        candidates = make_api_request("/candidates/")
+        # Get candidates (only the columns shown in the table), filtered by the API
+        filter_params = list(facet_params) + [("skill", s.strip()) for s in skills_filter.split(",") if s.strip()]
+        if skills_filter.strip():
+            filter_params.append(("skill_match", skill_match))
+        candidates = make_api_request("/candidates/?fields=id,first_name,last_name,email,years_experience,"
+                                      "education_level,overall_score,status,is_available"
+                                      + ("&" + urlencode(filter_params) if filter_params else ""))
         
         if candidates and candidates.get("candidates"):
             candidates_df = pd.DataFrame(candidates["candidates"])
             
-            # Apply filters
-            if status_filter != "All":
-                candidates_df = candidates_df[candidates_df["status"] == status_filter]
-            if education_filter != "All":
-                candidates_df = candidates_df[candidates_df["education_level"] == education_filter]
-            if available_filter != "All":
-                is_available = available_filter == "Available"
-                candidates_df = candidates_df[candidates_df["is_available"] == is_available]
-            
             st.dataframe(candidates_df[["id", "first_name", "last_name", "email", "years_experience", 
                                       "education_level", "overall_score", "status"]])
         else:
@@ -665,7 +682,7 @@ def candidates_management():
         
         # Get candidates for assessment
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        candidates = make_api_request("/candidates/")
+        candidates = make_api_request("/candidates/?fields=id,first_name,last_name")
         
         if candidates and candidates.get("candidates"):
             candidate_options = {f"{c['first_name']} {c['last_name']}": c['id'] 
@@ -849,7 +866,7 @@ def workforce_analysis():
         
         # Get candidates for analysis
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        candidates = make_api_request("/candidates/")
+        candidates = make_api_request("/candidates/?fields=id,first_name,last_name")
         
         if candidates and candidates.get("candidates"):
             candidate_options = {f"{c['first_name']} {c['last_name']}": c['id'] 
@@ -994,31 +1011,70 @@ def data_import_section():
         )
         
         if st.button("🚀 Import Data") and csv_file_path:
-            with st.spinner("Importing data..."):
-                result = make_api_request(
-                    f"/data-import/csv/import-from-path?file_path={csv_file_path}",
-                    method="POST"
-                )
+            started = make_api_request(
+                f"/data-import/csv/import-from-path?file_path={csv_file_path}",
+                method="POST"
+            )
+            if started:
+                st.session_state["import_id"] = started["import_id"]
+        
+        # Poll the background import until it finishes
+        import_id = st.session_state.get("import_id")
+        status = make_api_request(f"/data-import/imports/{import_id}") if import_id else None
+        
+        if status and status["status"] in ("queued", "running", "cancelling"):
+            total_rows = status["total_rows"] or 0
+            st.progress(min(status["rows_read"] / total_rows, 1.0) if total_rows else 0.0)
             
-            if result:
-                st.markdown('<div class="success-message">🎉 Data imported successfully!</div>', unsafe_allow_html=True)
-                
-                # Display import results
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    create_metric_card("Jobs Created", result["jobs_created"], "💼")
-                
-                with col2:
-                    create_metric_card("Candidates Created", result["candidates_created"], "👥")
-                
-                with col3:
-                    create_metric_card("Skills Created", result["skills_created"], "🎯")
-                
-                with col4:
-                    create_metric_card("Total Records", result["total_records"], "📄")
-                
-                st.markdown('<div class="success-message">💡 You can now explore the imported data in other sections!</div>', unsafe_allow_html=True)
+            rate = f"{status['rows_per_second']:,.0f} rows/s" if status["rows_per_second"] else "starting"
+            eta = f", ETA {status['eta_seconds']:.0f}s" if status["eta_seconds"] is not None else ""
+            st.markdown(f"**{status['status'].title()}**: {status['rows_read']:,} / {total_rows:,} rows read "
+                        f"({status['rows_inserted']:,} inserted, {status['rows_skipped']:,} skipped) - {rate}{eta}")
+            
+            if st.button("⛔ Cancel Import"):
+                make_api_request(f"/data-import/imports/{import_id}/cancel", method="POST")
+            
+            time.sleep(1)
+            st.rerun()
+        
+        elif status and status["status"] == "completed":
+            result = status["result"]
+            st.markdown('<div class="success-message">🎉 Data imported successfully!</div>', unsafe_allow_html=True)
+            
+            # Display import results
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                create_metric_card("Jobs Created", result["jobs_created"], "💼")
+            
+            with col2:
+                create_metric_card("Candidates Created", result["candidates_created"], "👥")
+            
+            with col3:
+                create_metric_card("Skills Created", result["skills_created"], "🎯")
+            
+            with col4:
+                create_metric_card("Total Records", result["total_records"], "📄")
+            
+            if result["candidates_updated"] or result["rows_unchanged"]:
+                st.info(f"{result['candidates_updated']:,} candidates updated from changed rows; "
+                        f"{result['rows_unchanged']:,} unchanged rows skipped.")
+            
+            if result.get("rows_rejected"):
+                st.warning(f"{result['rows_rejected']:,} rows failed validation and were not imported. "
+                           f"Download the error report from {API_BASE_URL.rsplit('/api', 1)[0]}{result['errors_url']}")
+            
+            st.markdown('<div class="success-message">💡 You can now explore the imported data in other sections!</div>', unsafe_allow_html=True)
+        
+        elif status and status["status"] == "skipped":
+            st.info("This exact file was already imported; nothing to do.")
+        
+        elif status and status["status"] == "cancelled":
+            st.warning(f"Import cancelled after {status['rows_read']:,} rows; "
+                       f"{status['rows_inserted']:,} candidates were kept.")
+        
+        elif status and status["status"] == "failed":
+            st.error(f"Import failed: {status['error']}")
         st.markdown('</div>', unsafe_allow_html=True)
     
     with tab3:
@@ -1049,7 +1105,7 @@ def data_import_section():
                     create_metric_card("Preview Rows", len(preview["preview_data"]), "👀")
                 
                 # Display column information
-                st.markdown("### 📋 Column Information")
+                st.markdown("### 📋 Column Information (preview rows)")
                 columns_df = pd.DataFrame(preview["columns_info"])
                 st.dataframe(columns_df)
                 
@@ -7,6 +7,7 @@ import requests
 import json
 import os
 import sys
+import time
 
 # Add the backend directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
@@ -103,21 +104,52 @@ def import_csv_data():
         
         response = requests.post(f"{API_BASE_URL}/data-import/csv/import-from-path?file_path={CSV_FILE_PATH}")
         
-        if response.status_code == 200:
-            result = response.json()
+        if response.status_code != 200:
+            print(f"❌ Import failed: {response.text}")
+            return None
+        
+        import_id = response.json()["import_id"]
+        status = wait_for_import(import_id)
+        
+        if status["status"] == "completed":
+            result = status["result"]
             print("✅ Data imported successfully!")
             print(f"   Jobs Created: {result['jobs_created']}")
             print(f"   Candidates Created: {result['candidates_created']}")
+            print(f"   Candidates Updated: {result['candidates_updated']}")
+            print(f"   Unchanged Rows Skipped: {result['rows_unchanged']}")
+            if result.get("rows_rejected"):
+                print(f"   Rows Rejected: {result['rows_rejected']} (report: {API_BASE_URL.rsplit('/api', 1)[0]}{result['errors_url']})")
             print(f"   Skills Created: {result['skills_created']}")
             print(f"   Total Records Processed: {result['total_records']}")
             return result
+        elif status["status"] == "skipped":
+            print("✅ This exact file was already imported; nothing to do.")
+            return status["result"]
         else:
-            print(f"❌ Import failed: {response.text}")
+            print(f"❌ Import {status['status']}: {status.get('error') or ''}")
             return None
     except Exception as e:
         print(f"❌ Error during import: {str(e)}")
         return None
 
+def wait_for_import(import_id, poll_interval=1.0):
+    """Poll a background import until it finishes, printing progress"""
+    while True:
+        status = requests.get(f"{API_BASE_URL}/data-import/imports/{import_id}").json()
+        
+        if status["status"] not in ("queued", "running", "cancelling"):
+            print()
+            return status
+        
+        total_rows = status["total_rows"] or 0
+        rate = f"{status['rows_per_second']:,.0f} rows/s" if status["rows_per_second"] else "starting"
+        eta = f", ETA {status['eta_seconds']:.0f}s" if status["eta_seconds"] is not None else ""
+        print(f"\r   {status['rows_read']:,}/{total_rows:,} rows read, "
+              f"{status['rows_inserted']:,} inserted, {status['rows_skipped']:,} skipped ({rate}{eta})",
+              end="", flush=True)
+        time.sleep(poll_interval)
+
 def verify_import():
     """Verify the imported data"""
     try: